@@ -0,0 +1,32 @@
+"""store masked preview on secrets and secret versions
+
+Revision ID: 20261016_0008
+Revises: 20260325_0007
+Create Date: 2026-10-16 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261016_0008"
+down_revision = "20260325_0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Mevcut satirlar NULL kalir; scripts/backfill_value_masks.py ile doldurulur.
+    op.add_column(
+        "secrets",
+        sa.Column("value_masked", sa.String(length=16), nullable=True),
+    )
+    op.add_column(
+        "secret_versions",
+        sa.Column("value_masked", sa.String(length=16), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("secret_versions", "value_masked")
+    op.drop_column("secrets", "value_masked")
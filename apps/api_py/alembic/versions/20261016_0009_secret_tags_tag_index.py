@@ -0,0 +1,25 @@
+"""index secret_tags by tag for set-based tag filtering
+
+Revision ID: 20261016_0009
+Revises: 20261016_0008
+Create Date: 2026-10-16 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261016_0009"
+down_revision = "20261016_0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # EXISTS (... WHERE tag = :tag AND secret_id = secrets.id) yalnizca indeksten cozulur.
+    op.create_index(
+        "ix_secret_tags_tag_secret_id", "secret_tags", ["tag", "secret_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_secret_tags_tag_secret_id", table_name="secret_tags")
@@ -0,0 +1,47 @@
+"""indexes for hot query paths (listing, audit, sessions, memberships)
+
+Revision ID: 20261016_0010
+Revises: 20261016_0009
+Create Date: 2026-10-16 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261016_0010"
+down_revision = "20261016_0009"
+branch_labels = None
+depends_on = None
+
+
+# (index, tablo, kolonlar) - her biri domain_repo / users_repo'daki bir sorgu icin
+INDEXES = (
+    # _to_secret_outs: son kopyalanma (target_id IN ..., action = ..., max(created_at))
+    (
+        "ix_audit_events_target_action_created",
+        "audit_events",
+        ["target_id", "action", "created_at"],
+    ),
+    # dashboard: proje bazli son aktivite
+    ("ix_audit_events_project_created", "audit_events", ["project_id", "created_at"]),
+    # list_audit_events / dashboard: ORDER BY created_at DESC LIMIT n
+    ("ix_audit_events_created_at", "audit_events", ["created_at"]),
+    # _secret_list_query: proje filtresi + (updated_at, id) keyset sirasi
+    ("ix_secrets_project_updated", "secrets", ["project_id", "updated_at", "id"]),
+    # list_active_sessions_for_user / revoke_*_refresh_tokens
+    ("ix_refresh_tokens_user_revoked", "refresh_tokens", ["user_id", "revoked_at"]),
+    # AccessContext / list_projects_for_user: kullanicinin uyelikleri
+    ("ix_project_members_user_id", "project_members", ["user_id"]),
+    # AccessContext / _prod_readable_clause: kullanicinin ortam yetkileri
+    ("ix_environment_access_user_id", "environment_access", ["user_id"]),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,27 @@
+"""track last copy time on secrets
+
+Revision ID: 20261016_0011
+Revises: 20261016_0010
+Create Date: 2026-10-16 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261016_0011"
+down_revision = "20261016_0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Mevcut satirlar NULL kalir; scripts/backfill_last_copied.py ile doldurulur.
+    op.add_column(
+        "secrets",
+        sa.Column("last_copied_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("secrets", "last_copied_at")
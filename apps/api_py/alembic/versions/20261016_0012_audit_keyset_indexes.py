@@ -0,0 +1,40 @@
+"""audit log keyset pagination and metadata filter indexes
+
+Revision ID: 20261016_0012
+Revises: 20261016_0011
+Create Date: 2026-10-16 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261016_0012"
+down_revision = "20261016_0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keyset sirasi (created_at, id); esit zaman damgalarinda da siralama indeksten gelir
+    op.drop_index("ix_audit_events_created_at", table_name="audit_events")
+    op.create_index("ix_audit_events_created_at", "audit_events", ["created_at", "id"])
+    # actorId / userEmail filtresi + ayni keyset sirasi
+    op.create_index(
+        "ix_audit_events_actor_created",
+        "audit_events",
+        ["actor_user_id", "created_at", "id"],
+    )
+    # metadata filtreleri: `@>` (anahtar=deger) ve `?` (anahtar var mi)
+    op.create_index(
+        "ix_audit_events_metadata",
+        "audit_events",
+        ["metadata"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_events_metadata", table_name="audit_events")
+    op.drop_index("ix_audit_events_actor_created", table_name="audit_events")
+    op.drop_index("ix_audit_events_created_at", table_name="audit_events")
+    op.create_index("ix_audit_events_created_at", "audit_events", ["created_at"])
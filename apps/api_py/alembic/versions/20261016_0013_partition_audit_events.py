@@ -0,0 +1,135 @@
+"""partition audit_events monthly on created_at
+
+Revision ID: 20261016_0013
+Revises: 20261016_0012
+Create Date: 2026-10-16 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20261016_0013"
+down_revision = "20261016_0012"
+branch_labels = None
+depends_on = None
+
+
+# app.services.audit_partitions ile ayni adlandirma
+MONTHS_AHEAD = 3
+
+# (index, kolonlar, postgresql_using)
+INDEXES = (
+    ("ix_audit_events_target_action_created", ["target_id", "action", "created_at"], None),
+    ("ix_audit_events_project_created", ["project_id", "created_at"], None),
+    ("ix_audit_events_created_at", ["created_at", "id"], None),
+    ("ix_audit_events_actor_created", ["actor_user_id", "created_at", "id"], None),
+    ("ix_audit_events_metadata", ["metadata"], "gin"),
+)
+
+COLUMNS = "id, project_id, actor_user_id, action, target_type, target_id, metadata, created_at"
+
+
+def _create_audit_table(name: str, *constraints, **kwargs) -> None:
+    op.create_table(
+        name,
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("actor_user_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("action", sa.String(length=100), nullable=False),
+        sa.Column("target_type", sa.String(length=100), nullable=False),
+        sa.Column("target_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("metadata", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["actor_user_id"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="SET NULL"),
+        *constraints,
+        **kwargs,
+    )
+
+
+def _drop_indexes(table: str) -> None:
+    for name, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+
+
+def _create_indexes(table: str) -> None:
+    for name, columns, using in INDEXES:
+        op.create_index(name, table, columns, postgresql_using=using)
+
+
+def upgrade() -> None:
+    # Index adlari sema genelinde tekil: eski tablonunkiler once kaldirilir
+    _drop_indexes("audit_events")
+    op.rename_table("audit_events", "audit_events_unpartitioned")
+    op.execute(
+        "ALTER TABLE audit_events_unpartitioned "
+        "RENAME CONSTRAINT audit_events_pkey TO audit_events_unpartitioned_pkey"
+    )
+
+    # Partisyonlu tabloda PK partisyon anahtarini icermek zorunda
+    _create_audit_table(
+        "audit_events",
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_primary_key("audit_events_pkey", "audit_events", ["id", "created_at"])
+
+    # Mevcut en eski aydan bu ay + MONTHS_AHEAD'e kadar aylik partisyonlar
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month date;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    date_trunc('month', COALESCE(
+                        (SELECT min(created_at) FROM audit_events_unpartitioned), now()
+                    )),
+                    date_trunc('month', now()) + interval '{MONTHS_AHEAD} months',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF audit_events FOR VALUES FROM (%L) TO (%L)',
+                    'audit_events_p' || to_char(month, 'YYYYMM'),
+                    month,
+                    (month + interval '1 month')::date
+                );
+            END LOOP;
+        END $$;
+        """
+    )
+    # Bakim gecikirse ekler reddedilmesin diye araliksiz satirlar buraya duser
+    op.execute("CREATE TABLE audit_events_default PARTITION OF audit_events DEFAULT")
+
+    op.execute(
+        f"INSERT INTO audit_events ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM audit_events_unpartitioned"
+    )
+    op.drop_table("audit_events_unpartitioned")
+    _create_indexes("audit_events")
+
+
+def downgrade() -> None:
+    _drop_indexes("audit_events")
+    op.rename_table("audit_events", "audit_events_partitioned")
+    op.execute(
+        "ALTER TABLE audit_events_partitioned "
+        "RENAME CONSTRAINT audit_events_pkey TO audit_events_partitioned_pkey"
+    )
+
+    _create_audit_table("audit_events", sa.PrimaryKeyConstraint("id"))
+    op.execute(
+        f"INSERT INTO audit_events ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM audit_events_partitioned"
+    )
+    # Partisyonlar ana tabloyla birlikte silinir
+    op.drop_table("audit_events_partitioned")
+    _create_indexes("audit_events")
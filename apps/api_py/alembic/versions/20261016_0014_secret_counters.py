@@ -0,0 +1,40 @@
+"""per-project secret counters
+
+Revision ID: 20261016_0014
+Revises: 20261016_0013
+Create Date: 2026-10-16 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20261016_0014"
+down_revision = "20261016_0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "secret_counters",
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("environment_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("provider", sa.String(length=255), nullable=False),
+        sa.Column("secret_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["environment_id"], ["environments.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("project_id", "environment_id", "provider"),
+    )
+    # Mevcut secret'lardan ilk degerler (sonrasi repo fonksiyonlarinca tutulur;
+    # gerekirse scripts/rebuild_secret_counters.py ile yeniden hesaplanir)
+    op.execute(
+        "INSERT INTO secret_counters (project_id, environment_id, provider, secret_count) "
+        "SELECT project_id, environment_id, provider, count(*) FROM secrets "
+        "GROUP BY project_id, environment_id, provider"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("secret_counters")
@@ -0,0 +1,26 @@
+"""add users.token_generation for eager access token revocation
+
+Revision ID: 20261016_0015
+Revises: 20261016_0014
+Create Date: 2026-10-16 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261016_0015"
+down_revision = "20261016_0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("token_generation", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "token_generation")
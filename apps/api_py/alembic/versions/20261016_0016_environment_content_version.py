@@ -0,0 +1,26 @@
+"""add environments.content_version for export ETags
+
+Revision ID: 20261016_0016
+Revises: 20261016_0015
+Create Date: 2026-10-16 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261016_0016"
+down_revision = "20261016_0015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "environments",
+        sa.Column("content_version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("environments", "content_version")
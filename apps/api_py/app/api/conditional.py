@@ -0,0 +1,37 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+
+def compute_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """`If-None-Match` basligi `etag` ile eslesiyor mu (zayif karsilastirma)."""
+    if not if_none_match:
+        return False
+    candidates = {item.strip().removeprefix("W/") for item in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def version_etag(*parts: object) -> str:
+    """Icerik surumu ve istek parametrelerinden, govdeyi uretmeden ETag."""
+    return compute_etag("\x1f".join(str(part) for part in parts).encode("utf-8"))
+
+
+def not_modified_response(etag: str, cache_control: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+def conditional_json_response(request: Request, body: bytes, cache_control: str) -> Response:
+    """JSON govdeyi ETag ile dondurur; istemcideki kopya guncelse 304 gonderir."""
+    etag = compute_etag(body)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified_response(etag, cache_control)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    return Response(content=body, media_type="application/json", headers=headers)
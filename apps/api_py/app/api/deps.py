@@ -1,14 +1,21 @@
+import uuid
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Generator, List, Optional
+from typing import AsyncIterator, Dict, Generator, List, Optional
 
 from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.core.security import decode_token
-from app.db.repositories.domain_repo import get_assignments
+from app.db.models.enums import RoleEnum
+from app.db.async_session import get_async_db
+from app.db.repositories.async_repo import get_user_by_id as get_user_by_id_async
+from app.db.repositories.domain_repo import AccessContext, get_assignments
 from app.db.repositories.users_repo import get_user_by_id
 from app.db.session import get_db
+from app.services.user_cache import user_cache
 
 
 def get_db_session() -> Generator[Session, None, None]:
@@ -32,30 +39,154 @@ def _extract_token(request: Request) -> str:
     )
 
 
-def get_current_user(
-    request: Request, db: Session = Depends(get_db_session)
-):
+def _access_payload(request: Request) -> Dict:
     token = _extract_token(request)
     payload = decode_token(token)
-    if not payload or payload.get("type") != "access":
+    if not payload or payload.get("type") != "access" or not payload.get("sub"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
+    return payload
+
+
+def _token_generation(payload: Dict) -> int:
+    # `gen` claim'i olmayan eski token'lar 0. nesil sayilir
+    try:
+        return int(payload.get("gen", 0))
+    except (TypeError, ValueError):
+        return -1
+
+
+def _revoked() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked"
+    )
+
+
+def get_current_user(
+    request: Request, db: Session = Depends(get_db_session)
+):
+    payload = _access_payload(request)
+    user_id = payload["sub"]
+
+    # Cache isabetinde kullanici sorgusuz olarak oturuma baglanir; route'lar
+    # nesneyi yine degistirip commit edebilir.
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        user = db.merge(snapshot, load=False)
+    else:
+        user = get_user_by_id(db, user_id)
+        if user is not None:
+            user_cache.put(user)
+
+    if not user or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
+        )
+    if _token_generation(payload) != user.token_generation:
+        raise _revoked()
+    return user
+
+
+@dataclass(frozen=True)
+class TokenUser:
+    """Token claim'lerinden kurulan, DB'ye bagli olmayan kullanici (salt okunur uclar)."""
+
+    id: uuid.UUID
+    email: str
+    role: RoleEnum
+    token_generation: int
+    is_active: bool = True
 
-    user_id = payload.get("sub")
-    if not user_id:
+
+def _claims_user(request: Request) -> TokenUser:
+    payload = _access_payload(request)
+    user_id = payload["sub"]
+    generation = _token_generation(payload)
+    try:
+        user = TokenUser(
+            id=uuid.UUID(user_id),
+            email=payload.get("email", ""),
+            role=RoleEnum(payload.get("role")),
+            token_generation=generation,
+        )
+    except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
 
-    user = get_user_by_id(db, user_id)
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        if not snapshot.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
+            )
+        if snapshot.token_generation != generation:
+            raise _revoked()
+    elif generation < user_cache.min_generation(user_id):
+        raise _revoked()
+    return user
+
+
+def get_token_user(
+    request: Request, db: Session = Depends(get_db_session)
+):
+    """Salt okunur uclar icin kimlik dogrulama.
+
+    `AUTH_TRUST_TOKEN_CLAIMS` kapaliyken `get_current_user` ile aynidir. Acikken
+    kullanici DB'den okunmaz; token imzasi, process icindeki cache ve iptal
+    edilen nesiller uzerinden dogrulanir. Baska process'te yapilan bir
+    iptal en fazla access token omru kadar gec gorulur.
+    """
+    if not get_settings().AUTH_TRUST_TOKEN_CLAIMS:
+        return get_current_user(request, db)
+    return _claims_user(request)
+
+
+async def get_async_db_session() -> AsyncIterator[AsyncSession]:
+    async for db in get_async_db():
+        yield db
+
+
+async def get_current_user_async(
+    request: Request, db: AsyncSession = Depends(get_async_db_session)
+):
+    """`get_current_user`'in AsyncSession surumu (async route'lar icin)."""
+    payload = _access_payload(request)
+    user_id = payload["sub"]
+
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        user = await db.merge(snapshot, load=False)
+    else:
+        user = await get_user_by_id_async(db, user_id)
+        if user is not None:
+            user_cache.put(user)
+
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
         )
+    if _token_generation(payload) != user.token_generation:
+        raise _revoked()
     return user
 
 
+async def get_token_user_async(
+    request: Request, db: AsyncSession = Depends(get_async_db_session)
+):
+    if not get_settings().AUTH_TRUST_TOKEN_CLAIMS:
+        return await get_current_user_async(request, db)
+    return _claims_user(request)
+
+
+def get_access_context(
+    user=Depends(get_current_user), db: Session = Depends(get_db_session)
+) -> AccessContext:
+    """Istek basina tek AccessContext; yetki kontrolleri bellekten cevaplanir."""
+    return AccessContext(db, str(user.id))
+
+
 def require_roles(allowed: List[str]):
     def checker(user=Depends(get_current_user)):
         if user.role.value not in allowed:
@@ -1,11 +1,15 @@
 from fastapi import APIRouter
 
+from app.core.config import get_settings
+
 from app.api.routes import (
+    async_reads,
     audit,
     auth,
     dashboard,
     exports,
     imports,
+    metrics,
     organizations,
     project_manage,
     projects,
@@ -17,6 +21,9 @@ from app.api.routes import (
 
 
 api_router = APIRouter()
+if get_settings().DB_ASYNC_ROUTES:
+    # Ayni yollari senkron route'lardan once yakalar
+    api_router.include_router(async_reads.router)
 api_router.include_router(auth.router)
 api_router.include_router(users.router)
 api_router.include_router(project_manage.router)
@@ -29,3 +36,4 @@ api_router.include_router(imports.router)
 api_router.include_router(exports.router)
 api_router.include_router(audit.router)
 api_router.include_router(dashboard.router)
+api_router.include_router(metrics.router)
@@ -0,0 +1,259 @@
+"""Okuma agirlikli uclarin AsyncSession surumleri (`DB_ASYNC_ROUTES`).
+
+Yollar ve yanitlar senkron route'larla birebir aynidir; router'a senkron
+olanlardan once eklenir. Bekleme sirasinda event loop serbest kalir, yani
+istek basina threadpool thread'i tutulmaz. Async surumu olmayan sorgular
+(yetki, audit, dashboard sayaclari) `AsyncSession.run_sync` ile ayni
+baglantida calisir.
+"""
+
+from typing import Dict, List, Literal, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.conditional import (
+    conditional_json_response,
+    etag_matches,
+    not_modified_response,
+)
+from app.api.deps import get_async_db_session, get_current_user_async, get_token_user_async
+from app.api.routes.dashboard import _dashboard_counts, _recent_activity
+from app.api.streaming import (
+    EXPORT_CACHE_CONTROL,
+    EXPORT_FORMATS,
+    export_etag,
+    export_response,
+    ndjson_response,
+)
+from app.core.config import get_settings
+from app.core.pagination import DEFAULT_PAGE_LIMIT, NEXT_CURSOR_HEADER, decode_cursor
+from app.db.models.enums import EnvironmentEnum, RoleEnum
+from app.db.repositories import async_repo
+from app.db.repositories.domain_repo import add_audit_event, has_project_access, normalize_tags
+from app.schemas.dashboard import DashboardStatsOut, RecentActivityOut
+from app.schemas.secrets import SecretOut
+from app.services.content_versions import wait_for_content_change
+from app.services.dashboard_cache import dashboard_cache
+
+
+router = APIRouter()
+
+
+async def _secret_list_response(
+    db: AsyncSession,
+    user_id: str,
+    response: Response,
+    *,
+    limit: Optional[int],
+    cursor: Optional[str],
+    format: str,
+    filters: Dict,
+):
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    if format == "ndjson":
+        return ndjson_response(
+            async_repo.iter_secrets(db, user_id, cursor=cursor, **filters), SecretOut
+        )
+
+    if limit is None and cursor is None:
+        return await async_repo.list_secrets(db, user_id, **filters)
+
+    items, next_cursor = await async_repo.list_secrets_page(
+        db, user_id, limit=limit or DEFAULT_PAGE_LIMIT, cursor=cursor, **filters
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
+
+
+@router.get("/projects/{project_id}/secrets", response_model=List[SecretOut], tags=["secrets"])
+async def get_project_secrets_async(
+    project_id: str,
+    response: Response,
+    env: Optional[EnvironmentEnum] = Query(default=None),
+    provider: Optional[str] = Query(default=None),
+    tag: Optional[str] = Query(default=None),
+    tags: List[str] = Query(default=[]),
+    tag_mode: Literal["all", "any"] = Query(default="all"),
+    type: Optional[str] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None),
+    format: Literal["json", "ndjson"] = Query(default="json"),
+    user=Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db_session),
+):
+    if not await db.run_sync(has_project_access, str(user.id), project_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+    filters = {
+        "project_slug": project_id,
+        "env": env,
+        "provider": provider,
+        "tag": tag,
+        "tags": tags,
+        "tag_mode": tag_mode,
+        "secret_type": type,
+    }
+    return await _secret_list_response(
+        db, str(user.id), response, limit=limit, cursor=cursor, format=format, filters=filters
+    )
+
+
+@router.get("/search", response_model=List[SecretOut], tags=["search"])
+async def search_async(
+    response: Response,
+    q: str = Query(default=""),
+    provider: Optional[str] = Query(default=None),
+    tag: Optional[str] = Query(default=None),
+    tags: List[str] = Query(default=[]),
+    tag_mode: Literal["all", "any"] = Query(default="all"),
+    environment: Optional[EnvironmentEnum] = Query(default=None),
+    type: Optional[str] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None),
+    format: Literal["json", "ndjson"] = Query(default="json"),
+    user=Depends(get_token_user_async),
+    db: AsyncSession = Depends(get_async_db_session),
+):
+    filters = {
+        "q": q,
+        "provider": provider,
+        "tag": tag,
+        "tags": tags,
+        "tag_mode": tag_mode,
+        "env": environment,
+        "secret_type": type,
+    }
+    return await _secret_list_response(
+        db, str(user.id), response, limit=limit, cursor=cursor, format=format, filters=filters
+    )
+
+
+@router.get("/service-access/projects/{project_id}/exports", tags=["service-access"])
+async def service_export_project_async(
+    request: Request,
+    project_id: str,
+    env: EnvironmentEnum = Query(...),
+    format: str = Query(...),
+    tag: Optional[str] = Query(default=None),
+    tags: List[str] = Query(default=[]),
+    tag_mode: Literal["all", "any"] = Query(default="all"),
+    wait: float = Query(default=0, ge=0),
+    x_service_token: Optional[str] = Header(default=None, alias="X-Service-Token"),
+    db: AsyncSession = Depends(get_async_db_session),
+):
+    if not x_service_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="X-Service-Token header is required",
+        )
+
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported format",
+        )
+
+    scope = await async_repo.resolve_service_export_scope(
+        db,
+        service_token=x_service_token,
+        project_slug=project_id,
+        environment=env,
+    )
+    if scope is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid service token",
+        )
+    project_uuid, env_id = scope
+
+    normalized_tags = normalize_tags(tag, tags)
+    version = await async_repo.read_content_version(db, env_id)
+    etag = export_etag({env_id: version}, format, normalized_tags, tag_mode)
+    if_none_match = request.headers.get("if-none-match")
+    if wait and etag_matches(if_none_match, etag):
+        settings = get_settings()
+        version = await wait_for_content_change(
+            env_id,
+            version,
+            min(wait, settings.EXPORT_LONG_POLL_MAX_SECONDS),
+            lambda: async_repo.read_content_version(db, env_id),
+            check_interval=settings.EXPORT_LONG_POLL_CHECK_SECONDS,
+        )
+        etag = export_etag({env_id: version}, format, normalized_tags, tag_mode)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag, EXPORT_CACHE_CONTROL)
+
+    tag_filter = {"tag": tag, "tags": tags, "tag_mode": tag_mode}
+    count = (
+        await async_repo.count_export_secrets(db, project_uuid, [env_id], **tag_filter)
+    ).get(env_id, 0)
+    await db.run_sync(
+        lambda session: add_audit_event(
+            session,
+            actor_user_id=None,
+            project_slug=project_id,
+            action="service_exported",
+            target_type="service_token",
+            metadata={
+                "secretName": f"{project_id}:{env.value}",
+                "format": format,
+                "count": count,
+                "tag": tag,
+                "tags": tags,
+                "tagMode": tag_mode,
+            },
+        )
+    )
+    rows = (
+        async_repo.iter_export_secrets(db, project_uuid, env_id, **tag_filter)
+        if count
+        else iter(())
+    )
+    response = export_response(rows, format)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = EXPORT_CACHE_CONTROL
+    return response
+
+
+@router.get("/dashboard/stats", response_model=DashboardStatsOut, tags=["dashboard"])
+async def get_dashboard_stats_async(
+    request: Request,
+    user=Depends(get_token_user_async),
+    db: AsyncSession = Depends(get_async_db_session),
+):
+    is_admin = user.role == RoleEnum.admin
+
+    cache_key = (user.id, is_admin)
+    counts = dashboard_cache.get(cache_key)
+    if counts is None:
+        counts = await db.run_sync(_dashboard_counts, user.id, is_admin)
+        dashboard_cache.set(cache_key, counts)
+    recent = await db.run_sync(_recent_activity, user.id, is_admin)
+
+    stats = DashboardStatsOut(
+        totalSecrets=counts["secrets"],
+        totalProjects=counts["projects"],
+        totalMembers=counts["members"],
+        recentActivity=[RecentActivityOut(**item) for item in recent],
+        secretsByEnvironment=counts["env"],
+        secretsByProvider=counts["provider"],
+    )
+    return conditional_json_response(
+        request, stats.model_dump_json().encode("utf-8"), cache_control="private, no-cache"
+    )
@@ -1,18 +1,25 @@
-from typing import Optional
+from typing import List, Literal, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import (
+    get_access_context,
     get_current_user,
     get_db_session,
     parse_optional_datetime,
     require_roles,
 )
+from app.api.streaming import ndjson_response
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor
 from app.db.repositories.domain_repo import (
-    add_audit_event,
-    has_project_access,
-    list_audit_events,
+    AUDIT_PAGE_LIMIT,
+    AccessContext,
+    iter_audit_events,
+    list_audit_events_page,
+    parse_metadata_filters,
+    record_secret_copy,
 )
 from app.schemas.audit import AuditCopyRequest, AuditEventOut
 
@@ -25,40 +32,71 @@ def track_copy(
     payload: AuditCopyRequest,
     user=Depends(get_current_user),
     db: Session = Depends(get_db_session),
+    access: AccessContext = Depends(get_access_context),
 ):
-    project_id = payload.projectId or "unknown"
-    if payload.projectId and not has_project_access(
-        db, str(user.id), payload.projectId
-    ):
+    if not access.has_project_access(payload.projectId):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    try:
+        secret_id = UUID(payload.secretId)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid secret id"
+        ) from exc
 
-    add_audit_event(
+    recorded = record_secret_copy(
         db,
         actor_user_id=str(user.id),
         project_slug=payload.projectId,
-        action="secret_copied",
-        target_type="secret",
-        target_id=payload.secretId,
-        metadata={"secretName": payload.secretId, "projectId": project_id},
+        secret_id=secret_id,
+        metadata={"secretName": payload.secretId, "projectId": payload.projectId},
+        access=access,
     )
+    if not recorded:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Secret not found"
+        )
     return {"ok": True}
 
 
 @router.get("", response_model=list[AuditEventOut])
 def get_audit_events(
+    response: Response,
     action: Optional[str] = Query(default=None),
     projectId: Optional[str] = Query(default=None),
     userEmail: Optional[str] = Query(default=None),
+    actorId: Optional[UUID] = Query(default=None),
+    targetId: Optional[UUID] = Query(default=None),
+    meta: List[str] = Query(default=[]),
     from_dt: Optional[str] = Query(default=None, alias="from"),
     to_dt: Optional[str] = Query(default=None, alias="to"),
+    limit: int = Query(default=AUDIT_PAGE_LIMIT, ge=1, le=1000),
+    cursor: Optional[str] = Query(default=None),
+    format: Literal["json", "ndjson"] = Query(default="json"),
     user=Depends(require_roles(["admin"])),
     db: Session = Depends(get_db_session),
 ):
-    return list_audit_events(
-        db,
-        action=action,
-        project_slug=projectId,
-        user_email=userEmail,
-        from_dt=parse_optional_datetime(from_dt),
-        to_dt=parse_optional_datetime(to_dt),
-    )
+    try:
+        if cursor:
+            decode_cursor(cursor)
+        metadata = parse_metadata_filters(meta)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    filters = {
+        "action": action,
+        "project_slug": projectId,
+        "user_email": userEmail,
+        "actor_id": str(actorId) if actorId else None,
+        "target_id": str(targetId) if targetId else None,
+        "metadata": metadata,
+        "from_dt": parse_optional_datetime(from_dt),
+        "to_dt": parse_optional_datetime(to_dt),
+    }
+    if format == "ndjson":
+        # SIEM aktarimi: limit uygulanmaz, tum eslesen olaylar akis olarak gonderilir
+        return ndjson_response(iter_audit_events(db, cursor=cursor, **filters), AuditEventOut)
+
+    items, next_cursor = list_audit_events_page(db, limit=limit, cursor=cursor, **filters)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
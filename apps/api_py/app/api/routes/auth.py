@@ -17,7 +17,7 @@ from app.schemas.auth import (
     RegisterOut,
     RegisterRequest,
 )
-from app.core.rate_limit import check_rate_limit
+from app.core.rate_limit import RateLimit, allow_request
 from app.services.auth_service import (
     login_with_password,
     logout_refresh_token,
@@ -30,6 +30,16 @@ from app.services.registration_service import register_with_profile
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# Route limitleri (RATE_LIMITS ayari ile ada gore ezilebilir)
+LOGIN_PER_IP = RateLimit("login:ip", limit=30, window_seconds=60)
+LOGIN_PER_EMAIL = RateLimit("login:email", limit=8, window_seconds=60)
+REFRESH_PER_IP = RateLimit("refresh", limit=20, window_seconds=60)
+REGISTER_JOIN_PER_IP = RateLimit("register:join", limit=8, window_seconds=60)
+REGISTER_CREATE_PER_IP = RateLimit("register:create", limit=12, window_seconds=60)
+FORGOT_PASSWORD_PER_EMAIL = RateLimit("forgot_password:email", limit=3, window_seconds=900)
+FORGOT_PASSWORD_PER_IP = RateLimit("forgot_password:ip", limit=10, window_seconds=900)
+RESET_PASSWORD_PER_IP = RateLimit("reset_password:ip", limit=10, window_seconds=900)
+
 
 def _resolve_client_ip(request: Request) -> str:
     forwarded_for = request.headers.get("x-forwarded-for", "").strip()
@@ -70,16 +80,8 @@ def login(
     client_ip = _resolve_client_ip(request)
     normalized_email = payload.email.strip().lower()
 
-    per_ip_allowed = check_rate_limit(
-        key=f"login:ip:{client_ip}",
-        limit=30,
-        window_seconds=60,
-    )
-    per_email_allowed = check_rate_limit(
-        key=f"login:email:{client_ip}:{normalized_email}",
-        limit=8,
-        window_seconds=60,
-    )
+    per_ip_allowed = allow_request(LOGIN_PER_IP, client_ip)
+    per_email_allowed = allow_request(LOGIN_PER_EMAIL, f"{client_ip}:{normalized_email}")
     if not (per_ip_allowed and per_email_allowed):
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -121,12 +123,7 @@ def refresh(
     db: Session = Depends(get_db_session),
 ):
     client_ip = _resolve_client_ip(request)
-    allowed = check_rate_limit(
-        key=f"refresh:{client_ip}",
-        limit=20,
-        window_seconds=60,
-    )
-    if not allowed:
+    if not allow_request(REFRESH_PER_IP, client_ip):
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Too many refresh attempts. Please try again later.",
@@ -195,12 +192,8 @@ def register(
         and payload.organizationMode == "join"
     )
 
-    allowed = check_rate_limit(
-        key=f"register:{'join' if is_join_flow else 'create'}:{client_ip}",
-        limit=8 if is_join_flow else 12,
-        window_seconds=60,
-    )
-    if not allowed:
+    rule = REGISTER_JOIN_PER_IP if is_join_flow else REGISTER_CREATE_PER_IP
+    if not allow_request(rule, client_ip):
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Too many attempts. Please try again later.",
@@ -220,19 +213,10 @@ def forgot_password(
     client_ip = _resolve_client_ip(request)
     normalized_email = payload.email.strip().lower()
 
-    allowed = check_rate_limit(
-        key=f"forgot_password:email:{normalized_email}",
-        limit=3,
-        window_seconds=900,
-    )
-    if not allowed:
+    if not allow_request(FORGOT_PASSWORD_PER_EMAIL, normalized_email):
         return {"message": "ok"}
 
-    check_rate_limit(
-        key=f"forgot_password:ip:{client_ip}",
-        limit=10,
-        window_seconds=900,
-    )
+    allow_request(FORGOT_PASSWORD_PER_IP, client_ip)
 
     try:
         request_password_reset(db, email=normalized_email)
@@ -253,12 +237,7 @@ def reset_password(
 ):
     client_ip = _resolve_client_ip(request)
 
-    allowed = check_rate_limit(
-        key=f"reset_password:ip:{client_ip}",
-        limit=10,
-        window_seconds=900,
-    )
-    if not allowed:
+    if not allow_request(RESET_PASSWORD_PER_IP, client_ip):
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Too many attempts. Please try again later.",
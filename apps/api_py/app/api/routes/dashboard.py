@@ -1,108 +1,116 @@
+from datetime import datetime, time, timezone
 from typing import Dict, List
+from uuid import UUID
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy import String, cast, func, literal, select, union_all
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, get_db_session
+from app.api.conditional import conditional_json_response
+from app.api.deps import get_db_session, get_token_user
 from app.db.models import (
     AuditEvent,
     Environment,
     Project,
     ProjectMember,
-    Secret,
+    SecretCounter,
     User,
 )
 from app.db.models.enums import RoleEnum
 from app.schemas.dashboard import DashboardStatsOut, RecentActivityOut
+from app.services.audit_partitions import add_months, month_start
+from app.services.dashboard_cache import dashboard_cache
 
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
+RECENT_ACTIVITY_LIMIT = 10
 
-@router.get("/stats", response_model=DashboardStatsOut)
-def get_dashboard_stats(
-    user=Depends(get_current_user),
-    db: Session = Depends(get_db_session),
-):
-    is_admin = user.role == RoleEnum.admin
-    user_id = user.id
 
-    # --- Total secrets ---
-    if is_admin:
-        total_secrets = int(
-            db.scalar(select(func.count(Secret.id))) or 0
-        )
-    else:
-        total_secrets = int(
-            db.scalar(
-                select(func.count(Secret.id))
-                .join(ProjectMember, ProjectMember.project_id == Secret.project_id)
-                .where(ProjectMember.user_id == user_id)
-            )
-            or 0
-        )
+def _dashboard_counts(db: Session, user_id: UUID, is_admin: bool) -> Dict:
+    """Tum sayaclari tek sorguda hesaplar.
 
-    # --- Total projects ---
+    `scope` CTE'si kullanicinin gorebildigi projelerdir (admin icin hepsi);
+    secret sayilari secret_counters'tan toplanir, secrets tablosu okunmaz.
+    Tum sayaclar UNION ALL ile tek seferde doner.
+    """
     if is_admin:
-        total_projects = int(
-            db.scalar(select(func.count(Project.id))) or 0
-        )
+        scope = select(Project.id.label("project_id")).cte("scope")
     else:
-        total_projects = int(
-            db.scalar(
-                select(func.count(ProjectMember.id)).where(
-                    ProjectMember.user_id == user_id
-                )
-            )
-            or 0
+        scope = (
+            select(ProjectMember.project_id.label("project_id"))
+            .where(ProjectMember.user_id == user_id)
+            .cte("scope")
         )
+    scope_ids = select(scope.c.project_id)
 
-    # --- Total members (distinct users across accessible projects) ---
-    if is_admin:
-        total_members = int(
-            db.scalar(
-                select(func.count(func.distinct(ProjectMember.user_id)))
-            )
-            or 0
-        )
-    else:
-        accessible_project_ids = select(ProjectMember.project_id).where(
-            ProjectMember.user_id == user_id
-        )
-        total_members = int(
-            db.scalar(
-                select(func.count(func.distinct(ProjectMember.user_id))).where(
-                    ProjectMember.project_id.in_(accessible_project_ids)
-                )
-            )
-            or 0
+    scoped_counters = (
+        select(
+            SecretCounter.provider.label("provider"),
+            cast(Environment.name, String).label("env_name"),
+            SecretCounter.secret_count.label("secret_count"),
         )
+        .join(Environment, Environment.id == SecretCounter.environment_id)
+        .where(SecretCounter.project_id.in_(scope_ids), SecretCounter.secret_count > 0)
+        .cte("scoped_counters")
+    )
+    no_group = literal(None, String)
+    total = func.coalesce(func.sum(scoped_counters.c.secret_count), 0)
+
+    query = union_all(
+        select(literal("secrets"), no_group, total),
+        select(literal("projects"), no_group, func.count()).select_from(scope),
+        select(
+            literal("members"), no_group, func.count(func.distinct(ProjectMember.user_id))
+        ).where(ProjectMember.project_id.in_(scope_ids)),
+        select(literal("env"), scoped_counters.c.env_name, total).group_by(
+            scoped_counters.c.env_name
+        ),
+        select(literal("provider"), scoped_counters.c.provider, total).group_by(
+            scoped_counters.c.provider
+        ),
+    )
 
-    # --- Recent activity (last 10 audit events) ---
-    if is_admin:
-        audit_query = (
-            select(AuditEvent, User.email, Project.slug)
-            .join(User, User.id == AuditEvent.actor_user_id, isouter=True)
-            .join(Project, Project.id == AuditEvent.project_id, isouter=True)
-            .order_by(AuditEvent.created_at.desc())
-            .limit(10)
-        )
-    else:
+    counts: Dict = {
+        "secrets": 0,
+        "projects": 0,
+        "members": 0,
+        "env": {},
+        "provider": {},
+    }
+    for kind, group, count in db.execute(query):
+        if kind in ("env", "provider"):
+            counts[kind][group] = int(count)
+        else:
+            counts[kind] = int(count or 0)
+    return counts
+
+
+def _recent_activity(db: Session, user_id: UUID, is_admin: bool) -> List[Dict]:
+    audit_query = (
+        select(AuditEvent, User.email, Project.slug)
+        .join(User, User.id == AuditEvent.actor_user_id, isouter=True)
+        .join(Project, Project.id == AuditEvent.project_id, isouter=True)
+        .order_by(AuditEvent.created_at.desc())
+        .limit(RECENT_ACTIVITY_LIMIT)
+    )
+    if not is_admin:
         accessible_project_ids_sub = select(ProjectMember.project_id).where(
             ProjectMember.user_id == user_id
         )
-        audit_query = (
-            select(AuditEvent, User.email, Project.slug)
-            .join(User, User.id == AuditEvent.actor_user_id, isouter=True)
-            .join(Project, Project.id == AuditEvent.project_id, isouter=True)
-            .where(AuditEvent.project_id.in_(accessible_project_ids_sub))
-            .order_by(AuditEvent.created_at.desc())
-            .limit(10)
+        audit_query = audit_query.where(AuditEvent.project_id.in_(accessible_project_ids_sub))
+
+    # Once bu ve gecen ayin partisyonlarina bakilir; yeterli olay yoksa tum tablo
+    window_start = add_months(month_start(datetime.now(timezone.utc).date()), -1)
+    audit_rows = db.execute(
+        audit_query.where(
+            AuditEvent.created_at >= datetime.combine(window_start, time(), timezone.utc)
         )
+    ).all()
+    if len(audit_rows) < RECENT_ACTIVITY_LIMIT:
+        audit_rows = db.execute(audit_query).all()
 
-    audit_rows = db.execute(audit_query).all()
-    recent_activity: List[Dict] = [
+    return [
         {
             "id": str(event.id),
             "action": event.action,
@@ -114,50 +122,33 @@ def get_dashboard_stats(
         for event, email, slug in audit_rows
     ]
 
-    # --- Secrets by environment ---
-    if is_admin:
-        env_query = (
-            select(Environment.name, func.count(Secret.id))
-            .join(Secret, Secret.environment_id == Environment.id)
-            .group_by(Environment.name)
-        )
-    else:
-        env_query = (
-            select(Environment.name, func.count(Secret.id))
-            .join(Secret, Secret.environment_id == Environment.id)
-            .join(ProjectMember, ProjectMember.project_id == Secret.project_id)
-            .where(ProjectMember.user_id == user_id)
-            .group_by(Environment.name)
-        )
-
-    env_rows = db.execute(env_query).all()
-    secrets_by_environment: Dict[str, int] = {
-        env_name.value: count for env_name, count in env_rows
-    }
-
-    # --- Secrets by provider ---
-    if is_admin:
-        provider_query = (
-            select(Secret.provider, func.count(Secret.id)).group_by(Secret.provider)
-        )
-    else:
-        provider_query = (
-            select(Secret.provider, func.count(Secret.id))
-            .join(ProjectMember, ProjectMember.project_id == Secret.project_id)
-            .where(ProjectMember.user_id == user_id)
-            .group_by(Secret.provider)
-        )
 
-    provider_rows = db.execute(provider_query).all()
-    secrets_by_provider: Dict[str, int] = {
-        provider: count for provider, count in provider_rows
-    }
+@router.get("/stats", response_model=DashboardStatsOut)
+def get_dashboard_stats(
+    request: Request,
+    user=Depends(get_token_user),
+    db: Session = Depends(get_db_session),
+):
+    is_admin = user.role == RoleEnum.admin
 
-    return DashboardStatsOut(
-        totalSecrets=total_secrets,
-        totalProjects=total_projects,
-        totalMembers=total_members,
-        recentActivity=recent_activity,
-        secretsByEnvironment=secrets_by_environment,
-        secretsByProvider=secrets_by_provider,
+    # Sayaclar cache'lenir (secret/proje/uyelik yazmalarinda bayatlar); son
+    # aktivite her istekte tek indeksli sorguyla okunur.
+    cache_key = (user.id, is_admin)
+    counts = dashboard_cache.get(cache_key)
+    if counts is None:
+        counts = _dashboard_counts(db, user.id, is_admin)
+        dashboard_cache.set(cache_key, counts)
+
+    stats = DashboardStatsOut(
+        totalSecrets=counts["secrets"],
+        totalProjects=counts["projects"],
+        totalMembers=counts["members"],
+        recentActivity=[
+            RecentActivityOut(**item) for item in _recent_activity(db, user.id, is_admin)
+        ],
+        secretsByEnvironment=counts["env"],
+        secretsByProvider=counts["provider"],
+    )
+    return conditional_json_response(
+        request, stats.model_dump_json().encode("utf-8"), cache_control="private, no-cache"
     )
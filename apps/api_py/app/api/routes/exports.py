@@ -1,31 +1,54 @@
-import json
-from typing import Optional
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, get_db_session
+from app.api.conditional import etag_matches, not_modified_response
+from app.api.deps import get_access_context, get_current_user, get_db_session
+from app.api.streaming import (
+    EXPORT_CACHE_CONTROL,
+    EXPORT_FORMATS,
+    export_etag,
+    export_response,
+    grouped_export_response,
+)
 from app.db.models.enums import EnvironmentEnum, RoleEnum
 from app.db.repositories.domain_repo import (
+    AccessContext,
     add_audit_event,
-    export_secrets,
-    export_secrets_all_envs,
-    has_environment_export_access,
+    count_export_secrets,
+    get_content_versions,
+    iter_export_secrets,
+    normalize_tags,
+    resolve_export_scope,
+    resolve_export_scopes_all_envs,
 )
 
 
 router = APIRouter(tags=["exports"])
 
 
+def _with_etag(response: StreamingResponse, etag: Optional[str]) -> StreamingResponse:
+    if etag:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = EXPORT_CACHE_CONTROL
+    return response
+
+
 @router.get("/exports/{project_id}")
 def export_project(
+    request: Request,
     project_id: str,
     env: EnvironmentEnum = Query(...),
     format: str = Query(...),
     tag: Optional[str] = Query(None),
+    tags: List[str] = Query([]),
+    tag_mode: Literal["all", "any"] = Query("all"),
     reason: Optional[str] = Query(None),
     user=Depends(get_current_user),
     db: Session = Depends(get_db_session),
+    access: AccessContext = Depends(get_access_context),
 ):
     normalized_reason = (reason or "").strip()
     if len(normalized_reason) < 3:
@@ -40,10 +63,27 @@ def export_project(
             detail="Viewer cannot export by default",
         )
 
-    if not has_environment_export_access(db, str(user.id), project_id, env):
+    if not access.has_environment_export_access(project_id, env):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
-    rows = export_secrets(db, str(user.id), project_id, env, tag=tag)
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported format"
+        )
+
+    tag_filter = {"tag": tag, "tags": tags, "tag_mode": tag_mode}
+    scope = resolve_export_scope(access, project_id, env)
+    count = 0
+    etag = None
+    if scope:
+        project_uuid, env_id = scope
+        # Istemcideki kopya guncelse secret okunmaz ve audit yazilmaz
+        etag = export_etag(
+            get_content_versions(db, [env_id]), format, normalize_tags(tag, tags), tag_mode
+        )
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified_response(etag, EXPORT_CACHE_CONTROL)
+        count = count_export_secrets(db, project_uuid, [env_id], **tag_filter).get(env_id, 0)
 
     add_audit_event(
         db,
@@ -54,37 +94,31 @@ def export_project(
         metadata={
             "secretName": f"{project_id}:{env.value}",
             "format": format,
-            "count": len(rows),
+            "count": count,
             "tag": tag,
+            "tags": tags,
+            "tagMode": tag_mode,
             "reason": normalized_reason,
         },
+        access=access,
     )
 
-    if format == "env":
-        payload = "\n".join(
-            f"{item['key_name']}={item['value_plain']}" for item in rows
-        )
-        return Response(content=payload, media_type="text/plain")
-
-    if format == "json":
-        payload = {item["key_name"]: item["value_plain"] for item in rows}
-        return Response(
-            content=json.dumps(payload, indent=2), media_type="application/json"
-        )
-
-    raise HTTPException(
-        status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported format"
-    )
+    rows = iter_export_secrets(db, project_uuid, env_id, **tag_filter) if count else iter(())
+    return _with_etag(export_response(rows, format), etag)
 
 
 @router.get("/exports/{project_id}/all")
 def export_project_all_envs(
+    request: Request,
     project_id: str,
     format: str = Query(...),
     tag: Optional[str] = Query(None),
+    tags: List[str] = Query([]),
+    tag_mode: Literal["all", "any"] = Query("all"),
     reason: Optional[str] = Query(None),
     user=Depends(get_current_user),
     db: Session = Depends(get_db_session),
+    access: AccessContext = Depends(get_access_context),
 ):
     """Tum ortamlar icin secret'lari export eder."""
     normalized_reason = (reason or "").strip()
@@ -100,9 +134,33 @@ def export_project_all_envs(
             detail="Viewer cannot export by default",
         )
 
-    env_data = export_secrets_all_envs(db, str(user.id), project_id, tag=tag)
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported format"
+        )
 
-    total_count = sum(len(rows) for rows in env_data.values())
+    tag_filter = {"tag": tag, "tags": tags, "tag_mode": tag_mode}
+    scopes = resolve_export_scopes_all_envs(access, project_id)
+    etag = None
+    if scopes:
+        etag = export_etag(
+            get_content_versions(db, [env_id for _, _, env_id in scopes]),
+            format,
+            normalize_tags(tag, tags),
+            tag_mode,
+        )
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified_response(etag, EXPORT_CACHE_CONTROL)
+    counts = (
+        count_export_secrets(
+            db, scopes[0][1], [env_id for _, _, env_id in scopes], **tag_filter
+        )
+        if scopes
+        else {}
+    )
+    # Bos ortamlar ciktiya hic yazilmaz
+    scopes = [scope for scope in scopes if counts.get(scope[2])]
+    total_count = sum(counts.values())
 
     add_audit_event(
         db,
@@ -115,29 +173,16 @@ def export_project_all_envs(
             "format": format,
             "count": total_count,
             "tag": tag,
-            "environments": list(env_data.keys()),
+            "tags": tags,
+            "tagMode": tag_mode,
+            "environments": [env.value for env, _, _ in scopes],
             "reason": normalized_reason,
         },
+        access=access,
     )
 
-    if format == "env":
-        sections = []
-        for env_name, rows in env_data.items():
-            section_lines = [f"# --- {env_name.upper()} ---"]
-            for item in rows:
-                section_lines.append(f"{item['key_name']}={item['value_plain']}")
-            sections.append("\n".join(section_lines))
-        payload = "\n\n".join(sections)
-        return Response(content=payload, media_type="text/plain")
-
-    if format == "json":
-        payload = {}
-        for env_name, rows in env_data.items():
-            payload[env_name] = {item["key_name"]: item["value_plain"] for item in rows}
-        return Response(
-            content=json.dumps(payload, indent=2), media_type="application/json"
-        )
-
-    raise HTTPException(
-        status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported format"
+    groups = (
+        (env.value, iter_export_secrets(db, project_uuid, env_id, **tag_filter))
+        for env, project_uuid, env_id in scopes
     )
+    return _with_etag(grouped_export_response(groups, format), etag)
@@ -1,14 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from starlette.datastructures import UploadFile
+from starlette.types import Message, Receive
 
-from app.api.deps import get_db_session, require_roles
+from app.api.deps import get_access_context, get_db_session, require_roles
+from app.core.config import get_settings
 from app.db.repositories.domain_repo import (
+    AccessContext,
     add_audit_event,
-    create_secret,
-    find_secret_by_key,
-    has_environment_read_access,
+    bulk_import_secrets,
     mask_value,
-    update_secret,
 )
 from app.schemas.imports import (
     ImportCommitOut,
@@ -16,24 +21,21 @@ from app.schemas.imports import (
     ImportPreviewOut,
     ImportPreviewRequest,
 )
-from app.services.import_parser import parse_txt_import
+from app.services import import_formats
+from app.services.import_formats import DEFAULT_IMPORT_FORMAT
+from app.services.import_parser import ImportPreview, aiter_lines, apreview_txt_import
 
 
 router = APIRouter(prefix="/imports", tags=["imports"])
 
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
 
 def _key_to_name(key: str) -> str:
     return " ".join(part.capitalize() for part in key.lower().split("_"))
 
 
-@router.post("/preview", response_model=ImportPreviewOut)
-def preview_import(
-    payload: ImportPreviewRequest,
-    user=Depends(require_roles(["admin"])),
-    db: Session = Depends(get_db_session),
-):
-    parsed = parse_txt_import(payload.content)
-
+def _record_preview(db: Session, user, result: ImportPreview) -> dict:
     add_audit_event(
         db,
         actor_user_id=str(user.id),
@@ -41,76 +43,154 @@ def preview_import(
         action="import_preview",
         target_type="import",
         metadata={
-            "totalPairs": len(parsed.pairs),
-            "skipped": parsed.skipped,
+            "totalPairs": result.total_pairs,
+            "skipped": result.skipped,
         },
     )
 
     return {
-        "heading": parsed.project_heading,
-        "totalPairs": len(parsed.pairs),
-        "skipped": parsed.skipped,
+        "heading": result.project_heading,
+        "totalPairs": result.total_pairs,
+        "skipped": result.skipped,
         "preview": [
             {"key": item.key, "value": mask_value(item.value)}
-            for item in parsed.pairs[:50]
+            for item in result.preview
         ],
     }
 
 
+@router.post("/preview", response_model=ImportPreviewOut)
+def preview_import(
+    payload: ImportPreviewRequest,
+    user=Depends(require_roles(["admin"])),
+    db: Session = Depends(get_db_session),
+):
+    try:
+        result = import_formats.preview_import(payload.content, payload.format)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return _record_preview(db, user, result)
+
+
+def _limited_receive(receive: Receive, max_bytes: int) -> Receive:
+    received = 0
+
+    async def limited() -> Message:
+        nonlocal received
+        message = await receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > max_bytes:
+                raise HTTPException(
+                    status_code=413, detail=f"Upload exceeds {max_bytes} bytes"
+                )
+        return message
+
+    return limited
+
+
+async def _upload_chunks(request: Request, max_bytes: int) -> AsyncIterator[bytes]:
+    """Ham govdenin ya da multipart `file` alaninin byte'lari; `max_bytes` asilinca 413."""
+    limited = Request(request.scope, _limited_receive(request.receive, max_bytes))
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        async for chunk in limited.stream():
+            yield chunk
+        return
+
+    # Dosya parcasi diske tasabilen gecici dosyada tutulur, bellege alinmaz
+    form = await limited.form(max_files=1, max_fields=10)
+    try:
+        upload = form.get("file")
+        if not isinstance(upload, UploadFile):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Multipart upload requires a 'file' field",
+            )
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
+    finally:
+        await form.close()
+
+
+@router.post("/preview/upload", response_model=ImportPreviewOut)
+async def preview_import_upload(
+    request: Request,
+    format: str = Query(default=DEFAULT_IMPORT_FORMAT),
+    user=Depends(require_roles(["admin"])),
+    db: Session = Depends(get_db_session),
+):
+    """Ham govdeyi (chunked olabilir) veya multipart `file` alanini okurken onizleme uretir.
+
+    TXT icerigi satir satir islenir ve bellekte tutulmaz. Diger formatlar tam
+    parse gerektirdiginden govde once okunur; her iki durumda da boyut
+    IMPORT_MAX_UPLOAD_BYTES ile sinirlidir.
+    """
+    try:
+        import_formats.get_import_parser(format)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    max_bytes = get_settings().IMPORT_MAX_UPLOAD_BYTES
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds {max_bytes} bytes")
+
+    chunks = _upload_chunks(request, max_bytes)
+    if format == "txt":
+        result = await apreview_txt_import(aiter_lines(chunks))
+    else:
+        content = b"".join([chunk async for chunk in chunks]).decode("utf-8", errors="replace")
+        try:
+            result = await run_in_threadpool(import_formats.preview_import, content, format)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return await run_in_threadpool(_record_preview, db, user, result)
+
+
 @router.post("/commit", response_model=ImportCommitOut)
 def commit_import(
     payload: ImportCommitRequest,
     user=Depends(require_roles(["admin"])),
     db: Session = Depends(get_db_session),
+    access: AccessContext = Depends(get_access_context),
 ):
-    if not has_environment_read_access(
-        db, str(user.id), payload.projectId, payload.environment
-    ):
+    if not access.has_environment_read_access(payload.projectId, payload.environment):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
-    parsed = parse_txt_import(payload.content)
-    inserted = 0
-    updated = 0
-    skipped = parsed.skipped
+    try:
+        parsed = import_formats.parse_import(payload.content, payload.format)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
 
-    for pair in parsed.pairs:
-        existing = find_secret_by_key(
-            db, str(user.id), payload.projectId, payload.environment, pair.key
-        )
-        if existing is None:
-            create_secret(
-                db,
-                str(user.id),
-                payload.projectId,
-                {
-                    "name": _key_to_name(pair.key),
-                    "provider": payload.provider,
-                    "type": payload.type,
-                    "environment": payload.environment,
-                    "keyName": pair.key,
-                    "value": pair.value,
-                    "tags": payload.tags,
-                    "notes": "Imported from TXT",
-                },
-            )
-            inserted += 1
-            continue
-
-        if payload.conflictStrategy == "skip":
-            skipped += 1
-            continue
-
-        update_secret(
+    try:
+        result = bulk_import_secrets(
             db,
             str(user.id),
-            str(existing.id),
-            {
-                "provider": payload.provider,
-                "type": payload.type,
-                "value": pair.value,
-            },
+            payload.projectId,
+            payload.environment,
+            [(pair.key, pair.value) for pair in parsed.pairs],
+            provider=payload.provider,
+            secret_type=payload.type,
+            tags=payload.tags,
+            notes=f"Imported from {payload.format.upper()}",
+            conflict_strategy=payload.conflictStrategy,
+            key_to_name=_key_to_name,
+            access=access,
         )
-        updated += 1
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+    except PermissionError:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Import conflicted with a concurrent change, retry",
+        )
+
+    inserted = result["inserted"]
+    updated = result["updated"]
+    skipped = parsed.skipped + result["skipped"]
 
     add_audit_event(
         db,
@@ -125,6 +205,7 @@ def commit_import(
             "skipped": skipped,
             "conflictStrategy": payload.conflictStrategy,
         },
+        access=access,
     )
 
     return {
@@ -134,4 +215,5 @@ def commit_import(
         "updated": updated,
         "skipped": skipped,
         "total": len(parsed.pairs),
+        "items": result["items"],
     }
@@ -0,0 +1,25 @@
+from typing import Dict
+
+from fastapi import APIRouter, Depends
+
+from app.api.deps import require_roles
+from app.db.async_session import async_pool_status
+from app.db.session import pool_status
+from app.services.password_hasher import get_password_hasher, hashing_metrics
+
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/password-hashing")
+def get_password_hashing_metrics(user=Depends(require_roles(["admin"]))) -> Dict:
+    return {"pooled": get_password_hasher() is not None, **hashing_metrics.snapshot()}
+
+
+@router.get("/db-pool")
+def get_db_pool_metrics(user=Depends(require_roles(["admin"]))) -> Dict:
+    status = pool_status()
+    async_status = async_pool_status()
+    if async_status is not None:
+        status["async"] = async_status
+    return status
@@ -18,11 +18,15 @@ from app.schemas.projects import (
     InviteOut,
     OrganizationSummaryOut,
 )
-from app.core.rate_limit import check_rate_limit
+from app.core.rate_limit import RateLimit, allow_request
 
 
 router = APIRouter(prefix="/organizations", tags=["organizations"])
 
+# Route limitleri (RATE_LIMITS ayari ile ada gore ezilebilir)
+INVITE_CREATE_LIMIT = RateLimit("invite-create", limit=20, window_seconds=60)
+INVITE_ROTATE_LIMIT = RateLimit("invite-rotate", limit=20, window_seconds=60)
+
 
 @router.get("/managed", response_model=List[OrganizationSummaryOut])
 def list_managed_organizations(
@@ -53,11 +57,7 @@ def create_invite(
     db: Session = Depends(get_db_session),
 ):
     client_ip = request.client.host if request.client else "unknown"
-    if not check_rate_limit(
-        key=f"invite-create:{project_id}:{client_ip}",
-        limit=20,
-        window_seconds=60,
-    ):
+    if not allow_request(INVITE_CREATE_LIMIT, f"{project_id}:{client_ip}"):
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Too many invite operations. Please try again later.",
@@ -97,11 +97,7 @@ def rotate_invite(
     db: Session = Depends(get_db_session),
 ):
     client_ip = request.client.host if request.client else "unknown"
-    if not check_rate_limit(
-        key=f"invite-rotate:{project_id}:{client_ip}",
-        limit=20,
-        window_seconds=60,
-    ):
+    if not allow_request(INVITE_ROTATE_LIMIT, f"{project_id}:{client_ip}"):
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Too many invite operations. Please try again later.",
@@ -1,11 +1,13 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, get_db_session
+from app.api.deps import get_db_session, get_token_user
+from app.api.streaming import ndjson_response
+from app.core.pagination import DEFAULT_PAGE_LIMIT, NEXT_CURSOR_HEADER, decode_cursor
 from app.db.models.enums import EnvironmentEnum
-from app.db.repositories.domain_repo import list_secrets
+from app.db.repositories.domain_repo import iter_secrets, list_secrets, list_secrets_page
 from app.schemas.secrets import SecretOut
 
 
@@ -14,20 +16,44 @@ router = APIRouter(tags=["search"])
 
 @router.get("/search", response_model=List[SecretOut])
 def search(
+    response: Response,
     q: str = Query(default=""),
     provider: Optional[str] = Query(default=None),
     tag: Optional[str] = Query(default=None),
+    tags: List[str] = Query(default=[]),
+    tag_mode: Literal["all", "any"] = Query(default="all"),
     environment: Optional[EnvironmentEnum] = Query(default=None),
     type: Optional[str] = Query(default=None),
-    user=Depends(get_current_user),
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None),
+    format: Literal["json", "ndjson"] = Query(default="json"),
+    user=Depends(get_token_user),
     db: Session = Depends(get_db_session),
 ):
-    return list_secrets(
-        db,
-        str(user.id),
-        q=q,
-        provider=provider,
-        tag=tag,
-        env=environment,
-        secret_type=type,
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    filters = {
+        "q": q,
+        "provider": provider,
+        "tag": tag,
+        "tags": tags,
+        "tag_mode": tag_mode,
+        "env": environment,
+        "secret_type": type,
+    }
+    if format == "ndjson":
+        return ndjson_response(iter_secrets(db, str(user.id), cursor=cursor, **filters), SecretOut)
+
+    if limit is None and cursor is None:
+        return list_secrets(db, str(user.id), **filters)
+
+    items, next_cursor = list_secrets_page(
+        db, str(user.id), limit=limit or DEFAULT_PAGE_LIMIT, cursor=cursor, **filters
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
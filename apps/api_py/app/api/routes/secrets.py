@@ -1,18 +1,27 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, get_db_session, require_roles
+from app.api.deps import (
+    get_access_context,
+    get_current_user,
+    get_db_session,
+    require_roles,
+)
+from app.api.streaming import ndjson_response
+from app.core.pagination import DEFAULT_PAGE_LIMIT, NEXT_CURSOR_HEADER, decode_cursor
 from app.db.models.enums import EnvironmentEnum, RoleEnum
 from app.db.repositories.domain_repo import (
+    AccessContext,
     add_audit_event,
     create_secret,
     delete_secret,
     get_secret_value,
-    has_project_access,
+    iter_secrets,
     list_secret_versions,
     list_secrets,
+    list_secrets_page,
     restore_secret_version,
     update_secret,
 )
@@ -31,24 +40,49 @@ router = APIRouter(tags=["secrets"])
 @router.get("/projects/{project_id}/secrets", response_model=List[SecretOut])
 def get_project_secrets(
     project_id: str,
+    response: Response,
     env: Optional[EnvironmentEnum] = Query(default=None),
     provider: Optional[str] = Query(default=None),
     tag: Optional[str] = Query(default=None),
+    tags: List[str] = Query(default=[]),
+    tag_mode: Literal["all", "any"] = Query(default="all"),
     type: Optional[str] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None),
+    format: Literal["json", "ndjson"] = Query(default="json"),
     user=Depends(get_current_user),
     db: Session = Depends(get_db_session),
+    access: AccessContext = Depends(get_access_context),
 ):
-    if not has_project_access(db, str(user.id), project_id):
+    if not access.has_project_access(project_id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-    return list_secrets(
-        db,
-        str(user.id),
-        project_slug=project_id,
-        env=env,
-        provider=provider,
-        tag=tag,
-        secret_type=type,
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    filters = {
+        "project_slug": project_id,
+        "env": env,
+        "provider": provider,
+        "tag": tag,
+        "tags": tags,
+        "tag_mode": tag_mode,
+        "secret_type": type,
+    }
+    if format == "ndjson":
+        return ndjson_response(iter_secrets(db, str(user.id), cursor=cursor, **filters), SecretOut)
+
+    if limit is None and cursor is None:
+        return list_secrets(db, str(user.id), **filters)
+
+    items, next_cursor = list_secrets_page(
+        db, str(user.id), limit=limit or DEFAULT_PAGE_LIMIT, cursor=cursor, **filters
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
 
 
 @router.post("/projects/{project_id}/secrets", response_model=SecretOut)
@@ -57,9 +91,12 @@ def create_project_secret(
     payload: SecretCreateRequest,
     user=Depends(require_roles(["admin", "member"])),
     db: Session = Depends(get_db_session),
+    access: AccessContext = Depends(get_access_context),
 ):
     try:
-        created = create_secret(db, str(user.id), project_id, payload.model_dump())
+        created = create_secret(
+            db, str(user.id), project_id, payload.model_dump(), access=access
+        )
     except PermissionError as exc:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden") from exc
     except ValueError as exc:
@@ -73,6 +110,7 @@ def create_project_secret(
         target_type="secret",
         target_id=created["id"],
         metadata={"secretName": created["name"]},
+        access=access,
     )
     return created
 
@@ -83,9 +121,14 @@ def patch_secret(
     payload: SecretUpdateRequest,
     user=Depends(require_roles(["admin", "member"])),
     db: Session = Depends(get_db_session),
+    access: AccessContext = Depends(get_access_context),
 ):
     updated = update_secret(
-        db, str(user.id), secret_id, payload.model_dump(exclude_unset=True)
+        db,
+        str(user.id),
+        secret_id,
+        payload.model_dump(exclude_unset=True),
+        access=access,
     )
     if not updated:
         raise HTTPException(
@@ -99,6 +142,7 @@ def patch_secret(
         target_type="secret",
         target_id=updated["id"],
         metadata={"secretName": updated["name"]},
+        access=access,
     )
     return updated
 
@@ -108,8 +152,9 @@ def remove_secret(
     secret_id: str,
     user=Depends(require_roles(["admin"])),
     db: Session = Depends(get_db_session),
+    access: AccessContext = Depends(get_access_context),
 ):
-    deleted = delete_secret(db, str(user.id), secret_id)
+    deleted = delete_secret(db, str(user.id), secret_id, access=access)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Secret not found"
@@ -122,6 +167,7 @@ def remove_secret(
         target_type="secret",
         target_id=deleted["id"],
         metadata={"secretName": deleted["name"], "event": "deleted"},
+        access=access,
     )
 
 
@@ -131,7 +177,8 @@ def reveal_secret(
     reason: Optional[str] = Query(default=None),
     user=Depends(get_current_user),
     db: Session = Depends(get_db_session),
-): 
+    access: AccessContext = Depends(get_access_context),
+):
     normalized_reason = (reason or "").strip()
     if user.role == RoleEnum.admin:
         if not normalized_reason:
@@ -143,7 +190,7 @@ def reveal_secret(
                 detail="Reveal reason is required",
             )
 
-    value = get_secret_value(db, str(user.id), secret_id)
+    value = get_secret_value(db, str(user.id), secret_id, access=access)
     if not value:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Secret not found"
@@ -157,6 +204,7 @@ def reveal_secret(
         target_type="secret",
         target_id=secret_id,
         metadata={"secretName": value["keyName"], "reason": normalized_reason},
+        access=access,
     )
     return value
 
@@ -166,8 +214,9 @@ def get_versions(
     secret_id: str,
     user=Depends(get_current_user),
     db: Session = Depends(get_db_session),
+    access: AccessContext = Depends(get_access_context),
 ):
-    versions = list_secret_versions(db, str(user.id), secret_id)
+    versions = list_secret_versions(db, str(user.id), secret_id, access=access)
     if versions is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Secret not found"
@@ -181,9 +230,12 @@ def restore_version(
     version: int,
     user=Depends(require_roles(["admin", "member"])),
     db: Session = Depends(get_db_session),
+    access: AccessContext = Depends(get_access_context),
 ):
     try:
-        restored = restore_secret_version(db, str(user.id), secret_id, version)
+        restored = restore_secret_version(
+            db, str(user.id), secret_id, version, access=access
+        )
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
@@ -200,5 +252,6 @@ def restore_version(
         target_type="secret",
         target_id=restored["id"],
         metadata={"secretName": restored["name"], "restoredVersion": version},
+        access=access,
     )
     return restored
@@ -1,46 +1,102 @@
-import json
-from typing import Optional
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
+from app.api.conditional import etag_matches, not_modified_response
 from app.api.deps import get_db_session
+from app.api.streaming import (
+    EXPORT_CACHE_CONTROL,
+    EXPORT_FORMATS,
+    export_etag,
+    export_response,
+)
+from app.core.config import get_settings
 from app.db.models.enums import EnvironmentEnum
-from app.db.repositories.domain_repo import add_audit_event, export_secrets_with_service_token
+from app.db.repositories.domain_repo import (
+    add_audit_event,
+    count_export_secrets,
+    iter_export_secrets,
+    normalize_tags,
+    read_content_version,
+    resolve_service_export_scope,
+)
+from app.services.content_versions import wait_for_content_change
 
 
 router = APIRouter(prefix="/service-access", tags=["service-access"])
 
 
 @router.get("/projects/{project_id}/exports")
-def service_export_project(
+async def service_export_project(
+    request: Request,
     project_id: str,
     env: EnvironmentEnum = Query(...),
     format: str = Query(...),
     tag: Optional[str] = Query(default=None),
+    tags: List[str] = Query(default=[]),
+    tag_mode: Literal["all", "any"] = Query(default="all"),
+    wait: float = Query(default=0, ge=0),
     x_service_token: Optional[str] = Header(default=None, alias="X-Service-Token"),
     db: Session = Depends(get_db_session),
 ):
+    """Ortami export eder; `If-None-Match` eslesirse secret okunmadan 304 doner.
+
+    `wait` > 0 ve ETag eslesiyorsa icerik degisene (veya sure dolana) kadar
+    beklenir; bekleme sirasinda thread ve DB baglantisi tutulmaz.
+    """
     if not x_service_token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="X-Service-Token header is required",
         )
 
-    rows = export_secrets_with_service_token(
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported format",
+        )
+
+    scope = await run_in_threadpool(
+        resolve_service_export_scope,
         db,
         service_token=x_service_token,
         project_slug=project_id,
         environment=env,
-        tag=tag,
     )
-    if rows is None:
+    if scope is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid service token",
         )
+    project_uuid, env_id = scope
 
-    add_audit_event(
+    # Surum satirlardan once okunur: arada bir yazma olursa ETag eski kalir ve
+    # sonraki istek yeniden indirir; tersi (yeni ETag, eski icerik) olmaz.
+    normalized_tags = normalize_tags(tag, tags)
+    version = await run_in_threadpool(read_content_version, db, env_id)
+    etag = export_etag({env_id: version}, format, normalized_tags, tag_mode)
+    if_none_match = request.headers.get("if-none-match")
+    if wait and etag_matches(if_none_match, etag):
+        settings = get_settings()
+        version = await wait_for_content_change(
+            env_id,
+            version,
+            min(wait, settings.EXPORT_LONG_POLL_MAX_SECONDS),
+            lambda: run_in_threadpool(read_content_version, db, env_id),
+            check_interval=settings.EXPORT_LONG_POLL_CHECK_SECONDS,
+        )
+        etag = export_etag({env_id: version}, format, normalized_tags, tag_mode)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag, EXPORT_CACHE_CONTROL)
+
+    tag_filter = {"tag": tag, "tags": tags, "tag_mode": tag_mode}
+    count = (
+        await run_in_threadpool(count_export_secrets, db, project_uuid, [env_id], **tag_filter)
+    ).get(env_id, 0)
+    await run_in_threadpool(
+        add_audit_event,
         db,
         actor_user_id=None,
         project_slug=project_id,
@@ -49,20 +105,16 @@ def service_export_project(
         metadata={
             "secretName": f"{project_id}:{env.value}",
             "format": format,
-            "count": len(rows),
+            "count": count,
             "tag": tag,
+            "tags": tags,
+            "tagMode": tag_mode,
         },
     )
 
-    if format == "env":
-        payload = "\n".join(f"{item['key_name']}={item['value_plain']}" for item in rows)
-        return Response(content=payload, media_type="text/plain")
-
-    if format == "json":
-        payload = {item["key_name"]: item["value_plain"] for item in rows}
-        return Response(content=json.dumps(payload, indent=2), media_type="application/json")
-
-    raise HTTPException(
-        status_code=status.HTTP_400_BAD_REQUEST,
-        detail="Unsupported format",
-    )
+    # Satirlar yanit gonderilirken DB cursor'indan parti parti cozulur
+    rows = iter_export_secrets(db, project_uuid, env_id, **tag_filter) if count else iter(())
+    response = export_response(rows, format)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = EXPORT_CACHE_CONTROL
+    return response
@@ -0,0 +1,160 @@
+import json
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.api.conditional import version_etag
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+EXPORT_FORMATS = ("env", "json", "ndjson")
+# Secret iceren yanitlar ara bellege yazilmaz; ajanlar ETag'i kendisi saklar
+EXPORT_CACHE_CONTROL = "no-store"
+EXPORT_MEDIA_TYPES = {
+    "env": "text/plain",
+    "json": "application/json",
+    "ndjson": NDJSON_MEDIA_TYPE,
+}
+
+
+def _ndjson_lines(
+    items: Iterable[Mapping], model: Type[BaseModel]
+) -> Iterator[str]:
+    for item in items:
+        yield model.model_validate(item).model_dump_json() + "\n"
+
+
+async def _ndjson_lines_async(
+    items: AsyncIterable[Mapping], model: Type[BaseModel]
+) -> AsyncIterator[str]:
+    async for item in items:
+        yield model.model_validate(item).model_dump_json() + "\n"
+
+
+def ndjson_response(
+    items: Union[Iterable[Mapping], AsyncIterable[Mapping]], model: Type[BaseModel]
+) -> StreamingResponse:
+    """Her satiri ayri bir JSON nesnesi olarak, uretildikce gonderir."""
+    if isinstance(items, AsyncIterable):
+        return StreamingResponse(
+            _ndjson_lines_async(items, model), media_type=NDJSON_MEDIA_TYPE
+        )
+    return StreamingResponse(_ndjson_lines(items, model), media_type=NDJSON_MEDIA_TYPE)
+
+
+def _env_row(item: Mapping, first: bool) -> str:
+    separator = "" if first else "\n"
+    return f"{separator}{item['key_name']}={item['value_plain']}"
+
+
+def _json_row(item: Mapping, first: bool, indent: str = "") -> str:
+    # json.dumps(..., indent=2) ile birebir ayni ciktiyi parca parca uretir.
+    separator = "{\n" if first else ",\n"
+    return (
+        f"{separator}{indent}  {json.dumps(item['key_name'])}: "
+        f"{json.dumps(item['value_plain'])}"
+    )
+
+
+def _json_end(empty: bool, indent: str = "") -> str:
+    return "{}" if empty else f"\n{indent}}}"
+
+
+def _ndjson_row(item: Mapping, first: bool, **extra: str) -> str:
+    return json.dumps({**extra, "key": item["key_name"], "value": item["value_plain"]}) + "\n"
+
+
+_EXPORT_ROWS = {"env": _env_row, "json": _json_row, "ndjson": _ndjson_row}
+
+
+def _env_chunks(rows: Iterable[Mapping]) -> Iterator[str]:
+    for index, item in enumerate(rows):
+        yield _env_row(item, index == 0)
+
+
+def _json_object_chunks(rows: Iterable[Mapping], indent: str = "") -> Iterator[str]:
+    empty = True
+    for item in rows:
+        yield _json_row(item, empty, indent)
+        empty = False
+    yield _json_end(empty, indent)
+
+
+def _ndjson_export_chunks(rows: Iterable[Mapping], **extra: str) -> Iterator[str]:
+    for item in rows:
+        yield _ndjson_row(item, False, **extra)
+
+
+async def _export_chunks_async(rows: AsyncIterable[Mapping], format: str) -> AsyncIterator[str]:
+    row_chunk = _EXPORT_ROWS[format]
+    empty = True
+    async for item in rows:
+        yield row_chunk(item, empty)
+        empty = False
+    if format == "json":
+        yield _json_end(empty)
+
+
+def export_etag(
+    versions: Mapping[UUID, int], format: str, tags: Sequence[str], tag_mode: str
+) -> str:
+    """Ortam icerik surumleri ve export parametrelerinden guclu ETag."""
+    return version_etag(
+        *sorted(f"{env_id}:{version}" for env_id, version in versions.items()),
+        format,
+        ",".join(tags),
+        tag_mode if tags else "",
+    )
+
+
+def export_response(
+    rows: Union[Iterable[Mapping], AsyncIterable[Mapping]], format: str
+) -> StreamingResponse:
+    """Tek ortam export'unu satirlar cozuldukce gonderir."""
+    if isinstance(rows, AsyncIterable):
+        chunks = _export_chunks_async(rows, format)
+    elif format == "env":
+        chunks = _env_chunks(rows)
+    elif format == "json":
+        chunks = _json_object_chunks(rows)
+    else:
+        chunks = _ndjson_export_chunks(rows)
+    return StreamingResponse(chunks, media_type=EXPORT_MEDIA_TYPES[format])
+
+
+def _grouped_chunks(
+    groups: Iterable[Tuple[str, Iterable[Mapping]]], format: str
+) -> Iterator[str]:
+    separator = "{\n" if format == "json" else ""
+    for env_name, rows in groups:
+        if format == "env":
+            yield f"{separator}# --- {env_name.upper()} ---\n"
+            yield from _env_chunks(rows)
+            separator = "\n\n"
+        elif format == "json":
+            yield f"{separator}  {json.dumps(env_name)}: "
+            yield from _json_object_chunks(rows, indent="  ")
+            separator = ",\n"
+        else:
+            yield from _ndjson_export_chunks(rows, environment=env_name)
+    if format == "json":
+        yield "{}" if separator == "{\n" else "\n}"
+
+
+def grouped_export_response(
+    groups: Iterable[Tuple[str, Iterable[Mapping]]], format: str
+) -> StreamingResponse:
+    """Ortam bazinda gruplanmis export'u (`/exports/{id}/all`) akis olarak gonderir."""
+    return StreamingResponse(_grouped_chunks(groups, format), media_type=EXPORT_MEDIA_TYPES[format])
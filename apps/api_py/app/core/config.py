@@ -19,13 +19,41 @@ class Settings(BaseSettings):
     API_PREFIX: str = ""
 
     DATABASE_URL: str = ""
+    # Baglanti havuzu (SQLite'ta kullanilmaz)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # pgbouncer (transaction modu) arkasinda sunucu tarafi prepared statement kapatilir
+    DB_PGBOUNCER: bool = False
+    # Her islemin basinda SET LOCAL statement_timeout (ms, 0: kapali)
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+    # Okuma agirlikli uclari (secret listesi, arama, servis export'u, dashboard)
+    # AsyncSession ile sunar. Async motor ayri bir havuz acar; baglanti
+    # butcesi DB_POOL_SIZE + DB_MAX_OVERFLOW'un iki katidir.
+    DB_ASYNC_ROUTES: bool = False
 
     JWT_SECRET_KEY: str = ""
     JWT_ALGORITHM: str = "HS256"
+    # Imzalayan anahtarin kid'i (bos: header'a kid yazilmaz)
+    JWT_KEY_ID: str = ""
+    # Rotasyonda sadece dogrulama icin tutulan eski anahtarlar: "kid:secret,..."
+    # (kid'siz eski token'lar icin ":secret")
+    JWT_VERIFY_KEYS: List[str] = []
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
     SECRET_ENCRYPTION_KEY: str = ""
+
+    # Argon2 maliyeti (degisince eski hash'ler basarili giriste yeniden hashlenir)
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    # Sifre hashleme process havuzu (0: istek thread'inde); kuyruk dolunca 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 10.0
     CORS_ORIGINS: List[str] = ["http://localhost:5173"]
 
     ACCESS_TOKEN_COOKIE_NAME: str = "access_token"
@@ -52,6 +80,53 @@ class Settings(BaseSettings):
     PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int = 15
     FRONTEND_URL: str = "http://localhost:5173"
 
+    AUDIT_ASYNC_ENABLED: bool = True
+    AUDIT_QUEUE_MAX_SIZE: int = 10000
+    AUDIT_FLUSH_SIZE: int = 200
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    # Toplu yazim hatasinda yeniden deneme sayisi ve ilk bekleme (her denemede iki kati)
+    AUDIT_WRITE_RETRIES: int = 3
+    AUDIT_WRITE_RETRY_BACKOFF_SECONDS: float = 0.1
+    # Bu aksiyonlar kuyruga alinmaz, istek icinde senkron commit edilir
+    AUDIT_DURABLE_ACTIONS: List[str] = [
+        "secret_revealed",
+        "secret_exported",
+        "service_exported",
+    ]
+    # Aylik audit partisyonlari: kac ay saklanir, arsiv nereye yazilir
+    AUDIT_RETENTION_MONTHS: int = 12
+    AUDIT_PARTITION_MONTHS_AHEAD: int = 3
+    AUDIT_ARCHIVE_DIR: str = "audit_archive"
+
+    # Dashboard sayaclari kullanici basina bu kadar saniye cache'lenir (0: kapali)
+    DASHBOARD_CACHE_TTL_SECONDS: float = 30.0
+
+    # Dogrulanmis kullanicilar process icinde bu kadar saniye cache'lenir (0: kapali)
+    AUTH_USER_CACHE_TTL_SECONDS: float = 30.0
+    # Salt okunur uclar kullaniciyi DB'den okumadan token claim'lerine guvenir
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
+
+    # Dogrulanmis servis token'lari process icinde cache'lenir (0: kapali); baska
+    # process'te iptal edilen token en fazla bu kadar saniye daha gecerli kalir
+    SERVICE_TOKEN_CACHE_TTL_SECONDS: float = 30.0
+    SERVICE_TOKEN_CACHE_MAX_ENTRIES: int = 1024
+    # Servis token'inin last_used_at alani en fazla bu aralikla yazilir
+    SERVICE_TOKEN_TOUCH_INTERVAL_SECONDS: float = 60.0
+    # Servis export'unda `wait` ile long-poll: en uzun bekleme ve baska
+    # process'lerdeki degisiklikler icin surum kontrol araligi
+    EXPORT_LONG_POLL_MAX_SECONDS: float = 60.0
+    EXPORT_LONG_POLL_CHECK_SECONDS: float = 1.0
+
+    # /imports/preview/upload govdesi (ham veya multipart) icin ust sinir
+    IMPORT_MAX_UPLOAD_BYTES: int = 5 * 1024 * 1024
+
+    # Hiz siniri deposu: "memory" (process ici) veya "sqlite" (ayni makinedeki
+    # worker'lar arasinda paylasilan dosya)
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_SQLITE_PATH: str = "rate_limits.sqlite3"
+    # Route limitlerini ezmek icin "ad=limit/saniye,..." (orn. "login:ip=60/60")
+    RATE_LIMITS: List[str] = []
+
     @field_validator("COOKIE_SAMESITE", mode="before")
     @classmethod
     def validate_cookie_samesite(cls, value: str) -> str:
@@ -85,6 +160,49 @@ class Settings(BaseSettings):
             return [normalize(item) for item in value.split(",") if normalize(item)]
         return value
 
+    @field_validator("AUDIT_DURABLE_ACTIONS", mode="before")
+    @classmethod
+    def split_audit_actions(cls, value):
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return value
+
+    @field_validator("RATE_LIMIT_BACKEND", mode="before")
+    @classmethod
+    def validate_rate_limit_backend(cls, value: str) -> str:
+        normalized = value.strip().lower()
+        if normalized not in {"memory", "sqlite"}:
+            raise ValueError("RATE_LIMIT_BACKEND must be 'memory' or 'sqlite'")
+        return normalized
+
+    @field_validator("RATE_LIMITS", mode="before")
+    @classmethod
+    def split_rate_limits(cls, value):
+        if isinstance(value, str):
+            value = [item.strip() for item in value.split(",") if item.strip()]
+        for item in value:
+            name, _, spec = item.partition("=")
+            limit, _, window = spec.partition("/")
+            if not name.strip() or not limit.isdigit() or not window.isdigit():
+                raise ValueError("RATE_LIMITS entries must look like 'name=limit/seconds'")
+            if int(limit) < 1 or int(window) < 1:
+                raise ValueError("RATE_LIMITS limit and window must be positive")
+        return value
+
+    @field_validator("JWT_VERIFY_KEYS", mode="before")
+    @classmethod
+    def split_verify_keys(cls, value):
+        if isinstance(value, str):
+            value = [item.strip() for item in value.split(",") if item.strip()]
+        for item in value:
+            kid, sep, secret = item.partition(":")
+            if not sep or len(secret.strip()) < 32:
+                raise ValueError(
+                    "JWT_VERIFY_KEYS entries must be 'kid:secret' with a secret "
+                    "of at least 32 characters"
+                )
+        return value
+
     @field_validator("DATABASE_URL")
     @classmethod
     def required_values(cls, value: str) -> str:
@@ -1,11 +1,16 @@
 import base64
+from functools import lru_cache
 from os import urandom
+from typing import Iterable, List
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from app.core.config import get_settings
 
 
+NONCE_SIZE = 12
+
+
 def _get_key() -> bytes:
     settings = get_settings()
     if not settings.SECRET_ENCRYPTION_KEY:
@@ -24,16 +29,44 @@ def _get_key() -> bytes:
     return key
 
 
+@lru_cache()
+def _get_cipher() -> AESGCM:
+    # Anahtar dogrulamasi ve AESGCM kurulumu surec basina bir kez yapilir.
+    return AESGCM(_get_key())
+
+
+def reload_encryption_key() -> None:
+    """Cache'lenmis cipher'i birakir; sonraki cagri guncel anahtarla yeniden kurar.
+
+    Settings yeniden yuklendiginde (get_settings.cache_clear()) ardindan cagrilmalidir.
+    """
+    _get_cipher.cache_clear()
+
+
+def _encrypt(aesgcm: AESGCM, value: str) -> bytes:
+    nonce = urandom(NONCE_SIZE)
+    return nonce + aesgcm.encrypt(nonce, value.encode("utf-8"), None)
+
+
+def _decrypt(aesgcm: AESGCM, payload: bytes) -> str:
+    nonce = payload[:NONCE_SIZE]
+    ciphertext = payload[NONCE_SIZE:]
+    return aesgcm.decrypt(nonce, ciphertext, None).decode("utf-8")
+
+
 def encrypt_secret_value(value: str) -> bytes:
-    aesgcm = AESGCM(_get_key())
-    nonce = urandom(12)
-    ciphertext = aesgcm.encrypt(nonce, value.encode("utf-8"), None)
-    return nonce + ciphertext
+    return _encrypt(_get_cipher(), value)
 
 
 def decrypt_secret_value(payload: bytes) -> str:
-    aesgcm = AESGCM(_get_key())
-    nonce = payload[:12]
-    ciphertext = payload[12:]
-    plaintext = aesgcm.decrypt(nonce, ciphertext, None)
-    return plaintext.decode("utf-8")
+    return _decrypt(_get_cipher(), payload)
+
+
+def encrypt_many(values: Iterable[str]) -> List[bytes]:
+    aesgcm = _get_cipher()
+    return [_encrypt(aesgcm, value) for value in values]
+
+
+def decrypt_many(payloads: Iterable[bytes]) -> List[str]:
+    aesgcm = _get_cipher()
+    return [_decrypt(aesgcm, payload) for payload in payloads]
@@ -0,0 +1,55 @@
+import threading
+from collections import deque
+from typing import Any, Deque, Dict
+
+
+class LatencyMetrics:
+    """Islem basina sayac ve gecikme; yuzdelikler son `sample_size` ornekten.
+
+    `rejected`, islemin hic calistirilamadigi durumlari sayar (dolu kuyruk,
+    zaman asimi).
+    """
+
+    def __init__(self, sample_size: int = 1000) -> None:
+        self.sample_size = sample_size
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._counts: Dict[str, int] = {}
+        self._totals: Dict[str, float] = {}
+        self._max: Dict[str, float] = {}
+        self._samples: Dict[str, Deque[float]] = {}
+        self._rejected = 0
+
+    def record(self, operation: str, seconds: float) -> None:
+        with self._lock:
+            self._counts[operation] = self._counts.get(operation, 0) + 1
+            self._totals[operation] = self._totals.get(operation, 0.0) + seconds
+            self._max[operation] = max(self._max.get(operation, 0.0), seconds)
+            self._samples.setdefault(operation, deque(maxlen=self.sample_size)).append(
+                seconds
+            )
+
+    def record_rejected(self) -> None:
+        with self._lock:
+            self._rejected += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            operations = {}
+            for operation, count in self._counts.items():
+                samples = sorted(self._samples[operation])
+                p95_index = min(len(samples) - 1, int(len(samples) * 0.95))
+                operations[operation] = {
+                    "count": count,
+                    "avgMs": round(self._totals[operation] / count * 1000, 2),
+                    "p50Ms": round(samples[len(samples) // 2] * 1000, 2),
+                    "p95Ms": round(samples[p95_index] * 1000, 2),
+                    "maxMs": round(self._max[operation] * 1000, 2),
+                }
+            return {"rejected": self._rejected, "operations": operations}
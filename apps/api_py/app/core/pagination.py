@@ -0,0 +1,23 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_LIMIT = 100
+
+
+def encode_cursor(position: datetime, row_id: UUID) -> str:
+    raw = json.dumps({"t": position.isoformat(), "id": str(row_id)})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(value: str) -> Tuple[datetime, UUID]:
+    padded = value + "=" * (-len(value) % 4)
+    try:
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(data["t"]), UUID(data["id"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
@@ -1,29 +1,186 @@
-from collections import defaultdict, deque
-from threading import Lock
-from time import time
+"""Istek hiz sinirlama: route'larda bildirilen limitler ve degistirilebilir backend.
+
+Limitler GCRA (generic cell rate algorithm) ile uygulanir: anahtar basina tek
+bir "teorik varis zamani" (TAT) tutulur, yani bellek kullanimi istek sayisindan
+bagimsizdir. TAT'i gecmiste kalan anahtarlar bosta sayilir ve periyodik olarak
+silinir. `memory` backend'i process icidir; `sqlite` backend'i ayni makinedeki
+tum uvicorn worker'larinin paylastigi bir dosya kullanir.
+"""
+
+import logging
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from time import monotonic, time
+from typing import Callable, Dict, Optional, Tuple
 
 from app.core.config import get_settings
 
 
-_WINDOWS: dict[str, deque[float]] = defaultdict(deque)
-_LOCK = Lock()
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Bir route'un limiti: `window_seconds` icinde en fazla `limit` istek.
+
+    `name` anahtar oneki ve `RATE_LIMITS` ayarindaki adidir.
+    """
+
+    name: str
+    limit: int
+    window_seconds: int
+
+
+def _gcra(
+    tat: Optional[float], now: float, limit: int, window_seconds: float
+) -> Tuple[bool, float]:
+    """(izin, yeni TAT) dondurur; pencerenin basinda `limit` istege kadar patlamaya izin verir."""
+    emission = window_seconds / limit
+    current = now if tat is None else max(tat, now)
+    if current - now > window_seconds - emission:
+        return False, current
+    return True, current + emission
+
+
+class RateLimiter(ABC):
+    """Hiz siniri backend'i; eksik metodu olan alt sinif ornek olusturulurken hata verir."""
+
+    @abstractmethod
+    def allow(self, key: str, limit: int, window_seconds: float) -> bool:
+        """Istege izin verilirse True; karar anahtarin durumunu gunceller."""
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Tum anahtarlarin durumunu siler."""
+
+
+class MemoryRateLimiter(RateLimiter):
+    def __init__(
+        self, *, sweep_interval: float = 60.0, clock: Callable[[], float] = monotonic
+    ) -> None:
+        self.sweep_interval = sweep_interval
+        self._clock = clock
+        self._tats: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = clock() + sweep_interval
+
+    def allow(self, key: str, limit: int, window_seconds: float) -> bool:
+        now = self._clock()
+        with self._lock:
+            allowed, tat = _gcra(self._tats.get(key), now, limit, window_seconds)
+            self._tats[key] = tat
+            if now >= self._next_sweep:
+                self._sweep(now)
+        return allowed
 
+    def _sweep(self, now: float) -> None:
+        # TAT'i gecmiste kalan anahtar yeni bir anahtarla ayni durumdadir
+        for key in [key for key, tat in self._tats.items() if tat <= now]:
+            del self._tats[key]
+        self._next_sweep = now + self.sweep_interval
 
-def check_rate_limit(key: str, *, limit: int, window_seconds: int) -> bool:
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tats.clear()
+
+
+class SqliteRateLimiter(RateLimiter):
+    """Ayni makinedeki process'lerin paylastigi SQLite dosyasi uzerinde GCRA.
+
+    Her karar tek bir `BEGIN IMMEDIATE` islemidir; worker'lar arasinda
+    yazma kilidiyle siralanir. Dosyaya erisilemezse istek reddedilmez
+    (hiz siniri login'i tamamen kapatmamali).
+    """
+
+    def __init__(self, path: str, *, sweep_interval: float = 60.0) -> None:
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self._local = threading.local()
+        self._next_sweep = time() + sweep_interval
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def allow(self, key: str, limit: int, window_seconds: float) -> bool:
+        # Process'ler arasi paylasildigi icin duvar saati kullanilir
+        now = time()
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT tat FROM rate_limits WHERE key = ?", (key,)
+                ).fetchone()
+                allowed, tat = _gcra(row[0] if row else None, now, limit, window_seconds)
+                conn.execute(
+                    "INSERT INTO rate_limits (key, tat) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tat = excluded.tat",
+                    (key, tat),
+                )
+                if now >= self._next_sweep:
+                    conn.execute("DELETE FROM rate_limits WHERE tat <= ?", (now,))
+                    self._next_sweep = now + self.sweep_interval
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            logger.warning("Hiz siniri deposuna erisilemedi; istek sinirlanmadi", exc_info=True)
+            return True
+        return allowed
+
+    def reset(self) -> None:
+        self._connection().execute("DELETE FROM rate_limits")
+
+
+@lru_cache()
+def get_rate_limiter() -> RateLimiter:
     settings = get_settings()
-    if settings.APP_ENV.strip().lower() == "test":
-        return True
+    backend = settings.RATE_LIMIT_BACKEND
+    if backend == "sqlite":
+        return SqliteRateLimiter(settings.RATE_LIMIT_SQLITE_PATH)
+    if backend == "memory":
+        return MemoryRateLimiter()
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend}")
 
-    now = time()
-    threshold = now - window_seconds
 
-    with _LOCK:
-        queue = _WINDOWS[key]
-        while queue and queue[0] < threshold:
-            queue.popleft()
+@lru_cache()
+def _limit_overrides() -> Dict[str, Tuple[int, int]]:
+    overrides: Dict[str, Tuple[int, int]] = {}
+    for item in get_settings().RATE_LIMITS:
+        name, _, spec = item.partition("=")
+        limit, _, window = spec.partition("/")
+        overrides[name.strip()] = (int(limit), int(window))
+    return overrides
 
-        if len(queue) >= limit:
-            return False
 
-        queue.append(now)
+def reload_rate_limiter() -> None:
+    """Backend'i ve limit ezmelerini birakir (settings yeniden yuklendikten sonra)."""
+    get_rate_limiter.cache_clear()
+    _limit_overrides.cache_clear()
+
+
+def allow_request(rule: RateLimit, key: str) -> bool:
+    """`rule` limitine gore `key` icin bir istek hakki harcar; asildiysa False."""
+    if get_settings().APP_ENV.strip().lower() == "test":
         return True
+
+    limit, window_seconds = _limit_overrides().get(
+        rule.name, (rule.limit, rule.window_seconds)
+    )
+    return get_rate_limiter().allow(f"{rule.name}:{key}", limit, window_seconds)
@@ -1,40 +1,215 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from hashlib import sha256
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
-from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import get_settings
 
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+def build_password_context(
+    *, time_cost: int, memory_cost: int, parallelism: int
+) -> CryptContext:
+    return CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        argon2__rounds=time_cost,
+        argon2__memory_cost=memory_cost,
+        argon2__parallelism=parallelism,
+    )
+
+
+def password_cost_options() -> Dict[str, int]:
+    settings = get_settings()
+    return {
+        "time_cost": settings.ARGON2_TIME_COST,
+        "memory_cost": settings.ARGON2_MEMORY_COST,
+        "parallelism": settings.ARGON2_PARALLELISM,
+    }
+
+
+@lru_cache()
+def get_pwd_context() -> CryptContext:
+    return build_password_context(**password_cost_options())
 
 
+# Asagidaki ikisi cagiran thread'de calisir; istek yolunda
+# app.services.password_hasher kullanilir.
 def verify_password(plain_password: str, password_hash: str) -> bool:
-    return pwd_context.verify(plain_password, password_hash)
+    return get_pwd_context().verify(plain_password, password_hash)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+
+def password_needs_update(password_hash: str) -> bool:
+    """Hash eski bir algoritma veya farkli argon2 maliyetiyle uretildiyse True."""
+    return get_pwd_context().needs_update(password_hash)
+
+
+_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
 
 
-def _create_token(payload: Dict[str, str], expires_delta: timedelta) -> str:
-    import uuid
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
 
+
+def _encode_segment(value: Dict[str, Any]) -> bytes:
+    return _b64encode(
+        json.dumps(value, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    )
+
+
+class TokenService:
+    """HMAC (HS256/384/512) JWT imzalama ve dogrulama.
+
+    Anahtarlarin HMAC durumu ve header segmentleri kurulumda bir kez hazirlanir;
+    her token icin sadece payload kodlanir ve hazir HMAC kopyalanir. Token'lar
+    `signing_kid` anahtariyla imzalanir, `keys` icindeki her anahtar dogrulamada
+    kabul edilir (kid rotasyonu). Header'inda kid olmayan token'lar bos kid ("")
+    anahtariyla dogrulanir.
+    """
+
+    def __init__(
+        self, keys: Dict[str, str], *, signing_kid: str = "", algorithm: str = "HS256"
+    ) -> None:
+        digest = _HMAC_DIGESTS.get(algorithm)
+        if digest is None:
+            raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
+        if signing_kid not in keys:
+            raise ValueError(f"Signing key '{signing_kid}' is not configured")
+
+        self.algorithm = algorithm
+        self.signing_kid = signing_kid
+        self._macs = {
+            kid: hmac.new(secret.encode("utf-8"), digestmod=digest)
+            for kid, secret in keys.items()
+        }
+        self._signing_header = self._header_segment(signing_kid)
+        # Bilinen header'lar JSON cozulmeden dogrudan kid'e eslenir
+        self._known_headers = {self._header_segment(kid): kid for kid in keys}
+
+    def _header_segment(self, kid: str) -> bytes:
+        header = {"alg": self.algorithm, "typ": "JWT"}
+        if kid:
+            header["kid"] = kid
+        return _encode_segment(header)
+
+    def _signature(self, kid: str, signing_input: bytes) -> bytes:
+        mac = self._macs[kid].copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def _resolve_kid(self, header_segment: bytes) -> Optional[str]:
+        kid = self._known_headers.get(header_segment)
+        if kid is not None:
+            return kid
+        try:
+            header = json.loads(_b64decode(header_segment))
+        except ValueError:
+            return None
+        if not isinstance(header, dict) or header.get("alg") != self.algorithm:
+            return None
+        kid = header.get("kid", "")
+        return kid if isinstance(kid, str) and kid in self._macs else None
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        signing_input = self._signing_header + b"." + _encode_segment(claims)
+        signature = _b64encode(self._signature(self.signing_kid, signing_input))
+        return (signing_input + b"." + signature).decode("ascii")
+
+    def decode(self, token: str, *, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Imza ve exp/nbf gecerliyse claim'leri, degilse None dondurur."""
+        try:
+            header_segment, payload_segment, signature_segment = token.encode(
+                "ascii"
+            ).split(b".")
+            signature = _b64decode(signature_segment)
+        except ValueError:
+            return None
+
+        kid = self._resolve_kid(header_segment)
+        if kid is None:
+            return None
+        expected = self._signature(kid, header_segment + b"." + payload_segment)
+        if not hmac.compare_digest(expected, signature):
+            return None
+
+        try:
+            claims = json.loads(_b64decode(payload_segment))
+        except ValueError:
+            return None
+        if not isinstance(claims, dict):
+            return None
+
+        current = time.time() if now is None else now
+        exp = claims.get("exp")
+        if exp is not None and (not _is_number(exp) or exp < current):
+            return None
+        nbf = claims.get("nbf")
+        if nbf is not None and (not _is_number(nbf) or nbf > current):
+            return None
+        return claims
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+@lru_cache()
+def get_token_service() -> TokenService:
     settings = get_settings()
+    keys: Dict[str, str] = {}
+    for item in settings.JWT_VERIFY_KEYS:
+        kid, _, secret = item.partition(":")
+        keys[kid.strip()] = secret.strip()
+    keys[settings.JWT_KEY_ID] = settings.JWT_SECRET_KEY
+    return TokenService(
+        keys, signing_kid=settings.JWT_KEY_ID, algorithm=settings.JWT_ALGORITHM
+    )
+
+
+def reload_token_service() -> None:
+    """Cache'lenmis token servisini birakir (anahtar rotasyonu sonrasi).
+
+    Settings yeniden yuklendiginde (get_settings.cache_clear()) ardindan cagrilmalidir.
+    """
+    get_token_service.cache_clear()
+
+
+def _create_token(payload: Dict[str, Any], expires_delta: timedelta) -> str:
     to_encode = payload.copy()
     expire = datetime.now(timezone.utc) + expires_delta
-    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
-    return jwt.encode(
-        to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
-    )
+    to_encode.update({"exp": int(expire.timestamp()), "jti": uuid.uuid4().hex})
+    return get_token_service().encode(to_encode)
 
 
-def create_access_token(user_id: str, role: str, email: str) -> str:
+def create_access_token(user_id: str, role: str, email: str, generation: int = 0) -> str:
     settings = get_settings()
     return _create_token(
-        payload={"sub": user_id, "role": role, "email": email, "type": "access"},
+        payload={
+            "sub": user_id,
+            "role": role,
+            "email": email,
+            "gen": generation,
+            "type": "access",
+        },
         expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
     )
 
@@ -55,15 +230,8 @@ def create_password_reset_token(user_id: str, email: str) -> str:
     )
 
 
-def decode_token(token: str) -> Optional[Dict[str, str]]:
-    settings = get_settings()
-    try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
-        return payload
-    except JWTError:
-        return None
+def decode_token(token: str) -> Optional[Dict[str, Any]]:
+    return get_token_service().decode(token)
 
 
 def hash_token(token: str) -> str:
@@ -0,0 +1,99 @@
+"""Async (psycopg async / aiosqlite) motor ve oturumlar.
+
+Senkron `app.db.session` ile ayni havuz ayarlarini ve statement_timeout
+davranisini kullanir. Motor ilk kullanimda kurulur; async surucu yuklu
+degilse senkron uygulama etkilenmez.
+"""
+
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import LatencyMetrics
+from app.db.session import (
+    InstrumentedQueuePool,
+    _engine_options,
+    _statement_timeout_on_begin,
+    pool_status,
+    settings,
+)
+
+
+async_pool_metrics = LatencyMetrics()
+
+# Senkron URL'deki surucunun async karsiligi
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+}
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    metrics = async_pool_metrics
+
+
+class AsyncBackedSession(Session):
+    """AsyncSession'larin altindaki senkron oturum (olay dinleyicileri icin ayri sinif)."""
+
+
+event.listen(AsyncBackedSession, "after_begin", _statement_timeout_on_begin)
+
+
+def async_database_url(database_url: str) -> str:
+    """`postgresql+psycopg` async motorda psycopg'nin async API'siyle calisir."""
+    url = make_url(database_url)
+    driver = _ASYNC_DRIVERS.get(url.drivername)
+    if driver is None:
+        return database_url
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+@lru_cache()
+def get_async_engine() -> AsyncEngine:
+    url = async_database_url(settings.DATABASE_URL)
+    return create_async_engine(
+        url, **_engine_options(url, poolclass=InstrumentedAsyncQueuePool)
+    )
+
+
+@lru_cache()
+def get_async_sessionmaker() -> async_sessionmaker:
+    # expire_on_commit kapali: commit sonrasi attribute erisimi gizli IO yapmamali
+    return async_sessionmaker(
+        get_async_engine(),
+        class_=AsyncSession,
+        sync_session_class=AsyncBackedSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+def async_pool_status() -> Optional[Dict[str, Any]]:
+    """Async havuzun durumu; motor henuz kurulmadiysa None."""
+    if not get_async_engine.cache_info().currsize:
+        return None
+    return pool_status(get_async_engine().sync_engine)
+
+
+async def dispose_async_engine() -> None:
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+        get_async_sessionmaker.cache_clear()
+        get_async_engine.cache_clear()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with get_async_sessionmaker()() as db:
+        yield db
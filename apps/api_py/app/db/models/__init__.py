@@ -10,7 +10,13 @@ from app.db.models.project import (
 )
 from app.db.models.refresh_token import RefreshToken
 from app.db.models.service_token import ServiceToken
-from app.db.models.secret import Secret, SecretNote, SecretTag, SecretVersion
+from app.db.models.secret import (
+    Secret,
+    SecretCounter,
+    SecretNote,
+    SecretTag,
+    SecretVersion,
+)
 from app.db.models.user import User
 
 __all__ = [
@@ -26,6 +32,7 @@ __all__ = [
     "RoleEnum",
     "ServiceToken",
     "Secret",
+    "SecretCounter",
     "SecretNote",
     "SecretTag",
     "SecretVersion",
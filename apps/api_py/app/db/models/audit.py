@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -9,7 +9,16 @@ from app.db.base import Base
 
 
 class AuditEvent(Base):
+    # PostgreSQL'de tablo created_at uzerinde aylik RANGE partisyonludur ve PK
+    # (id, created_at)'tir (bkz. 20261016_0013); ORM kimligi icin id yeterli.
     __tablename__ = "audit_events"
+    __table_args__ = (
+        Index("ix_audit_events_target_action_created", "target_id", "action", "created_at"),
+        Index("ix_audit_events_project_created", "project_id", "created_at"),
+        Index("ix_audit_events_created_at", "created_at", "id"),
+        Index("ix_audit_events_actor_created", "actor_user_id", "created_at", "id"),
+        Index("ix_audit_events_metadata", "metadata", postgresql_using="gin"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     project_id: Mapped[uuid.UUID] = mapped_column(
@@ -2,10 +2,12 @@ import uuid
 from datetime import datetime
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
@@ -56,6 +58,7 @@ class ProjectMember(Base):
     __tablename__ = "project_members"
     __table_args__ = (
         UniqueConstraint("project_id", "user_id", name="uq_project_member"),
+        Index("ix_project_members_user_id", "user_id"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
@@ -87,6 +90,10 @@ class Environment(Base):
         Enum(EnvironmentEnum, name="env_name", native_enum=False), nullable=False
     )
     restricted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # Export icerigi (anahtar/deger/etiket) her degistiginde artar; ETag kaynagi
+    content_version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -96,6 +103,7 @@ class EnvironmentAccess(Base):
     __tablename__ = "environment_access"
     __table_args__ = (
         UniqueConstraint("environment_id", "user_id", name="uq_environment_access"),
+        Index("ix_environment_access_user_id", "user_id"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
@@ -4,6 +4,7 @@ from datetime import datetime
 from sqlalchemy import (
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     LargeBinary,
     String,
@@ -19,6 +20,7 @@ class Secret(Base):
     __tablename__ = "secrets"
     __table_args__ = (
         UniqueConstraint("environment_id", "key_name", name="uq_environment_key_name"),
+        Index("ix_secrets_project_updated", "project_id", "updated_at", "id"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
@@ -33,6 +35,7 @@ class Secret(Base):
     type: Mapped[str] = mapped_column(String(100), nullable=False)
     key_name: Mapped[str] = mapped_column(String(255), nullable=False)
     value_encrypted: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    value_masked: Mapped[str] = mapped_column(String(16), nullable=True)
     key_version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
     created_by: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("users.id", ondelete="SET NULL"), nullable=True
@@ -49,6 +52,10 @@ class Secret(Base):
         onupdate=func.now(),
         nullable=False,
     )
+    # /audit/copy ile ayni transaction'da guncellenir (audit_events taranmaz)
+    last_copied_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
 
 class SecretVersion(Base):
@@ -63,6 +70,7 @@ class SecretVersion(Base):
     )
     version: Mapped[int] = mapped_column(Integer, nullable=False)
     value_encrypted: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    value_masked: Mapped[str] = mapped_column(String(16), nullable=True)
     created_by: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("users.id", ondelete="SET NULL"), nullable=True
     )
@@ -73,7 +81,10 @@ class SecretVersion(Base):
 
 class SecretTag(Base):
     __tablename__ = "secret_tags"
-    __table_args__ = (UniqueConstraint("secret_id", "tag", name="uq_secret_tag"),)
+    __table_args__ = (
+        UniqueConstraint("secret_id", "tag", name="uq_secret_tag"),
+        Index("ix_secret_tags_tag_secret_id", "tag", "secret_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     secret_id: Mapped[uuid.UUID] = mapped_column(
@@ -103,3 +114,22 @@ class SecretNote(Base):
         onupdate=func.now(),
         nullable=False,
     )
+
+
+class SecretCounter(Base):
+    """(proje, ortam, provider) basina secret sayisi.
+
+    Secret ekleyen/silen repo fonksiyonlari ayni transaction'da gunceller;
+    proje listesi ve dashboard secrets tablosunu taramadan buradan okur.
+    """
+
+    __tablename__ = "secret_counters"
+
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    environment_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("environments.id", ondelete="CASCADE"), primary_key=True
+    )
+    provider: Mapped[str] = mapped_column(String(255), primary_key=True)
+    secret_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
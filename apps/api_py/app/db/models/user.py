@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Dict
 
-from sqlalchemy import Boolean, DateTime, Enum, String, func
+from sqlalchemy import Boolean, DateTime, Enum, Integer, String, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -24,6 +24,10 @@ class User(Base):
     )
     password_hash: Mapped[str] = mapped_column(String(500), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    # Sifre/rol/aktiflik degisince artar; eski nesilli access token'lar reddedilir
+    token_generation: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
     preferences: Mapped[Dict] = mapped_column(
         JSONB, nullable=False, server_default="{}"
     )
@@ -0,0 +1,230 @@
+"""Sicak okuma yollarinin AsyncSession surumleri.
+
+Sorgular `domain_repo` ile ortaktir; burada yalnizca calistirma async'tir.
+Yazma islemleri ve yetki kontrolleri senkron repository'de kalir
+(async route'lar gerekirse `AsyncSession.run_sync` ile cagirir).
+"""
+
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.crypto import decrypt_many
+from app.core.pagination import encode_cursor
+from app.db.models import EnvironmentEnum, Secret, User
+from app.db.repositories.domain_repo import (
+    EXPORT_BATCH_SIZE,
+    _SecretOutLookups,
+    _build_secret_outs,
+    _content_versions_query,
+    _export_count_query,
+    _export_query,
+    _hash_service_token,
+    _secret_list_query,
+    _secret_out_lookup_queries,
+    _service_export_scope,
+    _service_token_scope,
+    _service_token_scope_query,
+    _touch_service_token_statement,
+)
+from app.services.service_token_cache import service_token_cache
+
+
+async def get_user_by_id(db: AsyncSession, user_id: str) -> Optional[User]:
+    return await db.get(User, user_id)
+
+
+async def _to_secret_outs(
+    db: AsyncSession, rows: Sequence[Tuple[Secret, EnvironmentEnum, str]]
+) -> List[Dict]:
+    if not rows:
+        return []
+
+    lookups = _SecretOutLookups()
+    for kind, query in _secret_out_lookup_queries(rows):
+        lookups.add(kind, await db.execute(query))
+    return _build_secret_outs(rows, lookups)
+
+
+async def list_secrets(
+    db: AsyncSession,
+    user_id: str,
+    *,
+    project_slug: Optional[str] = None,
+    env: Optional[EnvironmentEnum] = None,
+    provider: Optional[str] = None,
+    tag: Optional[str] = None,
+    tags: Sequence[str] = (),
+    tag_mode: str = "all",
+    secret_type: Optional[str] = None,
+    q: Optional[str] = None,
+) -> List[Dict]:
+    query = _secret_list_query(
+        user_id,
+        project_slug=project_slug,
+        env=env,
+        provider=provider,
+        tag=tag,
+        tags=tags,
+        tag_mode=tag_mode,
+        secret_type=secret_type,
+        q=q,
+    )
+    rows = (await db.execute(query)).all()
+    return await _to_secret_outs(
+        db, [(secret, env_name, slug) for secret, env_name, slug in rows]
+    )
+
+
+async def list_secrets_page(
+    db: AsyncSession,
+    user_id: str,
+    *,
+    limit: int,
+    cursor: Optional[str] = None,
+    project_slug: Optional[str] = None,
+    env: Optional[EnvironmentEnum] = None,
+    provider: Optional[str] = None,
+    tag: Optional[str] = None,
+    tags: Sequence[str] = (),
+    tag_mode: str = "all",
+    secret_type: Optional[str] = None,
+    q: Optional[str] = None,
+) -> Tuple[List[Dict], Optional[str]]:
+    query = _secret_list_query(
+        user_id,
+        project_slug=project_slug,
+        env=env,
+        provider=provider,
+        tag=tag,
+        tags=tags,
+        tag_mode=tag_mode,
+        secret_type=secret_type,
+        q=q,
+        cursor=cursor,
+    )
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    page = [(secret, env_name, slug) for secret, env_name, slug in rows[:limit]]
+
+    next_cursor = None
+    if has_more and page:
+        last_secret = page[-1][0]
+        next_cursor = encode_cursor(last_secret.updated_at, last_secret.id)
+    return await _to_secret_outs(db, page), next_cursor
+
+
+async def iter_secrets(
+    db: AsyncSession,
+    user_id: str,
+    *,
+    batch_size: int = 200,
+    cursor: Optional[str] = None,
+    **filters,
+) -> AsyncIterator[Dict]:
+    """Secret'lari keyset sayfalariyla uretir.
+
+    Sunucu tarafi cursor yerine sayfa sorgulari kullanilir; yanit akarken
+    baglanti sayfalar arasinda havuza donebilir.
+    """
+    while True:
+        items, cursor = await list_secrets_page(
+            db, user_id, limit=batch_size, cursor=cursor, **filters
+        )
+        for item in items:
+            yield item
+        if not cursor:
+            return
+
+
+async def resolve_service_export_scope(
+    db: AsyncSession,
+    *,
+    service_token: str,
+    project_slug: str,
+    environment: EnvironmentEnum,
+) -> Optional[Tuple[UUID, UUID]]:
+    token_hash = _hash_service_token(service_token)
+    scope = service_token_cache.get(token_hash)
+    if scope is None:
+        result = await db.execute(_service_token_scope_query(token_hash))
+        scope = _service_token_scope(result.all())
+        if scope is None:
+            return None
+        service_token_cache.put(token_hash, scope)
+
+    export_scope = _service_export_scope(scope, project_slug, environment)
+    if export_scope is None:
+        return None
+
+    touch = _touch_service_token_statement(scope.token_id)
+    if touch is not None:
+        await db.execute(touch)
+        await db.commit()
+    return export_scope
+
+
+async def count_export_secrets(
+    db: AsyncSession,
+    project_id: UUID,
+    env_ids: Sequence[UUID],
+    tag: Optional[str] = None,
+    *,
+    tags: Sequence[str] = (),
+    tag_mode: str = "all",
+) -> Dict[UUID, int]:
+    if not env_ids:
+        return {}
+    rows = await db.execute(_export_count_query(project_id, env_ids, tag, tags, tag_mode))
+    return {env_id: count for env_id, count in rows}
+
+
+async def iter_export_secrets(
+    db: AsyncSession,
+    project_id: UUID,
+    env_id: UUID,
+    tag: Optional[str] = None,
+    *,
+    tags: Sequence[str] = (),
+    tag_mode: str = "all",
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> AsyncIterator[Dict]:
+    query = _export_query(project_id, [env_id], tag, tags, tag_mode).order_by(Secret.key_name)
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for partition in result.partitions():
+        values = decrypt_many(row.value_encrypted for row in partition)
+        for row, value in zip(partition, values):
+            yield {"key_name": row.key_name, "value_plain": value}
+
+
+async def export_secrets_with_service_token(
+    db: AsyncSession,
+    *,
+    service_token: str,
+    project_slug: str,
+    environment: EnvironmentEnum,
+    tag: Optional[str] = None,
+    tags: Sequence[str] = (),
+    tag_mode: str = "all",
+) -> Optional[List[Dict]]:
+    scope = await resolve_service_export_scope(
+        db,
+        service_token=service_token,
+        project_slug=project_slug,
+        environment=environment,
+    )
+    if not scope:
+        return None
+    return [
+        row
+        async for row in iter_export_secrets(db, *scope, tag=tag, tags=tags, tag_mode=tag_mode)
+    ]
+
+
+async def read_content_version(db: AsyncSession, environment_id: UUID) -> int:
+    """`domain_repo.read_content_version`'in async surumu."""
+    result = await db.execute(_content_versions_query([environment_id]))
+    row = result.first()
+    await db.rollback()
+    return row[1] if row else 0
@@ -1,13 +1,34 @@
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from hashlib import sha256
 import secrets
-from typing import Dict, List, Optional, Union, cast
-from uuid import UUID
-
-from sqlalchemy import and_, func, or_, select
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from uuid import UUID, uuid4
+
+from sqlalchemy import (
+    and_,
+    bindparam,
+    case,
+    delete,
+    false,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
-from app.core.crypto import decrypt_secret_value, encrypt_secret_value
+from app.core.crypto import (
+    decrypt_many,
+    decrypt_secret_value,
+    encrypt_many,
+    encrypt_secret_value,
+)
+from app.core.pagination import decode_cursor, encode_cursor
 from app.db.models import (
     AuditEvent,
     Environment,
@@ -20,11 +41,15 @@ from app.db.models import (
     RoleEnum,
     ServiceToken,
     Secret,
+    SecretCounter,
     SecretNote,
     SecretTag,
     SecretVersion,
     User,
 )
+from app.services.audit_sink import AuditRecord, get_audit_sink
+from app.services.content_versions import record_content_change
+from app.services.service_token_cache import ServiceTokenScope, service_token_cache
 
 
 def _to_uuid(value: str) -> UUID:
@@ -34,6 +59,12 @@ def _to_uuid(value: str) -> UUID:
 INVITE_CHARSET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789!@#$%^&*()-_=+"
 INVITE_LENGTH = 12
 
+# IN (...) listeleri bu boyutta parcalanir (surucu parametre limitleri icin)
+IN_CLAUSE_CHUNK_SIZE = 1000
+
+# /audit sayfa boyutu (limit verilmezse)
+AUDIT_PAGE_LIMIT = 200
+
 
 def _generate_invite_code(length: int = INVITE_LENGTH) -> str:
     return "".join(secrets.choice(INVITE_CHARSET) for _ in range(length))
@@ -59,6 +90,14 @@ def mask_value(value: str) -> str:
     return f"{value[:4]}...{value[-4:]}"
 
 
+def _stored_mask(value_masked: Optional[str], value_encrypted: bytes) -> str:
+    # Onceden hesaplanmis maske varsa sifre cozulmez; backfill oncesi satirlar
+    # icin eski davranisa geri donulur.
+    if value_masked is not None:
+        return value_masked
+    return mask_value(decrypt_secret_value(value_encrypted))
+
+
 def resolve_project_id(db: Session, project_slug: str) -> Optional[UUID]:
     return db.scalar(select(Project.id).where(Project.slug == project_slug))
 
@@ -167,6 +206,152 @@ def has_environment_export_access(
     return bool(can_export)
 
 
+class AccessContext:
+    """Bir istek boyunca kullanicinin proje/ortam yetkilerini bellekte tutar.
+
+    Uyelikler ve ortam erisimleri ilk kontrolde iki sorguyla yuklenir; ayni
+    istekteki tekrar eden kontroller veritabanina gitmez.
+    """
+
+    def __init__(self, db: Session, user_id: str):
+        self.db = db
+        self.user_id = user_id
+        self._loaded = False
+        # slug -> (project_id, role)
+        self._memberships: Dict[str, Tuple[UUID, RoleEnum]] = {}
+        self._project_ids: Dict[str, Optional[UUID]] = {}
+        self._project_slugs: Dict[UUID, str] = {}
+        # (project_id, env) -> environment_id
+        self._environment_ids: Dict[Tuple[UUID, EnvironmentEnum], Optional[UUID]] = {}
+        self._environment_names: Dict[UUID, EnvironmentEnum] = {}
+        # environment_id -> (can_read, can_export)
+        self._grants: Dict[UUID, Tuple[bool, bool]] = {}
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        user_uuid = _to_uuid(self.user_id)
+
+        for project_id, slug, role in self.db.execute(
+            select(Project.id, Project.slug, ProjectMember.role)
+            .join(ProjectMember, ProjectMember.project_id == Project.id)
+            .where(ProjectMember.user_id == user_uuid)
+        ):
+            self._memberships[slug] = (project_id, role)
+            self._project_ids[slug] = project_id
+            self._project_slugs[project_id] = slug
+
+        member_project_ids = select(ProjectMember.project_id).where(
+            ProjectMember.user_id == user_uuid
+        )
+        for env_id, project_id, env_name, can_read, can_export in self.db.execute(
+            select(
+                Environment.id,
+                Environment.project_id,
+                Environment.name,
+                EnvironmentAccess.can_read,
+                EnvironmentAccess.can_export,
+            )
+            .join(
+                EnvironmentAccess,
+                and_(
+                    EnvironmentAccess.environment_id == Environment.id,
+                    EnvironmentAccess.user_id == user_uuid,
+                ),
+                isouter=True,
+            )
+            .where(
+                or_(
+                    Environment.project_id.in_(member_project_ids),
+                    EnvironmentAccess.id.is_not(None),
+                )
+            )
+        ):
+            self._environment_ids[(project_id, env_name)] = env_id
+            self._environment_names[env_id] = env_name
+            self._grants[env_id] = (bool(can_read), bool(can_export))
+
+        self._loaded = True
+
+    def project_id(self, project_slug: str) -> Optional[UUID]:
+        self._load()
+        if project_slug not in self._project_ids:
+            self._project_ids[project_slug] = resolve_project_id(self.db, project_slug)
+        return self._project_ids[project_slug]
+
+    def project_slug(self, project_id: UUID) -> str:
+        self._load()
+        if project_id not in self._project_slugs:
+            self._project_slugs[project_id] = resolve_project_slug(self.db, project_id)
+        return self._project_slugs[project_id]
+
+    def environment_id(
+        self, project_id: UUID, env: Union[EnvironmentEnum, str]
+    ) -> Optional[UUID]:
+        try:
+            env_enum = _normalize_env(env)
+        except ValueError:
+            return None
+
+        self._load()
+        key = (project_id, env_enum)
+        if key not in self._environment_ids:
+            self._environment_ids[key] = resolve_environment_id(
+                self.db, project_id, env_enum
+            )
+        return self._environment_ids[key]
+
+    def environment_name(self, environment_id: UUID) -> Optional[EnvironmentEnum]:
+        self._load()
+        if environment_id not in self._environment_names:
+            env_name = self.db.scalar(
+                select(Environment.name).where(Environment.id == environment_id)
+            )
+            if env_name is None:
+                return None
+            self._environment_names[environment_id] = env_name
+        return self._environment_names[environment_id]
+
+    def project_role(self, project_slug: str) -> Optional[RoleEnum]:
+        self._load()
+        membership = self._memberships.get(project_slug)
+        return membership[1] if membership else None
+
+    def has_project_access(self, project_slug: str) -> bool:
+        self._load()
+        return project_slug in self._memberships
+
+    def has_environment_read_access(
+        self, project_slug: str, env: Union[EnvironmentEnum, str]
+    ) -> bool:
+        try:
+            env_enum = _normalize_env(env)
+        except ValueError:
+            return False
+
+        project_id = self.project_id(project_slug)
+        if not project_id:
+            return False
+        env_id = self.environment_id(project_id, env_enum)
+        if not env_id:
+            return False
+
+        if env_enum != EnvironmentEnum.prod:
+            return self.has_project_access(project_slug)
+        return self._grants.get(env_id, (False, False))[0]
+
+    def has_environment_export_access(
+        self, project_slug: str, env: Union[EnvironmentEnum, str]
+    ) -> bool:
+        project_id = self.project_id(project_slug)
+        if not project_id:
+            return False
+        env_id = self.environment_id(project_id, env)
+        if not env_id:
+            return False
+        return self._grants.get(env_id, (False, False))[1]
+
+
 def get_assignments(db: Session, user_id: str) -> List[Dict]:
     rows = db.execute(
         select(Project.slug, Project.id)
@@ -199,109 +384,201 @@ def get_assignments(db: Session, user_id: str) -> List[Dict]:
 
 
 def list_projects_for_user(db: Session, user_id: str) -> List[Dict]:
+    """Kullanicinin projelerini sabit sayida sorguyla dondurur.
+
+    Anahtar sayilari secret_counters'tan okunur; prod sayaci yalnizca prod
+    okuma yetkisi olan projelerde dahil edilir.
+    """
+    user_uuid = _to_uuid(user_id)
+    member_project_ids = select(ProjectMember.project_id).where(
+        ProjectMember.user_id == user_uuid
+    )
     projects = db.execute(
         select(Project)
-        .join(ProjectMember, ProjectMember.project_id == Project.id)
-        .where(ProjectMember.user_id == _to_uuid(user_id))
+        .where(Project.id.in_(member_project_ids))
         .order_by(Project.name.asc())
-    ).scalars()
+    ).scalars().all()
+    if not projects:
+        return []
 
-    output: List[Dict] = []
-    for project in projects:
-        tags = [
-            item.tag
-            for item in db.execute(
-                select(ProjectTag).where(ProjectTag.project_id == project.id)
-            ).scalars()
-        ]
-        prod_access = has_environment_read_access(
-            db, user_id, project.slug, EnvironmentEnum.prod
+    tags_by_project: Dict[UUID, List[str]] = defaultdict(list)
+    for project_id, tag in db.execute(
+        select(ProjectTag.project_id, ProjectTag.tag).where(
+            ProjectTag.project_id.in_(member_project_ids)
         )
+    ):
+        tags_by_project[project_id].append(tag)
 
-        secret_rows = db.execute(
-            select(Secret, Environment.name)
-            .join(Environment, Environment.id == Secret.environment_id)
-            .where(Secret.project_id == project.id)
-        ).all()
-        key_count = 0
-        for _, env_name in secret_rows:
-            if env_name == EnvironmentEnum.prod and not prod_access:
-                continue
-            key_count += 1
-
-        output.append(
-            {
-                "id": project.slug,
-                "name": project.name,
-                "tags": tags,
-                "keyCount": key_count,
-                "prodAccess": prod_access,
-            }
+    prod_readable = set(
+        db.scalars(
+            select(Environment.project_id)
+            .join(EnvironmentAccess, EnvironmentAccess.environment_id == Environment.id)
+            .where(
+                Environment.project_id.in_(member_project_ids),
+                Environment.name == EnvironmentEnum.prod,
+                EnvironmentAccess.user_id == user_uuid,
+                EnvironmentAccess.can_read.is_(True),
+            )
         )
+    )
 
-    return output
-
+    key_counts: Dict[UUID, int] = defaultdict(int)
+    for project_id, env_name, count in db.execute(
+        select(SecretCounter.project_id, Environment.name, func.sum(SecretCounter.secret_count))
+        .join(Environment, Environment.id == SecretCounter.environment_id)
+        .where(SecretCounter.project_id.in_(member_project_ids))
+        .group_by(SecretCounter.project_id, Environment.name)
+    ):
+        if env_name == EnvironmentEnum.prod and project_id not in prod_readable:
+            continue
+        key_counts[project_id] += max(int(count or 0), 0)
 
-def _to_secret_out(db: Session, secret: Secret, env_name: EnvironmentEnum) -> Dict:
-    project_slug = resolve_project_slug(db, secret.project_id)
-    tags = [
-        item.tag
-        for item in db.execute(
-            select(SecretTag).where(SecretTag.secret_id == secret.id)
-        ).scalars()
+    return [
+        {
+            "id": project.slug,
+            "name": project.name,
+            "tags": tags_by_project[project.id],
+            "keyCount": key_counts[project.id],
+            "prodAccess": project.id in prod_readable,
+        }
+        for project in projects
     ]
-    note = (
-        db.scalar(select(SecretNote.content).where(SecretNote.secret_id == secret.id))
-        or ""
+
+
+def _chunked(values: Sequence[UUID], size: int = IN_CLAUSE_CHUNK_SIZE) -> Iterator[Sequence[UUID]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def _prod_readable_clause(user_id: str):
+    # prod ortamlari icin EnvironmentAccess.can_read gerekir; proje basina
+    # tek tek kontrol yerine tek bir semi-join ile cozulur.
+    readable_env_ids = select(EnvironmentAccess.environment_id).where(
+        EnvironmentAccess.user_id == _to_uuid(user_id),
+        EnvironmentAccess.can_read.is_(True),
+    )
+    return or_(
+        Environment.name != EnvironmentEnum.prod,
+        Environment.id.in_(readable_env_ids),
     )
 
-    # Son guncelleyen kullanici
-    updated_by_name: Optional[str] = None
-    if secret.updated_by:
-        updated_by_name = db.scalar(
-            select(User.display_name).where(User.id == secret.updated_by)
-        )
 
-    # Son kopyalanma tarihi (audit tablosundan)
-    last_copied_at = db.scalar(
-        select(AuditEvent.created_at)
-        .where(
-            AuditEvent.action == "secret_copied",
-            AuditEvent.target_id == secret.id,
+def normalize_tags(tag: Optional[str] = None, tags: Sequence[str] = ()) -> List[str]:
+    """Tekil `tag` ve coklu `tags` filtrelerini tekrarsiz tek listede birlestirir."""
+    combined = [tag] if tag else []
+    combined.extend(tags)
+    return list(dict.fromkeys(item.strip() for item in combined if item and item.strip()))
+
+
+def _tag_filter_clause(tags: Sequence[str], tag_mode: str = "all"):
+    # secret_tags(tag, secret_id) indeksi sayesinde her EXISTS bir indeks aramasidir.
+    if not tags:
+        return None
+    if tag_mode == "any":
+        return (
+            select(SecretTag.secret_id)
+            .where(SecretTag.secret_id == Secret.id, SecretTag.tag.in_(tags))
+            .exists()
+        )
+    return and_(
+        *(
+            select(SecretTag.secret_id)
+            .where(SecretTag.secret_id == Secret.id, SecretTag.tag == item)
+            .exists()
+            for item in tags
         )
-        .order_by(AuditEvent.created_at.desc())
-        .limit(1)
     )
 
-    return {
-        "id": str(secret.id),
-        "projectId": project_slug,
-        "name": secret.name,
-        "provider": secret.provider,
-        "type": secret.type,
-        "environment": env_name,
-        "keyName": secret.key_name,
-        "version": secret.key_version,
-        "valueMasked": mask_value(decrypt_secret_value(secret.value_encrypted)),
-        "updatedAt": secret.updated_at,
-        "tags": tags,
-        "notes": note,
-        "updatedByName": updated_by_name,
-        "lastCopiedAt": last_copied_at,
-    }
 
+class _SecretOutLookups:
+    """SecretOut icin toplu okunan etiket, not ve guncelleyen adi eslemeleri."""
+
+    def __init__(self) -> None:
+        self.tags: Dict[UUID, List[str]] = defaultdict(list)
+        self.notes: Dict[UUID, str] = {}
+        self.names: Dict[UUID, str] = {}
+
+    def add(self, kind: str, result) -> None:
+        for key, value in result:
+            if kind == "tags":
+                self.tags[key].append(value)
+            elif kind == "notes":
+                self.notes[key] = value
+            else:
+                self.names[key] = value
+
+
+def _secret_out_lookup_queries(
+    rows: Sequence[Tuple[Secret, EnvironmentEnum, str]]
+) -> Iterator[Tuple[str, Select]]:
+    """`_SecretOutLookups.add` icin (tur, sorgu) ikilileri; senkron ve async yol ortaktir."""
+    secret_ids = [secret.id for secret, _, _ in rows]
+    for chunk in _chunked(secret_ids):
+        yield "tags", select(SecretTag.secret_id, SecretTag.tag).where(
+            SecretTag.secret_id.in_(chunk)
+        )
+        yield "notes", select(SecretNote.secret_id, SecretNote.content).where(
+            SecretNote.secret_id.in_(chunk)
+        )
+
+    # Son guncelleyen kullanicilar
+    updater_ids = list({secret.updated_by for secret, _, _ in rows if secret.updated_by})
+    for chunk in _chunked(updater_ids):
+        yield "names", select(User.id, User.display_name).where(User.id.in_(chunk))
 
-def list_secrets(
-    db: Session,
+
+def _build_secret_outs(
+    rows: Sequence[Tuple[Secret, EnvironmentEnum, str]], lookups: _SecretOutLookups
+) -> List[Dict]:
+    return [
+        {
+            "id": str(secret.id),
+            "projectId": project_slug,
+            "name": secret.name,
+            "provider": secret.provider,
+            "type": secret.type,
+            "environment": env_name,
+            "keyName": secret.key_name,
+            "version": secret.key_version,
+            "valueMasked": _stored_mask(secret.value_masked, secret.value_encrypted),
+            "updatedAt": secret.updated_at,
+            "tags": lookups.tags.get(secret.id, []),
+            "notes": lookups.notes.get(secret.id, ""),
+            "updatedByName": (
+                lookups.names.get(secret.updated_by) if secret.updated_by else None
+            ),
+            "lastCopiedAt": secret.last_copied_at,
+        }
+        for secret, env_name, project_slug in rows
+    ]
+
+
+def _to_secret_outs(
+    db: Session, rows: Sequence[Tuple[Secret, EnvironmentEnum, str]]
+) -> List[Dict]:
+    """Secret satirlarini sabit sayida toplu sorgu ile SecretOut sozluklerine cevirir."""
+    if not rows:
+        return []
+
+    lookups = _SecretOutLookups()
+    for kind, query in _secret_out_lookup_queries(rows):
+        lookups.add(kind, db.execute(query))
+    return _build_secret_outs(rows, lookups)
+
+
+def _secret_list_query(
     user_id: str,
     *,
     project_slug: Optional[str] = None,
     env: Optional[EnvironmentEnum] = None,
     provider: Optional[str] = None,
     tag: Optional[str] = None,
+    tags: Sequence[str] = (),
+    tag_mode: str = "all",
     secret_type: Optional[str] = None,
     q: Optional[str] = None,
-) -> List[Dict]:
+    cursor: Optional[str] = None,
+):
     query = (
         select(Secret, Environment.name, Project.slug)
         .join(Project, Project.id == Secret.project_id)
@@ -313,6 +590,7 @@ def list_secrets(
             ),
         )
         .join(Environment, Environment.id == Secret.environment_id)
+        .where(_prod_readable_clause(user_id))
     )
 
     if project_slug:
@@ -323,6 +601,9 @@ def list_secrets(
         query = query.where(Secret.provider == provider)
     if secret_type:
         query = query.where(Secret.type == secret_type)
+    tag_clause = _tag_filter_clause(normalize_tags(tag, tags), tag_mode)
+    if tag_clause is not None:
+        query = query.where(tag_clause)
     if q:
         like = f"%{q.lower()}%"
         query = query.where(
@@ -332,57 +613,166 @@ def list_secrets(
                 func.lower(Secret.key_name).like(like),
             )
         )
+    if cursor:
+        # Keyset: (updated_at, id) ikilisine gore azalan sirada devam et
+        after_updated_at, after_id = decode_cursor(cursor)
+        query = query.where(
+            or_(
+                Secret.updated_at < after_updated_at,
+                and_(Secret.updated_at == after_updated_at, Secret.id < after_id),
+            )
+        )
 
-    rows = db.execute(query.order_by(Secret.updated_at.desc())).all()
+    return query.order_by(Secret.updated_at.desc(), Secret.id.desc())
 
-    output: List[Dict] = []
-    for secret, env_name, slug in rows:
-        if env_name == EnvironmentEnum.prod and not has_environment_read_access(
-            db, user_id, slug, EnvironmentEnum.prod
-        ):
-            continue
 
-        if tag:
-            tags = [
-                item.tag
-                for item in db.execute(
-                    select(SecretTag).where(SecretTag.secret_id == secret.id)
-                ).scalars()
-            ]
-            if tag not in tags:
-                continue
+def list_secrets(
+    db: Session,
+    user_id: str,
+    *,
+    project_slug: Optional[str] = None,
+    env: Optional[EnvironmentEnum] = None,
+    provider: Optional[str] = None,
+    tag: Optional[str] = None,
+    tags: Sequence[str] = (),
+    tag_mode: str = "all",
+    secret_type: Optional[str] = None,
+    q: Optional[str] = None,
+) -> List[Dict]:
+    query = _secret_list_query(
+        user_id,
+        project_slug=project_slug,
+        env=env,
+        provider=provider,
+        tag=tag,
+        tags=tags,
+        tag_mode=tag_mode,
+        secret_type=secret_type,
+        q=q,
+    )
+    rows = db.execute(query).all()
+    return _to_secret_outs(db, [(secret, env_name, slug) for secret, env_name, slug in rows])
+
+
+def list_secrets_page(
+    db: Session,
+    user_id: str,
+    *,
+    limit: int,
+    cursor: Optional[str] = None,
+    project_slug: Optional[str] = None,
+    env: Optional[EnvironmentEnum] = None,
+    provider: Optional[str] = None,
+    tag: Optional[str] = None,
+    tags: Sequence[str] = (),
+    tag_mode: str = "all",
+    secret_type: Optional[str] = None,
+    q: Optional[str] = None,
+) -> Tuple[List[Dict], Optional[str]]:
+    """Bir sayfa secret ve (varsa) sonraki sayfanin cursor'ini dondurur."""
+    query = _secret_list_query(
+        user_id,
+        project_slug=project_slug,
+        env=env,
+        provider=provider,
+        tag=tag,
+        tags=tags,
+        tag_mode=tag_mode,
+        secret_type=secret_type,
+        q=q,
+        cursor=cursor,
+    )
+    rows = db.execute(query.limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    page = [(secret, env_name, slug) for secret, env_name, slug in rows[:limit]]
+
+    next_cursor = None
+    if has_more and page:
+        last_secret = page[-1][0]
+        next_cursor = encode_cursor(last_secret.updated_at, last_secret.id)
+    return _to_secret_outs(db, page), next_cursor
 
-        output.append(_to_secret_out(db, secret, env_name))
-    return output
+
+def iter_secrets(
+    db: Session,
+    user_id: str,
+    *,
+    batch_size: int = 200,
+    cursor: Optional[str] = None,
+    project_slug: Optional[str] = None,
+    env: Optional[EnvironmentEnum] = None,
+    provider: Optional[str] = None,
+    tag: Optional[str] = None,
+    tags: Sequence[str] = (),
+    tag_mode: str = "all",
+    secret_type: Optional[str] = None,
+    q: Optional[str] = None,
+) -> Iterator[Dict]:
+    """Secret'lari DB cursor'i ilerledikce parti parti uretir (sabit bellek)."""
+    query = _secret_list_query(
+        user_id,
+        project_slug=project_slug,
+        env=env,
+        provider=provider,
+        tag=tag,
+        tags=tags,
+        tag_mode=tag_mode,
+        secret_type=secret_type,
+        q=q,
+        cursor=cursor,
+    )
+    result = db.execute(query.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield from _to_secret_outs(
+            db, [(secret, env_name, slug) for secret, env_name, slug in partition]
+        )
 
 
-def get_secret_for_user(db: Session, user_id: str, secret_id: str) -> Optional[Secret]:
+def get_secret_for_user(
+    db: Session,
+    user_id: str,
+    secret_id: str,
+    *,
+    access: Optional[AccessContext] = None,
+) -> Optional[Secret]:
+    access = access or AccessContext(db, user_id)
     secret = db.get(Secret, _to_uuid(secret_id))
     if not secret:
         return None
 
-    slug = resolve_project_slug(db, secret.project_id)
-    env_name = db.scalar(
-        select(Environment.name).where(Environment.id == secret.environment_id)
-    )
+    slug = access.project_slug(secret.project_id)
+    env_name = access.environment_name(secret.environment_id)
     if not env_name:
         return None
 
-    if not has_project_access(db, user_id, slug):
+    if not access.has_project_access(slug):
         return None
-    if env_name == EnvironmentEnum.prod and not has_environment_read_access(
-        db, user_id, slug, EnvironmentEnum.prod
+    if env_name == EnvironmentEnum.prod and not access.has_environment_read_access(
+        slug, EnvironmentEnum.prod
     ):
         return None
 
     return secret
 
 
-def get_secret_value(db: Session, user_id: str, secret_id: str) -> Optional[Dict]:
-    secret = get_secret_for_user(db, user_id, secret_id)
+def _secret_out_for(access: AccessContext, secret: Secret) -> Dict:
+    env_name = access.environment_name(secret.environment_id) or EnvironmentEnum.dev
+    project_slug = access.project_slug(secret.project_id)
+    return _to_secret_outs(access.db, [(secret, env_name, project_slug)])[0]
+
+
+def get_secret_value(
+    db: Session,
+    user_id: str,
+    secret_id: str,
+    *,
+    access: Optional[AccessContext] = None,
+) -> Optional[Dict]:
+    access = access or AccessContext(db, user_id)
+    secret = get_secret_for_user(db, user_id, secret_id, access=access)
     if not secret:
         return None
-    project_slug = resolve_project_slug(db, secret.project_id)
+    project_slug = access.project_slug(secret.project_id)
     return {
         "secretId": str(secret.id),
         "projectId": project_slug,
@@ -391,8 +781,14 @@ def get_secret_value(db: Session, user_id: str, secret_id: str) -> Optional[Dict
     }
 
 
-def list_secret_versions(db: Session, user_id: str, secret_id: str) -> Optional[List[Dict]]:
-    secret = get_secret_for_user(db, user_id, secret_id)
+def list_secret_versions(
+    db: Session,
+    user_id: str,
+    secret_id: str,
+    *,
+    access: Optional[AccessContext] = None,
+) -> Optional[List[Dict]]:
+    secret = get_secret_for_user(db, user_id, secret_id, access=access)
     if not secret:
         return None
 
@@ -405,7 +801,7 @@ def list_secret_versions(db: Session, user_id: str, secret_id: str) -> Optional[
     versions = [
         {
             "version": secret.key_version,
-            "maskedValue": mask_value(decrypt_secret_value(secret.value_encrypted)),
+            "maskedValue": _stored_mask(secret.value_masked, secret.value_encrypted),
             "createdAt": secret.updated_at,
             "createdByName": current_created_by_name,
             "isCurrent": True,
@@ -430,8 +826,8 @@ def list_secret_versions(db: Session, user_id: str, secret_id: str) -> Optional[
         versions.append(
             {
                 "version": version_row.version,
-                "maskedValue": mask_value(
-                    decrypt_secret_value(version_row.value_encrypted)
+                "maskedValue": _stored_mask(
+                    version_row.value_masked, version_row.value_encrypted
                 ),
                 "createdAt": version_row.created_at,
                 "createdByName": created_by_name,
@@ -442,10 +838,58 @@ def list_secret_versions(db: Session, user_id: str, secret_id: str) -> Optional[
     return versions
 
 
+def backfill_value_masks(db: Session, *, batch_size: int = 500) -> int:
+    """value_masked alani bos olan secret ve versiyonlari doldurur.
+
+    Satirlar parti parti cozulup maskelenir; her parti ayri commit edilir.
+    Guncellenen toplam satir sayisini dondurur.
+    """
+    statements = {
+        # updated_at kendisine esitlenir ki onupdate=now() tetiklenmesin
+        Secret: update(Secret.__table__)
+        .where(Secret.__table__.c.id == bindparam("row_id"))
+        .values(
+            value_masked=bindparam("masked"),
+            updated_at=Secret.__table__.c.updated_at,
+        ),
+        SecretVersion: update(SecretVersion.__table__)
+        .where(SecretVersion.__table__.c.id == bindparam("row_id"))
+        .values(value_masked=bindparam("masked")),
+    }
+
+    total = 0
+    for model, statement in statements.items():
+        while True:
+            rows = db.execute(
+                select(model.id, model.value_encrypted)
+                .where(model.value_masked.is_(None))
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            plaintexts = decrypt_many(row.value_encrypted for row in rows)
+            db.execute(
+                statement,
+                [
+                    {"row_id": row.id, "masked": mask_value(plain)}
+                    for row, plain in zip(rows, plaintexts)
+                ],
+            )
+            db.commit()
+            total += len(rows)
+    return total
+
+
 def restore_secret_version(
-    db: Session, user_id: str, secret_id: str, version: int
+    db: Session,
+    user_id: str,
+    secret_id: str,
+    version: int,
+    *,
+    access: Optional[AccessContext] = None,
 ) -> Optional[Dict]:
-    secret = get_secret_for_user(db, user_id, secret_id)
+    access = access or AccessContext(db, user_id)
+    secret = get_secret_for_user(db, user_id, secret_id, access=access)
     if not secret:
         return None
 
@@ -466,33 +910,126 @@ def restore_secret_version(
             secret_id=secret.id,
             version=secret.key_version,
             value_encrypted=secret.value_encrypted,
+            value_masked=secret.value_masked,
             created_by=_to_uuid(user_id),
         )
     )
     secret.key_version += 1
     secret.value_encrypted = version_row.value_encrypted
+    secret.value_masked = version_row.value_masked
     secret.updated_by = _to_uuid(user_id)
     secret.updated_at = datetime.now(timezone.utc)
     db.add(secret)
+    _bump_content_versions(db, [secret.environment_id])
     db.commit()
 
-    env_name = db.scalar(
-        select(Environment.name).where(Environment.id == secret.environment_id)
+    return _secret_out_for(access, secret)
+
+
+SecretCountKey = Tuple[UUID, UUID, str]
+
+
+def _apply_secret_count_deltas(db: Session, deltas: Dict[SecretCountKey, int]) -> None:
+    """secret_counters satirlarini (proje, ortam, provider) bazinda arttirir/azaltir.
+
+    Tek bir upsert ile yazilir ve cagiranin transaction'inda kalir (commit yok).
+    """
+    rows = [
+        {
+            "project_id": project_id,
+            "environment_id": environment_id,
+            "provider": provider,
+            "secret_count": delta,
+        }
+        for (project_id, environment_id, provider), delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+    table = SecretCounter.__table__
+    dialect_insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    statement = dialect_insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.project_id, table.c.environment_id, table.c.provider],
+        set_={"secret_count": table.c.secret_count + statement.excluded.secret_count},
     )
-    env_for_output = env_name if env_name is not None else EnvironmentEnum.dev
-    return _to_secret_out(db, secret, cast(EnvironmentEnum, env_for_output))
+    db.execute(statement, rows)
+
+
+def _bump_content_versions(db: Session, environment_ids: Sequence[UUID]) -> None:
+    """Ortamlarin export icerik surumunu arttirir (cagiranin transaction'inda, commit yok)."""
+    environment_ids = list(dict.fromkeys(environment_ids))
+    if not environment_ids:
+        return
+    db.execute(
+        update(Environment)
+        .where(Environment.id.in_(environment_ids))
+        .values(content_version=Environment.content_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    record_content_change(db, environment_ids)
 
 
-def create_secret(db: Session, user_id: str, project_slug: str, payload: Dict) -> Dict:
-    project_id = resolve_project_id(db, project_slug)
+def _content_versions_query(environment_ids: Sequence[UUID]):
+    return select(Environment.id, Environment.content_version).where(
+        Environment.id.in_(environment_ids)
+    )
+
+
+def get_content_versions(db: Session, environment_ids: Sequence[UUID]) -> Dict[UUID, int]:
+    """Ortam basina export icerik surumu (secrets tablosu okunmaz)."""
+    if not environment_ids:
+        return {}
+    rows = db.execute(_content_versions_query(environment_ids))
+    return {env_id: version for env_id, version in rows}
+
+
+def read_content_version(db: Session, environment_id: UUID) -> int:
+    """Tek ortamin surumu; okuma islemi hemen kapatilir.
+
+    Long-poll beklerken oturum havuzdan baglanti tutmamalidir.
+    """
+    version = get_content_versions(db, [environment_id]).get(environment_id, 0)
+    db.rollback()
+    return version
+
+
+def rebuild_secret_counters(db: Session) -> int:
+    """secret_counters tablosunu secrets'tan bastan hesaplar; yazilan satir sayisini dondurur."""
+    db.execute(delete(SecretCounter))
+    result = db.execute(
+        insert(SecretCounter).from_select(
+            ["project_id", "environment_id", "provider", "secret_count"],
+            select(
+                Secret.project_id,
+                Secret.environment_id,
+                Secret.provider,
+                func.count(Secret.id),
+            ).group_by(Secret.project_id, Secret.environment_id, Secret.provider),
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def create_secret(
+    db: Session,
+    user_id: str,
+    project_slug: str,
+    payload: Dict,
+    *,
+    access: Optional[AccessContext] = None,
+) -> Dict:
+    access = access or AccessContext(db, user_id)
+    project_id = access.project_id(project_slug)
     if not project_id:
         raise ValueError("Project not found")
 
-    env_id = resolve_environment_id(db, project_id, payload["environment"])
+    env_id = access.environment_id(project_id, payload["environment"])
     if not env_id:
         raise ValueError("Environment not found")
 
-    if not has_environment_read_access(db, user_id, project_slug, payload["environment"]):
+    if not access.has_environment_read_access(project_slug, payload["environment"]):
         raise PermissionError("Forbidden")
 
     secret = Secret(
@@ -503,12 +1040,15 @@ def create_secret(db: Session, user_id: str, project_slug: str, payload: Dict) -
         type=payload["type"],
         key_name=payload["keyName"],
         value_encrypted=encrypt_secret_value(payload["value"]),
+        value_masked=mask_value(payload["value"]),
         key_version=1,
         created_by=_to_uuid(user_id),
         updated_by=_to_uuid(user_id),
     )
     db.add(secret)
     db.flush()
+    _apply_secret_count_deltas(db, {(project_id, env_id, secret.provider): 1})
+    _bump_content_versions(db, [env_id])
 
     for item in payload.get("tags", []):
         db.add(SecretTag(secret_id=secret.id, tag=item))
@@ -521,27 +1061,34 @@ def create_secret(db: Session, user_id: str, project_slug: str, payload: Dict) -
     )
     db.commit()
 
-    env_name = db.scalar(
-        select(Environment.name).where(Environment.id == secret.environment_id)
-    )
-    env_for_output = (
-        env_name
-        if env_name is not None
-        else _normalize_env(payload["environment"])
-    )
-    return _to_secret_out(db, secret, cast(EnvironmentEnum, env_for_output))
+    return _to_secret_outs(
+        db, [(secret, _normalize_env(payload["environment"]), project_slug)]
+    )[0]
 
 
 def update_secret(
-    db: Session, user_id: str, secret_id: str, payload: Dict
+    db: Session,
+    user_id: str,
+    secret_id: str,
+    payload: Dict,
+    *,
+    access: Optional[AccessContext] = None,
 ) -> Optional[Dict]:
-    secret = get_secret_for_user(db, user_id, secret_id)
+    access = access or AccessContext(db, user_id)
+    secret = get_secret_for_user(db, user_id, secret_id, access=access)
     if not secret:
         return None
 
     if payload.get("name") is not None:
         secret.name = payload["name"]
-    if payload.get("provider") is not None:
+    if payload.get("provider") is not None and payload["provider"] != secret.provider:
+        _apply_secret_count_deltas(
+            db,
+            {
+                (secret.project_id, secret.environment_id, secret.provider): -1,
+                (secret.project_id, secret.environment_id, payload["provider"]): 1,
+            },
+        )
         secret.provider = payload["provider"]
     if payload.get("type") is not None:
         secret.type = payload["type"]
@@ -554,11 +1101,13 @@ def update_secret(
                 secret_id=secret.id,
                 version=secret.key_version,
                 value_encrypted=secret.value_encrypted,
+                value_masked=secret.value_masked,
                 created_by=_to_uuid(user_id),
             )
         )
         secret.key_version += 1
         secret.value_encrypted = encrypt_secret_value(payload["value"])
+        secret.value_masked = mask_value(payload["value"])
 
     secret.updated_by = _to_uuid(user_id)
     secret.updated_at = datetime.now(timezone.utc)
@@ -583,111 +1132,297 @@ def update_secret(
             )
 
     db.add(secret)
+    _bump_content_versions(db, [secret.environment_id])
     db.commit()
 
-    env_name = db.scalar(
-        select(Environment.name).where(Environment.id == secret.environment_id)
-    )
-    env_for_output = env_name if env_name is not None else EnvironmentEnum.dev
-    return _to_secret_out(db, secret, cast(EnvironmentEnum, env_for_output))
+    return _secret_out_for(access, secret)
 
 
-def delete_secret(db: Session, user_id: str, secret_id: str) -> Optional[Dict]:
-    secret = get_secret_for_user(db, user_id, secret_id)
+def delete_secret(
+    db: Session,
+    user_id: str,
+    secret_id: str,
+    *,
+    access: Optional[AccessContext] = None,
+) -> Optional[Dict]:
+    access = access or AccessContext(db, user_id)
+    secret = get_secret_for_user(db, user_id, secret_id, access=access)
     if not secret:
         return None
-    project_slug = resolve_project_slug(db, secret.project_id)
+    project_slug = access.project_slug(secret.project_id)
     secret_name = secret.name
     secret_identifier = str(secret.id)
+    _apply_secret_count_deltas(
+        db, {(secret.project_id, secret.environment_id, secret.provider): -1}
+    )
+    _bump_content_versions(db, [secret.environment_id])
     db.delete(secret)
     db.commit()
     return {"projectId": project_slug, "name": secret_name, "id": secret_identifier}
 
 
-def find_secret_by_key(
+def bulk_import_secrets(
     db: Session,
     user_id: str,
     project_slug: str,
     environment: EnvironmentEnum,
-    key_name: str,
-) -> Optional[Secret]:
-    if not has_environment_read_access(db, user_id, project_slug, environment):
-        return None
-
-    project_id = resolve_project_id(db, project_slug)
+    pairs: Sequence[Tuple[str, str]],
+    *,
+    provider: str,
+    secret_type: str,
+    tags: Sequence[str],
+    notes: str,
+    conflict_strategy: str,
+    key_to_name: Callable[[str], str],
+    access: Optional[AccessContext] = None,
+) -> Dict:
+    """(key, value) ciftlerini tek transaction'da toplu olarak yazar.
+
+    Ortamdaki mevcut anahtarlar tek sorguyla okunur, degerler toplu sifrelenir ve
+    Secret/SecretTag/SecretNote/SecretVersion satirlari cok satirli INSERT ile
+    eklenir. Ayni anahtar icerikte birden fazla geciyorsa son deger esas alinir,
+    anahtar basina tek sonuc doner ve dusen tekrarlar atlanmis sayilir.
+    """
+    access = access or AccessContext(db, user_id)
+    project_id = access.project_id(project_slug)
     if not project_id:
-        return None
-    env_id = resolve_environment_id(db, project_id, environment)
+        raise ValueError("Project not found")
+    env_id = access.environment_id(project_id, environment)
     if not env_id:
-        return None
+        raise ValueError("Environment not found")
+    if not access.has_environment_read_access(project_slug, environment):
+        raise PermissionError("Forbidden")
 
-    return db.scalar(
-        select(Secret).where(
-            Secret.environment_id == env_id, Secret.key_name == key_name
+    existing = {
+        row.key_name: row
+        for row in db.execute(
+            select(
+                Secret.id,
+                Secret.key_name,
+                Secret.key_version,
+                Secret.value_encrypted,
+                Secret.value_masked,
+                Secret.provider,
+            ).where(Secret.environment_id == env_id)
         )
-    )
+    }
 
+    user_uuid = _to_uuid(user_id)
+    pending_inserts: Dict[str, str] = {}
+    pending_updates: Dict[str, str] = {}
+    items: List[Dict] = []
+    # Anahtarlar ilk gecis sirasinda kalir, deger son gecisten gelir
+    values = dict(pairs)
+    skipped = len(pairs) - len(values)
+    for key, value in values.items():
+        if key in existing:
+            if conflict_strategy == "skip":
+                skipped += 1
+                items.append({"key": key, "status": "skipped"})
+                continue
+            pending_updates[key] = value
+            items.append({"key": key, "status": "updated"})
+            continue
+        pending_inserts[key] = value
+        items.append({"key": key, "status": "inserted"})
+
+    now = datetime.now(timezone.utc)
+    secret_ids: Dict[str, UUID] = {key: row.id for key, row in existing.items()}
+    count_deltas: Dict[SecretCountKey, int] = defaultdict(int)
+    count_deltas[(project_id, env_id, provider)] += len(pending_inserts)
+    for key in pending_updates:
+        count_deltas[(project_id, env_id, existing[key].provider)] -= 1
+        count_deltas[(project_id, env_id, provider)] += 1
+
+    if pending_inserts:
+        keys = list(pending_inserts)
+        ciphertexts = encrypt_many(pending_inserts[key] for key in keys)
+        secret_rows = []
+        for key, ciphertext in zip(keys, ciphertexts):
+            secret_ids[key] = uuid4()
+            secret_rows.append(
+                {
+                    "id": secret_ids[key],
+                    "project_id": project_id,
+                    "environment_id": env_id,
+                    "name": key_to_name(key),
+                    "provider": provider,
+                    "type": secret_type,
+                    "key_name": key,
+                    "value_encrypted": ciphertext,
+                    "value_masked": mask_value(pending_inserts[key]),
+                    "key_version": 1,
+                    "created_by": user_uuid,
+                    "updated_by": user_uuid,
+                }
+            )
+        db.execute(insert(Secret), secret_rows)
+
+        unique_tags = list(dict.fromkeys(tags))
+        if unique_tags:
+            db.execute(
+                insert(SecretTag),
+                [
+                    {"id": uuid4(), "secret_id": secret_ids[key], "tag": tag}
+                    for key in keys
+                    for tag in unique_tags
+                ],
+            )
+        db.execute(
+            insert(SecretNote),
+            [
+                {
+                    "id": uuid4(),
+                    "secret_id": secret_ids[key],
+                    "content": notes,
+                    "updated_by": user_uuid,
+                }
+                for key in keys
+            ],
+        )
 
-def export_secrets(
-    db: Session,
-    user_id: str,
-    project_slug: str,
-    environment: EnvironmentEnum,
-    tag: Optional[str] = None,
-) -> List[Dict]:
-    if not has_environment_read_access(db, user_id, project_slug, environment):
-        return []
+    if pending_updates:
+        keys = list(pending_updates)
+        ciphertexts = encrypt_many(pending_updates[key] for key in keys)
+        db.execute(
+            insert(SecretVersion),
+            [
+                {
+                    "id": uuid4(),
+                    "secret_id": existing[key].id,
+                    "version": existing[key].key_version,
+                    "value_encrypted": existing[key].value_encrypted,
+                    "value_masked": existing[key].value_masked,
+                    "created_by": user_uuid,
+                }
+                for key in keys
+            ],
+        )
+        db.execute(
+            update(Secret),
+            [
+                {
+                    "id": existing[key].id,
+                    "provider": provider,
+                    "type": secret_type,
+                    "value_encrypted": ciphertext,
+                    "value_masked": mask_value(pending_updates[key]),
+                    "key_version": existing[key].key_version + 1,
+                    "updated_by": user_uuid,
+                    "updated_at": now,
+                }
+                for key, ciphertext in zip(keys, ciphertexts)
+            ],
+        )
 
-    project_id = resolve_project_id(db, project_slug)
+    _apply_secret_count_deltas(db, count_deltas)
+    if pending_inserts or pending_updates:
+        _bump_content_versions(db, [env_id])
+    db.commit()
+
+    for item in items:
+        if item["status"] != "skipped":
+            item["secretId"] = str(secret_ids[item["key"]])
+    return {
+        "inserted": len(pending_inserts),
+        "updated": len(pending_updates),
+        "skipped": skipped,
+        "items": items,
+    }
+
+
+EXPORT_BATCH_SIZE = 500
+
+
+def _export_query(
+    project_id: UUID,
+    env_ids: Sequence[UUID],
+    tag: Optional[str],
+    tags: Sequence[str] = (),
+    tag_mode: str = "all",
+):
+    query = select(Secret.environment_id, Secret.key_name, Secret.value_encrypted).where(
+        Secret.project_id == project_id, Secret.environment_id.in_(env_ids)
+    )
+    tag_clause = _tag_filter_clause(normalize_tags(tag, tags), tag_mode)
+    if tag_clause is not None:
+        query = query.where(tag_clause)
+    return query
+
+
+def resolve_export_scope(
+    access: AccessContext, project_slug: str, environment: EnvironmentEnum
+) -> Optional[Tuple[UUID, UUID]]:
+    """Okuma yetkisi varsa export edilecek (project_id, environment_id) ikilisini dondurur."""
+    if not access.has_environment_read_access(project_slug, environment):
+        return None
+    project_id = access.project_id(project_slug)
     if not project_id:
-        return []
-    env_id = resolve_environment_id(db, project_id, environment)
+        return None
+    env_id = access.environment_id(project_id, environment)
     if not env_id:
-        return []
+        return None
+    return project_id, env_id
 
-    rows = db.execute(
-        select(Secret).where(
-            Secret.project_id == project_id, Secret.environment_id == env_id
-        )
-    ).scalars()
 
-    result: List[Dict] = []
-    for row in rows:
-        if tag:
-            secret_tags = [
-                t.tag
-                for t in db.execute(
-                    select(SecretTag).where(SecretTag.secret_id == row.id)
-                ).scalars()
-            ]
-            if tag not in secret_tags:
-                continue
-        result.append(
-            {
-                "key_name": row.key_name,
-                "value_plain": decrypt_secret_value(row.value_encrypted),
-            }
-        )
-    return result
+def _export_count_query(
+    project_id: UUID,
+    env_ids: Sequence[UUID],
+    tag: Optional[str],
+    tags: Sequence[str],
+    tag_mode: str,
+) -> Select:
+    subquery = _export_query(project_id, env_ids, tag, tags, tag_mode).subquery()
+    return select(subquery.c.environment_id, func.count()).group_by(subquery.c.environment_id)
 
 
-def export_secrets_all_envs(
+def count_export_secrets(
     db: Session,
-    user_id: str,
-    project_slug: str,
+    project_id: UUID,
+    env_ids: Sequence[UUID],
     tag: Optional[str] = None,
-) -> Dict[str, List[Dict]]:
-    """Tum ortamlar icin secret'lari export eder."""
-    output: Dict[str, List[Dict]] = {}
+    *,
+    tags: Sequence[str] = (),
+    tag_mode: str = "all",
+) -> Dict[UUID, int]:
+    """Ortam basina export edilecek secret sayisi (deger cozulmeden, tek sorgu)."""
+    if not env_ids:
+        return {}
+    rows = db.execute(_export_count_query(project_id, env_ids, tag, tags, tag_mode))
+    return {env_id: count for env_id, count in rows}
+
+
+def iter_export_secrets(
+    db: Session,
+    project_id: UUID,
+    env_id: UUID,
+    tag: Optional[str] = None,
+    *,
+    tags: Sequence[str] = (),
+    tag_mode: str = "all",
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[Dict]:
+    """Secret'lari anahtar sirasiyla, DB cursor'i ilerledikce parti parti cozer."""
+    query = _export_query(project_id, [env_id], tag, tags, tag_mode).order_by(Secret.key_name)
+    result = db.execute(query.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        values = decrypt_many(row.value_encrypted for row in partition)
+        for row, value in zip(partition, values):
+            yield {"key_name": row.key_name, "value_plain": value}
+
+
+def resolve_export_scopes_all_envs(
+    access: AccessContext, project_slug: str
+) -> List[Tuple[EnvironmentEnum, UUID, UUID]]:
+    """Okuma ve export yetkisi olan tum ortamlarin (env, project_id, env_id) listesi."""
+    scopes: List[Tuple[EnvironmentEnum, UUID, UUID]] = []
     for env in EnvironmentEnum:
-        if not has_environment_read_access(db, user_id, project_slug, env):
-            continue
-        if not has_environment_export_access(db, user_id, project_slug, env):
+        if not access.has_environment_export_access(project_slug, env):
             continue
-        rows = export_secrets(db, user_id, project_slug, env, tag=tag)
-        if rows:
-            output[env.value] = rows
-    return output
+        scope = resolve_export_scope(access, project_slug, env)
+        if scope:
+            scopes.append((env, *scope))
+    return scopes
 
 
 def _service_token_to_out(token: ServiceToken) -> Dict:
@@ -762,62 +1497,197 @@ def revoke_service_token_for_admin(
     return True
 
 
-def export_secrets_with_service_token(
-    db: Session,
-    *,
-    service_token: str,
-    project_slug: str,
-    environment: EnvironmentEnum,
-    tag: Optional[str] = None,
-) -> Optional[List[Dict]]:
-    token_row = db.scalar(
-        select(ServiceToken)
-        .join(Project, Project.id == ServiceToken.project_id)
-        .where(
-            ServiceToken.token_hash == _hash_service_token(service_token),
-            Project.slug == project_slug,
-            ServiceToken.revoked_at.is_(None),
+def _service_token_scope_query(token_hash: str):
+    # Token, proje ve projenin tum ortamlari tek sorguda
+    return (
+        select(
+            ServiceToken.id,
+            ServiceToken.project_id,
+            Project.slug,
+            Environment.name,
+            Environment.id,
         )
+        .join(Project, Project.id == ServiceToken.project_id)
+        .join(Environment, Environment.project_id == Project.id, isouter=True)
+        .where(ServiceToken.token_hash == token_hash, ServiceToken.revoked_at.is_(None))
     )
-    if not token_row:
+
+
+def _service_token_scope(rows: Sequence) -> Optional[ServiceTokenScope]:
+    if not rows:
         return None
+    token_id, project_id, project_slug = rows[0][:3]
+    return ServiceTokenScope(
+        token_id=token_id,
+        project_id=project_id,
+        project_slug=project_slug,
+        environment_ids={
+            env_name: env_id for *_, env_name, env_id in rows if env_id is not None
+        },
+    )
 
-    project_id = resolve_project_id(db, project_slug)
-    if not project_id:
+
+def _service_export_scope(
+    scope: ServiceTokenScope, project_slug: str, environment: Union[EnvironmentEnum, str]
+) -> Optional[Tuple[UUID, UUID]]:
+    if scope.project_slug != project_slug:
+        return None
+    try:
+        env_id = scope.environment_ids.get(_normalize_env(environment))
+    except ValueError:
         return None
-    env_id = resolve_environment_id(db, project_id, environment)
     if not env_id:
         return None
+    return scope.project_id, env_id
 
-    rows = db.execute(
-        select(Secret).where(
-            Secret.project_id == project_id,
-            Secret.environment_id == env_id,
+
+def _touch_service_token_statement(token_id: UUID):
+    """Token icin `last_used_at` zamani geldiyse UPDATE, gelmediyse None.
+
+    Process ici aralik sorguyu tamamen atlar; WHERE kosulu ayni token'i
+    kullanan diger process'lerin yazimlarini da ayni araliga indirir.
+    """
+    if not service_token_cache.should_touch(token_id):
+        return None
+    now = datetime.now(timezone.utc)
+    stale_before = now - timedelta(seconds=service_token_cache.touch_interval_seconds)
+    return (
+        update(ServiceToken)
+        .where(
+            ServiceToken.id == token_id,
+            or_(ServiceToken.last_used_at.is_(None), ServiceToken.last_used_at < stale_before),
         )
-    ).scalars()
+        .values(last_used_at=now)
+        .execution_options(synchronize_session=False)
+    )
 
-    result: List[Dict] = []
-    for row in rows:
-        if tag:
-            secret_tags = [
-                item.tag
-                for item in db.execute(
-                    select(SecretTag).where(SecretTag.secret_id == row.id)
-                ).scalars()
-            ]
-            if tag not in secret_tags:
-                continue
-        result.append(
-            {
-                "key_name": row.key_name,
-                "value_plain": decrypt_secret_value(row.value_encrypted),
-            }
+
+def resolve_service_export_scope(
+    db: Session,
+    *,
+    service_token: str,
+    project_slug: str,
+    environment: EnvironmentEnum,
+) -> Optional[Tuple[UUID, UUID]]:
+    """Servis token'ini dogrular ve export kapsamini dondurur.
+
+    Dogrulanan token'lar `service_token_cache`'te tutulur; isabette sorgu
+    yapilmaz. `last_used_at` token basina en fazla
+    `SERVICE_TOKEN_TOUCH_INTERVAL_SECONDS`'ta bir yazilir.
+    """
+    token_hash = _hash_service_token(service_token)
+    scope = service_token_cache.get(token_hash)
+    if scope is None:
+        scope = _service_token_scope(db.execute(_service_token_scope_query(token_hash)).all())
+        if scope is None:
+            return None
+        service_token_cache.put(token_hash, scope)
+
+    export_scope = _service_export_scope(scope, project_slug, environment)
+    if export_scope is None:
+        return None
+
+    touch = _touch_service_token_statement(scope.token_id)
+    if touch is not None:
+        db.execute(touch)
+        db.commit()
+    return export_scope
+
+
+def record_secret_copy(
+    db: Session,
+    *,
+    actor_user_id: str,
+    project_slug: str,
+    secret_id: UUID,
+    metadata: Optional[Dict] = None,
+    access: Optional[AccessContext] = None,
+) -> bool:
+    """`secrets.last_copied_at` alanini gunceller ve kopyalama audit kaydini yazar.
+
+    Secret verilen projede ve kullanicinin okuyabildigi bir ortamda degilse
+    hicbir sey yazilmaz ve False doner. Senkron audit modunda ikisi ayni
+    commit'tedir; audit sink aciksa olay kuyruga alinir ve yalnizca kolon
+    guncellemesi commit edilir.
+    """
+    access = access or AccessContext(db, actor_user_id)
+    project_id = access.project_id(project_slug)
+    if project_id is None:
+        return False
+
+    copied_at = datetime.now(timezone.utc)
+    readable_env_ids = select(Environment.id).where(
+        Environment.project_id == project_id, _prod_readable_clause(actor_user_id)
+    )
+    result = db.execute(
+        update(Secret)
+        .where(
+            Secret.id == secret_id,
+            Secret.project_id == project_id,
+            Secret.environment_id.in_(readable_env_ids),
+        )
+        # Daha yeni bir kopyalama zamani geri alinmaz; updated_at'in onupdate
+        # ile degismemesi icin kendi degerine esitlenir
+        .values(
+            last_copied_at=case(
+                (
+                    or_(Secret.last_copied_at.is_(None), Secret.last_copied_at < copied_at),
+                    copied_at,
+                ),
+                else_=Secret.last_copied_at,
+            ),
+            updated_at=Secret.updated_at,
         )
+        .execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
+        db.rollback()
+        return False
+
+    add_audit_event(
+        db,
+        actor_user_id=actor_user_id,
+        project_slug=project_slug,
+        action="secret_copied",
+        target_type="secret",
+        target_id=str(secret_id),
+        metadata=metadata,
+        access=access,
+    )
+    # Audit kuyruga alindiysa last_copied_at guncellemesi burada commit edilir
+    db.commit()
+    return True
+
+
+def backfill_last_copied_at(db: Session) -> int:
+    """`last_copied_at` bos olan secret'lari audit_events'teki son kopyalamadan doldurur.
 
-    token_row.last_used_at = datetime.now(timezone.utc)
-    db.add(token_row)
+    Tek bir kume tabanli UPDATE calistirir; guncellenen satir sayisini dondurur.
+    """
+    last_copied = (
+        select(func.max(AuditEvent.created_at))
+        .where(
+            AuditEvent.action == "secret_copied",
+            AuditEvent.target_id == Secret.id,
+        )
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(Secret)
+        .where(
+            Secret.last_copied_at.is_(None),
+            select(AuditEvent.id)
+            .where(
+                AuditEvent.action == "secret_copied",
+                AuditEvent.target_id == Secret.id,
+            )
+            .exists(),
+        )
+        .values(last_copied_at=last_copied, updated_at=Secret.updated_at)
+        .execution_options(synchronize_session=False)
+    )
     db.commit()
-    return result
+    return result.rowcount
 
 
 def add_audit_event(
@@ -829,8 +1699,36 @@ def add_audit_event(
     target_type: str,
     target_id: Optional[str] = None,
     metadata: Optional[Dict] = None,
+    access: Optional[AccessContext] = None,
+    durable: Optional[bool] = None,
 ) -> None:
-    project_id = resolve_project_id(db, project_slug) if project_slug else None
+    """Audit olayi yazar.
+
+    Audit sink calisiyorsa ve aksiyon (veya `durable`) senkron yazim
+    gerektirmiyorsa olay kuyruga alinir; bu durumda commit yapilmaz.
+    """
+    sink = get_audit_sink()
+    if sink is not None and not (durable if durable is not None else sink.is_durable(action)):
+        record = AuditRecord(
+            actor_user_id=_to_uuid(actor_user_id) if actor_user_id else None,
+            project_id=access.project_id(project_slug) if access and project_slug else None,
+            project_slug=project_slug,
+            action=action,
+            target_type=target_type,
+            target_id=_to_uuid(target_id) if target_id else None,
+            meta=metadata or {},
+            created_at=datetime.now(timezone.utc),
+        )
+        if sink.submit(record):
+            return
+
+    project_id = None
+    if project_slug:
+        project_id = (
+            access.project_id(project_slug)
+            if access
+            else resolve_project_id(db, project_slug)
+        )
     event = AuditEvent(
         actor_user_id=_to_uuid(actor_user_id) if actor_user_id else None,
         project_id=project_id,
@@ -843,44 +1741,180 @@ def add_audit_event(
     db.commit()
 
 
-def list_audit_events(
+def parse_metadata_filters(values: Sequence[str]) -> Dict[str, Optional[str]]:
+    """`anahtar=deger` (esitlik) veya `anahtar` (var olma) filtrelerini ayristirir."""
+    filters: Dict[str, Optional[str]] = {}
+    for item in values:
+        key, sep, value = item.partition("=")
+        key = key.strip()
+        if not key:
+            raise ValueError(f"Invalid metadata filter '{item}'")
+        filters[key] = value if sep else None
+    return filters
+
+
+def _metadata_filter_clauses(db: Session, filters: Dict[str, Optional[str]]) -> List:
+    if not filters:
+        return []
+    if db.get_bind().dialect.name == "postgresql":
+        # `@>` ve `?` operatorleri ix_audit_events_metadata (GIN) indeksini kullanir
+        clauses = []
+        matches = {key: value for key, value in filters.items() if value is not None}
+        if matches:
+            clauses.append(AuditEvent.meta.contains(matches))
+        clauses.extend(
+            AuditEvent.meta.has_key(key) for key, value in filters.items() if value is None
+        )
+        return clauses
+
+    clauses = []
+    for key, value in filters.items():
+        extracted = func.json_extract(AuditEvent.meta, f'$."{key}"')
+        clauses.append(extracted.is_not(None) if value is None else extracted == value)
+    return clauses
+
+
+def _audit_event_query(
     db: Session,
     *,
     action: Optional[str] = None,
     project_slug: Optional[str] = None,
     user_email: Optional[str] = None,
+    actor_id: Optional[str] = None,
+    target_id: Optional[str] = None,
+    metadata: Optional[Dict[str, Optional[str]]] = None,
     from_dt: Optional[datetime] = None,
     to_dt: Optional[datetime] = None,
-) -> List[Dict]:
+    cursor: Optional[str] = None,
+):
     query = (
         select(AuditEvent, User.email, Project.slug)
         .join(User, User.id == AuditEvent.actor_user_id, isouter=True)
         .join(Project, Project.id == AuditEvent.project_id, isouter=True)
     )
 
-    if action:
-        query = query.where(AuditEvent.action == action)
+    # Slug ve e-posta once id'ye cevrilir; filtre audit_events'in kendi
+    # indeksli kolonlarina uygulanir, join sadece gosterim icindir.
+    # Bulunamayan slug/e-posta bos sonuc verir (`== None` IS NULL olurdu).
     if project_slug:
-        query = query.where(Project.slug == project_slug)
+        project_id = resolve_project_id(db, project_slug)
+        query = query.where(AuditEvent.project_id == project_id if project_id else false())
     if user_email:
-        query = query.where(User.email == user_email)
+        email_user_id = db.scalar(select(User.id).where(User.email == user_email))
+        query = query.where(
+            AuditEvent.actor_user_id == email_user_id if email_user_id else false()
+        )
+    if actor_id:
+        query = query.where(AuditEvent.actor_user_id == _to_uuid(actor_id))
+    if target_id:
+        query = query.where(AuditEvent.target_id == _to_uuid(target_id))
+    if action:
+        query = query.where(AuditEvent.action == action)
     if from_dt:
         query = query.where(AuditEvent.created_at >= from_dt)
     if to_dt:
         query = query.where(AuditEvent.created_at <= to_dt)
+    for clause in _metadata_filter_clauses(db, metadata or {}):
+        query = query.where(clause)
+    if cursor:
+        # Keyset: (created_at, id) ikilisine gore azalan sirada devam et
+        after_created_at, after_id = decode_cursor(cursor)
+        query = query.where(
+            # Ayrik ust sinir: planlayici sonraki aylarin partisyonlarini eler
+            AuditEvent.created_at <= after_created_at,
+            or_(
+                AuditEvent.created_at < after_created_at,
+                and_(AuditEvent.created_at == after_created_at, AuditEvent.id < after_id),
+            )
+        )
 
-    rows = db.execute(query.order_by(AuditEvent.created_at.desc()).limit(200)).all()
-    return [
-        {
-            "id": str(event.id),
-            "action": event.action,
-            "actor": email or "unknown",
-            "projectId": slug or "unknown",
-            "secretName": (event.meta or {}).get("secretName", ""),
-            "occurredAt": event.created_at,
-        }
-        for event, email, slug in rows
-    ]
+    return query.order_by(AuditEvent.created_at.desc(), AuditEvent.id.desc())
+
+
+def _to_audit_out(event: AuditEvent, email: Optional[str], slug: Optional[str]) -> Dict:
+    meta = event.meta or {}
+    return {
+        "id": str(event.id),
+        "action": event.action,
+        "actor": email or "unknown",
+        "actorId": str(event.actor_user_id) if event.actor_user_id else None,
+        "projectId": slug or "unknown",
+        "secretName": meta.get("secretName", ""),
+        "targetType": event.target_type,
+        "targetId": str(event.target_id) if event.target_id else None,
+        "metadata": meta,
+        "occurredAt": event.created_at,
+    }
+
+
+def list_audit_events_page(
+    db: Session,
+    *,
+    limit: int = AUDIT_PAGE_LIMIT,
+    cursor: Optional[str] = None,
+    action: Optional[str] = None,
+    project_slug: Optional[str] = None,
+    user_email: Optional[str] = None,
+    actor_id: Optional[str] = None,
+    target_id: Optional[str] = None,
+    metadata: Optional[Dict[str, Optional[str]]] = None,
+    from_dt: Optional[datetime] = None,
+    to_dt: Optional[datetime] = None,
+) -> Tuple[List[Dict], Optional[str]]:
+    """Bir sayfa audit olayi ve (varsa) sonraki sayfanin cursor'ini dondurur."""
+    query = _audit_event_query(
+        db,
+        action=action,
+        project_slug=project_slug,
+        user_email=user_email,
+        actor_id=actor_id,
+        target_id=target_id,
+        metadata=metadata,
+        from_dt=from_dt,
+        to_dt=to_dt,
+        cursor=cursor,
+    )
+    rows = db.execute(query.limit(limit + 1)).all()
+    page = rows[:limit]
+
+    next_cursor = None
+    if len(rows) > limit and page:
+        last_event = page[-1][0]
+        next_cursor = encode_cursor(last_event.created_at, last_event.id)
+    return [_to_audit_out(event, email, slug) for event, email, slug in page], next_cursor
+
+
+def iter_audit_events(
+    db: Session,
+    *,
+    batch_size: int = 1000,
+    cursor: Optional[str] = None,
+    action: Optional[str] = None,
+    project_slug: Optional[str] = None,
+    user_email: Optional[str] = None,
+    actor_id: Optional[str] = None,
+    target_id: Optional[str] = None,
+    metadata: Optional[Dict[str, Optional[str]]] = None,
+    from_dt: Optional[datetime] = None,
+    to_dt: Optional[datetime] = None,
+) -> Iterator[Dict]:
+    """Filtreye uyan tum audit olaylarini DB cursor'i ilerledikce uretir (SIEM export'u)."""
+    query = _audit_event_query(
+        db,
+        action=action,
+        project_slug=project_slug,
+        user_email=user_email,
+        actor_id=actor_id,
+        target_id=target_id,
+        metadata=metadata,
+        from_dt=from_dt,
+        to_dt=to_dt,
+        cursor=cursor,
+    )
+    result = db.execute(query.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        for event, email, slug in partition:
+            yield _to_audit_out(event, email, slug)
 
 
 # ---------------------------------------------------------------------------
@@ -1,12 +1,13 @@
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Union, cast
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
-from app.core.security import get_password_hash
 from app.db.models import RefreshToken, User
 from app.db.models.enums import RoleEnum
+from app.services.password_hasher import hash_password
+from app.services.user_cache import user_cache
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -167,7 +168,7 @@ def create_user(
         email=email,
         display_name=display_name,
         role=cast(RoleEnum, RoleEnum(role)),
-        password_hash=get_password_hash(password),
+        password_hash=hash_password(password),
         is_active=True,
     )
     db.add(user)
@@ -176,6 +177,17 @@ def create_user(
     return _user_to_dict(user)
 
 
+def rehash_user_password(db: Session, user: User, password_hash: str) -> None:
+    """Ayni sifrenin guncel argon2 maliyetiyle uretilmis hash'ini yazar.
+
+    Kimlik bilgisi degismedigi icin ORM flush yerine dogrudan UPDATE kullanilir;
+    token nesli artmaz, kullanicinin acik oturumlari gecerli kalir.
+    """
+    db.execute(update(User).where(User.id == user.id).values(password_hash=password_hash))
+    db.commit()
+    user_cache.invalidate(str(user.id))
+
+
 def update_user(
     db: Session,
     user_id: str,
@@ -196,7 +208,7 @@ def update_user(
     if is_active is not None:
         user.is_active = is_active
     if password is not None:
-        user.password_hash = get_password_hash(password)
+        user.password_hash = hash_password(password)
 
     db.add(user)
     db.commit()
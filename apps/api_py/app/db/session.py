@@ -1,17 +1,113 @@
-from sqlalchemy import create_engine
+from time import perf_counter
+from typing import Any, Dict, Optional, Type
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from app.core.config import get_settings
+from app.core.metrics import LatencyMetrics
 
 
 settings = get_settings()
 
-engine = create_engine(settings.DATABASE_URL, future=True)
+# Havuzdan baglanti alma bekleme suresi; zaman asimlari `rejected` sayilir
+pool_metrics = LatencyMetrics()
+
+_STATEMENT_TIMEOUT_KEY = "statement_timeout_ms"
+
+
+class InstrumentedQueuePool(QueuePool):
+    """Checkout bekleme suresini ve havuz zaman asimlarini `metrics`'e yazar."""
+
+    metrics = pool_metrics
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_rejected()
+            raise
+        finally:
+            self.metrics.record("checkout", perf_counter() - started)
+
+
+def _engine_options(
+    database_url: str, *, poolclass: Type[QueuePool] = InstrumentedQueuePool
+) -> Dict[str, Any]:
+    if database_url.startswith("sqlite"):
+        return {}
+
+    options: Dict[str, Any] = {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_PGBOUNCER:
+        # Transaction modundaki pgbouncer'da baglanti her islemde degisebilir;
+        # sunucu tarafi prepared statement'lar baska baglantida bulunmaz.
+        options["connect_args"] = {"prepare_threshold": None}
+    return options
+
+
+engine = create_engine(
+    settings.DATABASE_URL, future=True, **_engine_options(settings.DATABASE_URL)
+)
 SessionLocal = sessionmaker(
     bind=engine, autoflush=False, autocommit=False, class_=Session
 )
 
 
+def set_statement_timeout(db: Session, milliseconds: int) -> None:
+    """Bu oturumun sonraki islemleri (ve acik olan islem) icin statement_timeout.
+
+    Uzun sureli istekler (export gibi) varsayilan `DB_STATEMENT_TIMEOUT_MS`
+    degerini bu sekilde yukseltebilir; 0 siniri kaldirir.
+    """
+    db.info[_STATEMENT_TIMEOUT_KEY] = milliseconds
+    if db.in_transaction():
+        _apply_statement_timeout(db.connection(), milliseconds)
+
+
+def _apply_statement_timeout(connection, milliseconds: int) -> None:
+    if connection.dialect.name != "postgresql":
+        return
+    # SET LOCAL islem bitince sifirlanir; pgbouncer transaction modunda
+    # baglantiyi paylasan diger istemcilere sizmaz.
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(milliseconds)}")
+
+
+@event.listens_for(SessionLocal, "after_begin")
+def _statement_timeout_on_begin(session: Session, transaction, connection) -> None:
+    milliseconds = session.info.get(_STATEMENT_TIMEOUT_KEY, settings.DB_STATEMENT_TIMEOUT_MS)
+    if milliseconds:
+        _apply_statement_timeout(connection, milliseconds)
+
+
+def pool_status(bind: Optional[Engine] = None) -> Dict[str, Any]:
+    """Havuz doluluk durumu ve checkout bekleme metrikleri."""
+    pool = (bind or engine).pool
+    status: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checkedOut=pool.checkedout(),
+            checkedIn=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            maxOverflow=settings.DB_MAX_OVERFLOW,
+        )
+    metrics = getattr(pool, "metrics", pool_metrics).snapshot()
+    status["timeouts"] = metrics["rejected"]
+    status["checkoutWait"] = metrics["operations"].get("checkout")
+    return status
+
+
 def get_db():
     db = SessionLocal()
     try:
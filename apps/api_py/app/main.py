@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -7,19 +9,28 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_current_user, get_db_session, user_profile_response
 from app.api.router import api_router
 from app.core.config import get_settings
-from app.core.security import get_password_hash, verify_password
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.db.async_session import dispose_async_engine
 from app.db.repositories.users_repo import (
     get_active_session_by_id,
     list_active_sessions_for_user,
     revoke_all_refresh_tokens_for_user,
     revoke_refresh_token,
 )
+from app.db.session import SessionLocal
 from app.schemas.auth import (
     PasswordChangeRequest,
     PreferencesUpdateRequest,
     ProfileUpdateRequest,
     SessionOut,
 )
+from app.services.audit_sink import start_audit_sink, stop_audit_sink
+from app.services.password_hasher import (
+    hash_password,
+    start_password_hasher,
+    stop_password_hasher,
+    verify_password,
+)
 
 
 import logging as _logging
@@ -34,8 +45,37 @@ if IS_PRODUCTION and not settings.RESEND_API_KEY and not settings.SMTP_HOST:
         "RESEND_API_KEY veya SMTP_HOST ayarlayin."
     )
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    if settings.AUDIT_ASYNC_ENABLED:
+        start_audit_sink(
+            SessionLocal,
+            max_queue_size=settings.AUDIT_QUEUE_MAX_SIZE,
+            flush_size=settings.AUDIT_FLUSH_SIZE,
+            flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+            durable_actions=settings.AUDIT_DURABLE_ACTIONS,
+            write_retries=settings.AUDIT_WRITE_RETRIES,
+            retry_backoff=settings.AUDIT_WRITE_RETRY_BACKOFF_SECONDS,
+        )
+    if settings.PASSWORD_HASH_WORKERS > 0:
+        start_password_hasher(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+            timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS,
+        )
+    try:
+        yield
+    finally:
+        # Kapanista kuyrukta bekleyen audit kayitlari yazilir
+        stop_audit_sink()
+        stop_password_hasher()
+        await dispose_async_engine()
+
+
 app = FastAPI(
     title=settings.APP_NAME,
+    lifespan=lifespan,
     docs_url=None if IS_PRODUCTION else "/docs",
     redoc_url=None if IS_PRODUCTION else "/redoc",
     openapi_url=None if IS_PRODUCTION else "/openapi.json",
@@ -47,6 +87,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.include_router(api_router, prefix=settings.API_PREFIX)
@@ -140,7 +181,7 @@ def change_password(
             content={"detail": "Current password is incorrect"},
         )
 
-    user.password_hash = get_password_hash(payload.newPassword)
+    user.password_hash = hash_password(payload.newPassword)
     db.add(user)
     db.commit()
     return {"ok": True}
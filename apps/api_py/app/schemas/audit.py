@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from pydantic import BaseModel
 
@@ -8,11 +8,15 @@ class AuditEventOut(BaseModel):
     id: str
     action: str
     actor: str
+    actorId: Optional[str] = None
     projectId: str
     secretName: str
+    targetType: Optional[str] = None
+    targetId: Optional[str] = None
+    metadata: Dict[str, Any] = {}
     occurredAt: datetime
 
 
 class AuditCopyRequest(BaseModel):
-    projectId: Optional[str] = None
+    projectId: str
     secretId: str
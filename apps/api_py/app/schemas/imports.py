@@ -12,6 +12,7 @@ class ImportPairOut(BaseModel):
 
 class ImportPreviewRequest(BaseModel):
     content: str
+    format: str = "txt"
 
 
 class ImportPreviewOut(BaseModel):
@@ -25,12 +26,19 @@ class ImportCommitRequest(BaseModel):
     projectId: str
     environment: EnvironmentEnum
     content: str
+    format: str = "txt"
     provider: str = "Imported"
     type: str = "key"
     conflictStrategy: Literal["skip", "overwrite"] = "skip"
     tags: List[str] = Field(default_factory=list)
 
 
+class ImportCommitItemOut(BaseModel):
+    key: str
+    status: Literal["inserted", "updated", "skipped"]
+    secretId: Optional[str] = None
+
+
 class ImportCommitOut(BaseModel):
     projectId: str
     environment: EnvironmentEnum
@@ -38,3 +46,4 @@ class ImportCommitOut(BaseModel):
     updated: int
     skipped: int
     total: int
+    items: List[ImportCommitItemOut] = Field(default_factory=list)
@@ -0,0 +1,204 @@
+"""audit_events aylik partisyon bakimi: ileri partisyon acma ve eski ayi arsivleme.
+
+Tablo `created_at` uzerinde RANGE partisyonludur (bkz. 20261016_0013). Her ay
+`audit_events_pYYYYMM` adli bir partisyondur; araliga dusmeyen satirlar
+`audit_events_default` partisyonuna gider. Bu modul sadece PostgreSQL'de calisir.
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Iterator, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+logger = logging.getLogger(__name__)
+
+AUDIT_TABLE = "audit_events"
+DEFAULT_PARTITION = f"{AUDIT_TABLE}_default"
+AUDIT_COLUMNS = "id, project_id, actor_user_id, action, target_type, target_id, metadata, created_at"
+_PARTITION_NAME = re.compile(rf"^{AUDIT_TABLE}_p(\d{{4}})(\d{{2}})$")
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{AUDIT_TABLE}_p{month.year:04d}{month.month:02d}"
+
+
+def parse_partition_month(name: str) -> Optional[date]:
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def expired_partitions(
+    names: List[str], *, retention_months: int, today: Optional[date] = None
+) -> List[str]:
+    """Tum ayi saklama suresinin disinda kalan partisyonlari (eskiden yeniye) dondurur.
+
+    Saklama penceresi icinde bulunulan ay dahil `retention_months` aydir;
+    default partisyon hicbir zaman arsivlenmez.
+    """
+    current = month_start(today or datetime.now(timezone.utc).date())
+    cutoff = add_months(current, -retention_months + 1)
+    months = sorted(
+        (month, name)
+        for month, name in ((parse_partition_month(name), name) for name in names)
+        if month is not None
+    )
+    return [name for month, name in months if month < cutoff]
+
+
+def list_audit_partitions(db: Session) -> List[str]:
+    rows = db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = CAST(:table AS regclass) ORDER BY child.relname"
+        ),
+        {"table": AUDIT_TABLE},
+    ).scalars()
+    return list(rows)
+
+
+def _default_has_rows(db: Session, start: date, end: date) -> bool:
+    return bool(
+        db.execute(
+            text(
+                f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+                "WHERE created_at >= :start AND created_at < :end)"
+            ),
+            {"start": start, "end": end},
+        ).scalar()
+    )
+
+
+def _create_partition(db: Session, name: str, month: date, *, has_default: bool) -> int:
+    """Ay partisyonunu olusturur; default'a dusmus satirlari yeni partisyona tasir.
+
+    Default partisyonda o aya ait satir varken PostgreSQL `PARTITION OF`'u
+    reddeder. Bu durumda default ayrilir, partisyon olusturulur, satirlar
+    tasinir ve default yeniden baglanir; hepsi cagiranin isleminde yapilir.
+    Tasinan satir sayisini dondurur.
+    """
+    end = add_months(month, 1)
+    create = text(
+        f"CREATE TABLE {name} PARTITION OF {AUDIT_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+    )
+    if not has_default or not _default_has_rows(db, month, end):
+        db.execute(create)
+        return 0
+
+    bounds = {"start": month, "end": end}
+    db.execute(text(f"ALTER TABLE {AUDIT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+    db.execute(create)
+    moved = db.execute(
+        text(
+            f"INSERT INTO {name} ({AUDIT_COLUMNS}) SELECT {AUDIT_COLUMNS} "
+            f"FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end"
+        ),
+        bounds,
+    ).rowcount
+    db.execute(
+        text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end"),
+        bounds,
+    )
+    db.execute(text(f"ALTER TABLE {AUDIT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+    logger.info("Default audit partisyonundan %s'e %d satir tasindi", name, moved)
+    return moved
+
+
+def ensure_audit_partitions(
+    db: Session, *, months_ahead: int = 3, today: Optional[date] = None
+) -> List[str]:
+    """Bu ay ve sonraki `months_ahead` ay icin eksik partisyonlari olusturur.
+
+    Bakim gecikip satirlar default partisyona dustuyse bunlar yeni ay
+    partisyonuna tasinir; tum degisiklikler tek islemde commit edilir.
+    """
+    existing = set(list_audit_partitions(db))
+    has_default = DEFAULT_PARTITION in existing
+    current = month_start(today or datetime.now(timezone.utc).date())
+    created: List[str] = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        _create_partition(db, name, month, has_default=has_default)
+        created.append(name)
+    db.commit()
+    return created
+
+
+def _iter_partition_lines(db: Session, name: str, batch_size: int) -> Iterator[str]:
+    result = db.execute(
+        text(
+            "SELECT id, project_id, actor_user_id, action, target_type, target_id, "
+            f"metadata, created_at FROM {name} ORDER BY created_at, id"
+        ).execution_options(yield_per=batch_size)
+    )
+    for row in result.mappings():
+        yield json.dumps(dict(row), default=str, separators=(",", ":")) + "\n"
+
+
+@dataclass
+class ArchivedPartition:
+    name: str
+    path: str
+    rows: int
+
+
+def archive_audit_partition(
+    db: Session, name: str, archive_dir: str, *, batch_size: int = 5000
+) -> ArchivedPartition:
+    """Partisyonu gzip'li NDJSON olarak yazar, sonra ayirip siler.
+
+    Dosya once gecici adla yazilir; DETACH/DROP ancak dosya tamamlandiktan
+    sonra yapildigindan yarida kalan bir calisma veri kaybettirmez.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{name}.ndjson.gz")
+    partial = path + ".partial"
+
+    rows = 0
+    with gzip.open(partial, "wt", encoding="utf-8") as handle:
+        for line in _iter_partition_lines(db, name, batch_size):
+            handle.write(line)
+            rows += 1
+    os.replace(partial, path)
+
+    db.execute(text(f"ALTER TABLE {AUDIT_TABLE} DETACH PARTITION {name}"))
+    db.execute(text(f"DROP TABLE {name}"))
+    db.commit()
+    logger.info("Audit partisyonu arsivlendi: %s (%d satir) -> %s", name, rows, path)
+    return ArchivedPartition(name=name, path=path, rows=rows)
+
+
+def apply_audit_retention(
+    db: Session,
+    *,
+    retention_months: int,
+    archive_dir: str,
+    today: Optional[date] = None,
+) -> List[ArchivedPartition]:
+    names = expired_partitions(
+        list_audit_partitions(db), retention_months=retention_months, today=today
+    )
+    return [archive_audit_partition(db, name, archive_dir) for name in names]
@@ -0,0 +1,219 @@
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from queue import Empty, Full, Queue
+from time import monotonic, sleep
+from typing import Callable, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.db.models import AuditEvent, Project
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AuditRecord:
+    actor_user_id: Optional[UUID]
+    project_id: Optional[UUID]
+    project_slug: Optional[str]
+    action: str
+    target_type: str
+    target_id: Optional[UUID]
+    meta: Dict
+    created_at: datetime
+
+
+class _Flush:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class AuditSink:
+    """Audit kayitlarini kuyruga alip arka plan thread'inde toplu yazar.
+
+    Kuyruk doluysa veya sink kapatilmissa `submit` False dondurur; cagiran
+    taraf kaydi senkron yazar, boylece hicbir olay dusurulmez. Toplu INSERT
+    basarisiz olursa artan beklemeyle yeniden denenir; yine olmazsa kayitlar
+    tek tek yazilir ve yalnizca yazilamayan kayit ayrilip tam icerigiyle
+    loglanir.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        max_queue_size: int = 10000,
+        flush_size: int = 200,
+        flush_interval: float = 1.0,
+        durable_actions: Iterable[str] = (),
+        write_retries: int = 3,
+        retry_backoff: float = 0.1,
+    ) -> None:
+        self._session_factory = session_factory
+        self._queue: "Queue[object]" = Queue(maxsize=max_queue_size)
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.durable_actions = frozenset(durable_actions)
+        self.write_retries = write_retries
+        self.retry_backoff = retry_backoff
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+
+    def start(self) -> "AuditSink":
+        self._thread.start()
+        return self
+
+    def is_durable(self, action: str) -> bool:
+        return action in self.durable_actions
+
+    def submit(self, record: AuditRecord) -> bool:
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(record)
+        except Full:
+            logger.warning("Audit kuyrugu dolu; kayit senkron yaziliyor")
+            return False
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Kuyrukta bekleyen kayitlar yazilana kadar bekler."""
+        if self._closed or not self._thread.is_alive():
+            return True
+        marker = _Flush()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def shutdown(self, timeout: Optional[float] = 10.0) -> None:
+        """Yeni kayit kabul etmeyi birakir, kuyrugu bosaltip thread'i durdurur."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+        # Kapanirken yarista kuyruga dusen kayitlar da yazilir
+        leftovers: List[AuditRecord] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except Empty:
+                break
+            if isinstance(item, AuditRecord):
+                leftovers.append(item)
+        if leftovers:
+            self._write(leftovers)
+
+    def _run(self) -> None:
+        batch: List[AuditRecord] = []
+        deadline: Optional[float] = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except Empty:
+                item = None
+
+            if isinstance(item, AuditRecord):
+                batch.append(item)
+                if deadline is None:
+                    deadline = monotonic() + self.flush_interval
+                if len(batch) < self.flush_size and monotonic() < deadline:
+                    continue
+            elif item is None and deadline is not None and monotonic() < deadline:
+                continue
+
+            if batch:
+                self._write(batch)
+                batch = []
+                deadline = None
+            if isinstance(item, _Flush):
+                item.done.set()
+            elif item is _STOP:
+                return
+
+    def _write(self, batch: List[AuditRecord]) -> None:
+        delay = self.retry_backoff
+        for attempt in range(self.write_retries + 1):
+            try:
+                self._insert(batch)
+                return
+            except Exception:
+                logger.warning(
+                    "Audit kayitlari yazilamadi (%d kayit, deneme %d)",
+                    len(batch),
+                    attempt + 1,
+                    exc_info=True,
+                )
+            if attempt < self.write_retries:
+                sleep(delay)
+                delay *= 2
+
+        # Toplu yazim olmadi: hatali kayit digerlerini engellemesin
+        for record in batch:
+            try:
+                self._insert([record])
+            except Exception:
+                logger.exception("Audit kaydi yazilamadi: %r", asdict(record))
+
+    def _insert(self, batch: List[AuditRecord]) -> None:
+        db = self._session_factory()
+        try:
+            slugs = {
+                record.project_slug
+                for record in batch
+                if record.project_id is None and record.project_slug
+            }
+            project_ids: Dict[str, UUID] = {}
+            if slugs:
+                project_ids = dict(
+                    db.execute(
+                        select(Project.slug, Project.id).where(Project.slug.in_(slugs))
+                    ).all()
+                )
+
+            rows = []
+            for record in batch:
+                row = asdict(record)
+                slug = row.pop("project_slug")
+                if row["project_id"] is None and slug:
+                    row["project_id"] = project_ids.get(slug)
+                rows.append(row)
+
+            db.execute(insert(AuditEvent), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+_sink: Optional[AuditSink] = None
+
+
+def get_audit_sink() -> Optional[AuditSink]:
+    return _sink
+
+
+def start_audit_sink(session_factory: Callable[[], Session], **options) -> AuditSink:
+    global _sink
+    stop_audit_sink()
+    _sink = AuditSink(session_factory, **options).start()
+    return _sink
+
+
+def stop_audit_sink(timeout: Optional[float] = 10.0) -> None:
+    global _sink
+    if _sink is not None:
+        _sink.shutdown(timeout)
+        _sink = None
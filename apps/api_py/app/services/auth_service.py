@@ -10,18 +10,19 @@ from app.core.security import (
     create_password_reset_token,
     create_refresh_token,
     decode_token,
-    get_password_hash,
     hash_token,
-    verify_password,
+    password_needs_update,
 )
 from app.db.repositories.users_repo import (
     create_refresh_token as create_refresh_token_record,
     get_user_by_email,
     get_user_by_id,
     get_valid_refresh_token,
+    rehash_user_password,
     revoke_all_refresh_tokens_for_user,
     revoke_refresh_token,
 )
+from app.services.password_hasher import hash_password, verify_password
 from app.services.supabase_auth import (
     create_supabase_user,
     login_with_supabase_password,
@@ -115,7 +116,9 @@ def login_with_password(
 
         user = resolve_user_from_supabase_token(db, supabase_session["accessToken"])
 
-        access_token = create_access_token(str(user.id), user.role.value, user.email)
+        access_token = create_access_token(
+            str(user.id), user.role.value, user.email, user.token_generation
+        )
         refresh_token = create_refresh_token(str(user.id), user.role.value, user.email)
 
         expires_at = datetime.now(timezone.utc) + timedelta(minutes=30)
@@ -143,8 +146,12 @@ def login_with_password(
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
         )
+    if password_needs_update(user.password_hash):
+        rehash_user_password(db, user, hash_password(password))
 
-    access_token = create_access_token(str(user.id), user.role.value, user.email)
+    access_token = create_access_token(
+        str(user.id), user.role.value, user.email, user.token_generation
+    )
     refresh_token = create_refresh_token(str(user.id), user.role.value, user.email)
 
     expires_at = datetime.now(timezone.utc) + timedelta(minutes=30)
@@ -198,7 +205,9 @@ def refresh_access_token(
 
     revoke_refresh_token(db, token_row)
 
-    access_token = create_access_token(str(user.id), user.role.value, user.email)
+    access_token = create_access_token(
+        str(user.id), user.role.value, user.email, user.token_generation
+    )
     new_refresh_token = create_refresh_token(str(user.id), user.role.value, user.email)
 
     expires_at = datetime.now(timezone.utc) + timedelta(minutes=30)
@@ -267,7 +276,7 @@ def reset_password_with_token(db: Session, *, token: str, new_password: str) ->
             detail="Gecersiz veya suresi dolmus sifirlama baglantisi.",
         )
 
-    user.password_hash = get_password_hash(new_password)
+    user.password_hash = hash_password(new_password)
     db.add(user)
 
     revoke_all_refresh_tokens_for_user(db, str(user.id))
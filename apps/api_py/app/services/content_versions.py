@@ -0,0 +1,102 @@
+"""Ortam icerik surumu degisikliklerinin long-poll isteklerine bildirilmesi.
+
+Surum `environments.content_version` kolonundadir ve yazan repository
+fonksiyonlari tarafindan ayni islemde arttirilir. Commit sonrasi ayni
+process'te bekleyen istekler hemen uyandirilir; baska process'lerdeki
+degisiklikler bekleyenlerin periyodik surum kontrolu ile gorulur.
+"""
+
+import asyncio
+import threading
+from time import monotonic
+from typing import Awaitable, Callable, Dict, Iterable, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+_CHANGED_KEY = "content_versions_changed"
+
+
+class ContentChangeNotifier:
+    def __init__(self) -> None:
+        self._waiters: Dict[UUID, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+        self._lock = threading.Lock()
+
+    def notify(self, environment_ids: Iterable[UUID]) -> None:
+        """Herhangi bir thread'den cagrilabilir."""
+        with self._lock:
+            waiters = [
+                waiter
+                for env_id in environment_ids
+                for waiter in self._waiters.get(env_id, ())
+            ]
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(waiter.set)
+            except RuntimeError:
+                # Bekleyenin event loop'u kapanmis
+                pass
+
+    async def wait(self, environment_id: UUID, timeout: float) -> bool:
+        """Ortam icin bildirim gelirse True, `timeout` dolarsa False."""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            self._waiters.setdefault(environment_id, set()).add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(environment_id)
+                if waiters is not None:
+                    waiters.discard(waiter)
+                    if not waiters:
+                        del self._waiters[environment_id]
+
+
+content_change_notifier = ContentChangeNotifier()
+
+
+async def wait_for_content_change(
+    environment_id: UUID,
+    version: int,
+    timeout: float,
+    current_version: Callable[[], Awaitable[int]],
+    *,
+    check_interval: float,
+) -> int:
+    """Ortam surumu `version`'dan farkli olana veya `timeout` dolana kadar bekler.
+
+    Ayni process'teki degisikliklerde hemen, digerlerinde en gec
+    `check_interval` saniye icinde doner. Son gorulen surumu dondurur.
+    """
+    deadline = monotonic() + timeout
+    while True:
+        remaining = deadline - monotonic()
+        if remaining <= 0:
+            return version
+        await content_change_notifier.wait(environment_id, min(remaining, check_interval))
+        latest = await current_version()
+        if latest != version:
+            return latest
+
+
+def record_content_change(session: Session, environment_ids: Iterable[UUID]) -> None:
+    """Commit sonrasi bildirilecek ortamlari oturuma not eder."""
+    session.info.setdefault(_CHANGED_KEY, set()).update(environment_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_after_commit(session: Session) -> None:
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if changed:
+        content_change_notifier.notify(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_after_rollback(session: Session) -> None:
+    session.info.pop(_CHANGED_KEY, None)
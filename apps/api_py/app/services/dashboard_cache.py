@@ -0,0 +1,120 @@
+import threading
+from time import monotonic
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.config import get_settings
+from app.db.models import Environment, Project, ProjectMember, Secret, SecretCounter
+
+
+# Dashboard sayaclarini etkileyen modeller ve Secret'in gruplama kolonlari
+_TRACKED_CLASSES = (Secret, SecretCounter, Project, ProjectMember, Environment)
+_TRACKED_SECRET_COLUMNS = frozenset({"provider", "environment_id", "project_id"})
+_DIRTY_KEY = "dashboard_cache_dirty"
+
+
+class DashboardCache:
+    """Kullanici basina dashboard sayaclari icin TTL'li, nesil (generation) tabanli cache.
+
+    Ilgili bir yazma commit edildiginde nesil artar ve tum girdiler bayatlar;
+    TTL ise baska process'lerden gelen yazmalar icin ust sinirdir.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 10000) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[int, float, Any]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            generation, expires_at, value = entry
+            if generation != self._generation or expires_at <= monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[key] = (self._generation, monotonic() + self.ttl_seconds, value)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+dashboard_cache = DashboardCache(ttl_seconds=get_settings().DASHBOARD_CACHE_TTL_SECONDS)
+
+
+# ---------------------------------------------------------------------------
+# Yazma tabanli invalidation (commit sonrasi)
+# ---------------------------------------------------------------------------
+
+
+def _secret_grouping_changed(secret: Secret) -> bool:
+    attrs = inspect(secret).attrs
+    return any(attrs[name].history.has_changes() for name in _TRACKED_SECRET_COLUMNS)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_dirty_on_flush(session: Session, flush_context) -> None:
+    if session.info.get(_DIRTY_KEY):
+        return
+    for instance in (*session.new, *session.deleted):
+        if isinstance(instance, _TRACKED_CLASSES):
+            session.info[_DIRTY_KEY] = True
+            return
+    for instance in session.dirty:
+        if isinstance(instance, Secret) and _secret_grouping_changed(instance):
+            session.info[_DIRTY_KEY] = True
+            return
+
+
+def _updated_columns(state: ORMExecuteState) -> set:
+    params = state.parameters
+    rows = params if isinstance(params, list) else [params or {}]
+    columns = {key for row in rows for key in row}
+    # `update(Secret).values(...)` bicimindeki SET kolonlari
+    for key in getattr(state.statement, "_values", None) or {}:
+        columns.add(getattr(key, "key", key))
+    return columns
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dirty_on_bulk(state: ORMExecuteState) -> None:
+    if state.is_select or state.session.info.get(_DIRTY_KEY):
+        return
+    mapper = state.bind_mapper
+    if mapper is None or not issubclass(mapper.class_, _TRACKED_CLASSES):
+        return
+    if state.is_update and mapper.class_ is Secret:
+        # last_copied_at / sifreli deger guncellemeleri sayaclari degistirmez
+        if not _updated_columns(state) & _TRACKED_SECRET_COLUMNS:
+            return
+    if state.is_update and mapper.class_ is Environment:
+        # Export icerik surumu sayaclari degistirmez
+        if _updated_columns(state) <= {"content_version"}:
+            return
+    state.session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop(_DIRTY_KEY, False):
+        dashboard_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_after_rollback(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
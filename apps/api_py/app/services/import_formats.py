@@ -0,0 +1,297 @@
+import base64
+import binascii
+import json
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.services.import_parser import (
+    PREVIEW_LIMIT,
+    ImportPair,
+    ImportPreview,
+    ParsedImport,
+    parse_txt_import,
+    preview_txt_import,
+)
+
+try:  # YAML destegi istege bagli (pip install pyyaml)
+    import yaml
+except ImportError:  # pragma: no cover - PyYAML kurulu degilse
+    yaml = None
+
+
+DEFAULT_IMPORT_FORMAT = "txt"
+FLATTEN_SEPARATOR = "_"
+
+ImportFormatParser = Callable[[str], ParsedImport]
+
+_IMPORT_FORMATS: Dict[str, ImportFormatParser] = {}
+
+
+def register_import_format(name: str) -> Callable[[ImportFormatParser], ImportFormatParser]:
+    """Bir parser'i `name` formati icin kaydeder (dekorator)."""
+
+    def decorator(parser: ImportFormatParser) -> ImportFormatParser:
+        _IMPORT_FORMATS[name] = parser
+        return parser
+
+    return decorator
+
+
+def available_import_formats() -> List[str]:
+    return sorted(_IMPORT_FORMATS)
+
+
+def get_import_parser(name: str) -> ImportFormatParser:
+    try:
+        return _IMPORT_FORMATS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported import format '{name}'. "
+            f"Expected one of: {', '.join(available_import_formats())}"
+        ) from None
+
+
+def parse_import(content: str, fmt: str = DEFAULT_IMPORT_FORMAT) -> ParsedImport:
+    return get_import_parser(fmt)(content)
+
+
+def preview_import(
+    content: str, fmt: str = DEFAULT_IMPORT_FORMAT, limit: int = PREVIEW_LIMIT
+) -> ImportPreview:
+    """Onizleme uretir; TXT formati satir satir, digerleri tam parse ile."""
+    if fmt == "txt":
+        return preview_txt_import(content.splitlines(), limit=limit)
+    parsed = parse_import(content, fmt)
+    return ImportPreview(
+        project_heading=parsed.project_heading,
+        total_pairs=len(parsed.pairs),
+        skipped=parsed.skipped,
+        preview=parsed.pairs[:limit],
+    )
+
+
+register_import_format("txt")(parse_txt_import)
+
+
+# --- dotenv -----------------------------------------------------------------
+
+_DOTENV_KEY = re.compile(r"[ \t]*(?:export[ \t]+)?([A-Za-z_][A-Za-z0-9_.\-]*)[ \t]*=[ \t]*")
+_INLINE_COMMENT = re.compile(r"[ \t]+#")
+_ESCAPE = re.compile(r"\\(.)", re.DOTALL)
+_ESCAPES = {"n": "\n", "r": "\r", "t": "\t", '"': '"', "\\": "\\", "$": "$"}
+
+
+def _unescape_double_quoted(raw: str) -> str:
+    if "\\" not in raw:
+        return raw
+    return _ESCAPE.sub(lambda m: _ESCAPES.get(m.group(1), "\\" + m.group(1)), raw)
+
+
+def _find_closing_quote(content: str, start: int, quote: str) -> int:
+    if quote == "'":
+        return content.find("'", start)
+    pos = start
+    while True:
+        end = content.find('"', pos)
+        if end == -1:
+            return -1
+        backslashes = 0
+        index = end - 1
+        while index >= start and content[index] == "\\":
+            backslashes += 1
+            index -= 1
+        if backslashes % 2 == 0:
+            return end
+        pos = end + 1
+
+
+@register_import_format("dotenv")
+def parse_dotenv_import(content: str) -> ParsedImport:
+    """`.env` dosyalarini tek geciste tarar.
+
+    `export` oneki, tek/cift tirnakli (cok satirli olabilen) degerler,
+    cift tirnak icindeki kacis dizileri ve satir sonu yorumlari desteklenir.
+    """
+    content = content.replace("\r\n", "\n")
+    pairs: List[ImportPair] = []
+    skipped = 0
+    pos = 0
+    size = len(content)
+
+    while pos < size:
+        eol = content.find("\n", pos)
+        if eol == -1:
+            eol = size
+        line = content[pos:eol].strip()
+        if not line or line.startswith("#"):
+            pos = eol + 1
+            continue
+
+        match = _DOTENV_KEY.match(content, pos, eol)
+        if match is None:
+            skipped += 1
+            pos = eol + 1
+            continue
+
+        key = match.group(1)
+        value_start = match.end()
+        quote = content[value_start] if value_start < eol else ""
+
+        if quote == '"' or quote == "'":
+            end = _find_closing_quote(content, value_start + 1, quote)
+            if end == -1:
+                skipped += 1
+                pos = eol + 1
+                continue
+            raw = content[value_start + 1 : end]
+            value = _unescape_double_quoted(raw) if quote == '"' else raw
+            eol = content.find("\n", end)
+            if eol == -1:
+                eol = size
+            rest = content[end + 1 : eol].strip()
+            if rest and not rest.startswith("#"):
+                skipped += 1
+                pos = eol + 1
+                continue
+        else:
+            value = content[value_start:eol]
+            comment = _INLINE_COMMENT.search(value)
+            if comment is not None:
+                value = value[: comment.start()]
+            value = value.strip()
+
+        pairs.append(ImportPair(key=key, value=value))
+        pos = eol + 1
+
+    return ParsedImport(project_heading=None, pairs=pairs, skipped=skipped)
+
+
+# --- JSON / YAML ------------------------------------------------------------
+
+
+def _scalar_to_str(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+def _flatten(data: Dict[Any, Any], prefix: str = "") -> Iterator[Tuple[str, Any]]:
+    for key, value in data.items():
+        name = f"{prefix}{FLATTEN_SEPARATOR}{key}" if prefix else str(key)
+        if isinstance(value, dict) and value:
+            yield from _flatten(value, name)
+        else:
+            yield name, value
+
+
+def _parse_mapping(data: Any, source: str) -> ParsedImport:
+    if not isinstance(data, dict):
+        raise ValueError(f"{source} import must be an object at the top level")
+    pairs: List[ImportPair] = []
+    skipped = 0
+    for key, value in _flatten(data):
+        key = key.strip()
+        if not key:
+            skipped += 1
+            continue
+        pairs.append(ImportPair(key=key, value=_scalar_to_str(value)))
+    return ParsedImport(project_heading=None, pairs=pairs, skipped=skipped)
+
+
+def _load_json(content: str) -> Any:
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Invalid JSON: {exc.msg} (line {exc.lineno})") from exc
+
+
+def _yaml_loader():
+    if yaml is None:
+        raise ValueError("YAML import requires PyYAML to be installed")
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _load_yaml_documents(content: str) -> List[Any]:
+    loader = _yaml_loader()
+    try:
+        return [doc for doc in yaml.load_all(content, Loader=loader) if doc is not None]
+    except yaml.YAMLError as exc:
+        raise ValueError(f"Invalid YAML: {exc}") from exc
+
+
+@register_import_format("json")
+def parse_json_import(content: str) -> ParsedImport:
+    """JSON nesnesini duzlestirir: `{"db": {"host": "x"}}` -> `db_host=x`."""
+    if not content.strip():
+        return ParsedImport(project_heading=None, pairs=[], skipped=0)
+    return _parse_mapping(_load_json(content), "JSON")
+
+
+@register_import_format("yaml")
+def parse_yaml_import(content: str) -> ParsedImport:
+    documents = _load_yaml_documents(content)
+    if not documents:
+        return ParsedImport(project_heading=None, pairs=[], skipped=0)
+    if len(documents) > 1:
+        raise ValueError("YAML import expects a single document")
+    return _parse_mapping(documents[0], "YAML")
+
+
+# --- Kubernetes Secret ------------------------------------------------------
+
+
+def _iter_k8s_secrets(documents: List[Any]) -> Iterator[Dict[str, Any]]:
+    for doc in documents:
+        if not isinstance(doc, dict):
+            continue
+        if doc.get("kind") == "Secret":
+            yield doc
+        elif doc.get("kind") == "List" and isinstance(doc.get("items"), list):
+            yield from _iter_k8s_secrets(doc["items"])
+
+
+@register_import_format("k8s")
+def parse_k8s_secret_import(content: str) -> ParsedImport:
+    """Kubernetes `Secret` manifest'lerini (YAML veya JSON) okur.
+
+    `data` degerleri base64 cozulur, `stringData` oldugu gibi alinir ve
+    ayni anahtar icin `data`nin onune gecer. Baslik ilk Secret'in adidir.
+    """
+    if not content.strip():
+        return ParsedImport(project_heading=None, pairs=[], skipped=0)
+    if content.lstrip().startswith("{"):
+        documents = [_load_json(content)]
+    else:
+        documents = _load_yaml_documents(content)
+
+    secrets = list(_iter_k8s_secrets(documents))
+    if not secrets:
+        raise ValueError("No Kubernetes Secret found in manifest")
+
+    heading: Optional[str] = None
+    values: Dict[str, str] = {}
+    skipped = 0
+    for secret in secrets:
+        metadata = secret.get("metadata") or {}
+        if heading is None and isinstance(metadata, dict):
+            heading = metadata.get("name") or None
+
+        for key, encoded in (secret.get("data") or {}).items():
+            try:
+                values[str(key)] = base64.b64decode(
+                    _scalar_to_str(encoded), validate=True
+                ).decode("utf-8")
+            except (binascii.Error, UnicodeDecodeError):
+                skipped += 1
+        for key, value in (secret.get("stringData") or {}).items():
+            values[str(key)] = _scalar_to_str(value)
+
+    pairs = [ImportPair(key=key, value=value) for key, value in values.items() if key.strip()]
+    skipped += len(values) - len(pairs)
+    return ParsedImport(project_heading=heading, pairs=pairs, skipped=skipped)
@@ -1,5 +1,9 @@
-from dataclasses import dataclass
-from typing import List, Optional
+import codecs
+from dataclasses import dataclass, field
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional
+
+
+PREVIEW_LIMIT = 50
 
 
 @dataclass
@@ -15,31 +19,139 @@ class ParsedImport:
     skipped: int
 
 
-def parse_txt_import(content: str) -> ParsedImport:
+@dataclass
+class ImportPreview:
     project_heading: Optional[str] = None
-    pairs: List[ImportPair] = []
-    skipped = 0
+    total_pairs: int = 0
+    skipped: int = 0
+    preview: List[ImportPair] = field(default_factory=list)
+
+
+class LineSplitter:
+    """Parca parca gelen byte'lari tam satirlara boler.
+
+    Yarim kalan satir ve yarim UTF-8 karakteri bir sonraki parcaya kadar
+    tamponda tutulur; bellek kullanimi en uzun satirla sinirlidir.
+    """
+
+    def __init__(self, encoding: str = "utf-8") -> None:
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._buffer = ""
+
+    def feed(self, chunk: bytes) -> List[str]:
+        self._buffer += self._decoder.decode(chunk)
+        lines = self._buffer.splitlines(keepends=True)
+        if lines and not lines[-1].endswith(("\n", "\r")):
+            self._buffer = lines.pop()
+        else:
+            self._buffer = ""
+        return [line.rstrip("\r\n") for line in lines]
+
+    def close(self) -> List[str]:
+        self._buffer += self._decoder.decode(b"", final=True)
+        rest, self._buffer = self._buffer, ""
+        return rest.splitlines()
+
+
+def iter_lines(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    splitter = LineSplitter(encoding)
+    for chunk in chunks:
+        yield from splitter.feed(chunk)
+    yield from splitter.close()
+
+
+async def aiter_lines(
+    chunks: AsyncIterable[bytes], encoding: str = "utf-8"
+) -> AsyncIterator[str]:
+    splitter = LineSplitter(encoding)
+    async for chunk in chunks:
+        for line in splitter.feed(chunk):
+            yield line
+    for line in splitter.close():
+        yield line
+
 
-    for raw_line in content.splitlines():
+class TxtImportScanner:
+    """TXT import satirlarini tek tek tarar.
+
+    Baslik (`[Proje]`) ve atlanan satir sayisi tarama ilerledikce guncellenir,
+    boylece ciftler biriktirilmeden uretilebilir.
+    """
+
+    def __init__(self) -> None:
+        self.project_heading: Optional[str] = None
+        self.skipped = 0
+
+    def scan_line(self, raw_line: str) -> Optional[ImportPair]:
         line = raw_line.strip()
         if not line or line.startswith("#"):
-            continue
+            return None
 
         if line.startswith("[") and line.endswith("]"):
-            project_heading = line[1:-1].strip() or None
-            continue
+            self.project_heading = line[1:-1].strip() or None
+            return None
 
         if "=" not in line:
-            skipped += 1
-            continue
+            self.skipped += 1
+            return None
 
         key, value = line.split("=", 1)
         key = key.strip()
         value = value.strip()
         if not key:
-            skipped += 1
-            continue
+            self.skipped += 1
+            return None
+
+        return ImportPair(key=key, value=value)
+
+    def scan(self, lines: Iterable[str]) -> Iterator[ImportPair]:
+        for line in lines:
+            pair = self.scan_line(line)
+            if pair is not None:
+                yield pair
+
+
+def parse_txt_import(content: str) -> ParsedImport:
+    scanner = TxtImportScanner()
+    pairs = list(scanner.scan(content.splitlines()))
+    return ParsedImport(
+        project_heading=scanner.project_heading, pairs=pairs, skipped=scanner.skipped
+    )
+
+
+class TxtPreviewBuilder:
+    """Satirlari tek geciste tarar; toplamlari sayar, yalnizca ilk `limit` ciftini saklar."""
+
+    def __init__(self, limit: int = PREVIEW_LIMIT) -> None:
+        self.limit = limit
+        self._scanner = TxtImportScanner()
+        self._result = ImportPreview()
+
+    def feed(self, line: str) -> None:
+        pair = self._scanner.scan_line(line)
+        if pair is None:
+            return
+        self._result.total_pairs += 1
+        if len(self._result.preview) < self.limit:
+            self._result.preview.append(pair)
+
+    def result(self) -> ImportPreview:
+        self._result.project_heading = self._scanner.project_heading
+        self._result.skipped = self._scanner.skipped
+        return self._result
+
+
+def preview_txt_import(lines: Iterable[str], limit: int = PREVIEW_LIMIT) -> ImportPreview:
+    builder = TxtPreviewBuilder(limit)
+    for line in lines:
+        builder.feed(line)
+    return builder.result()
 
-        pairs.append(ImportPair(key=key, value=value))
 
-    return ParsedImport(project_heading=project_heading, pairs=pairs, skipped=skipped)
+async def apreview_txt_import(
+    lines: AsyncIterable[str], limit: int = PREVIEW_LIMIT
+) -> ImportPreview:
+    builder = TxtPreviewBuilder(limit)
+    async for line in lines:
+        builder.feed(line)
+    return builder.result()
@@ -0,0 +1,169 @@
+"""Argon2 sifre hashleme/dogrulama icin sinirli process havuzu.
+
+Her islem onlarca ms CPU harcar; istek thread'inde yapildiginda GIL'i tutar ve
+login patlamalari ilgisiz istekleri bekletir. Havuz baslatildiginda islemler
+ayri process'lerde calisir, bekleyen is sayisi sinirlidir (dolunca 503).
+Havuz yoksa (testler, scriptler) islem cagiran thread'de yapilir.
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from time import perf_counter
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.core.metrics import LatencyMetrics
+from app.core.security import (
+    build_password_context,
+    get_password_hash,
+    password_cost_options,
+)
+from app.core.security import verify_password as _verify_inline
+
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Worker process tarafi
+# ---------------------------------------------------------------------------
+
+_worker_context: Optional[CryptContext] = None
+
+
+def _init_worker(options: Dict[str, int]) -> None:
+    global _worker_context
+    _worker_context = build_password_context(**options)
+
+
+def _worker_hash(password: str) -> str:
+    return _worker_context.hash(password)
+
+
+def _worker_verify(password: str, password_hash: str) -> bool:
+    return _worker_context.verify(password, password_hash)
+
+
+# ---------------------------------------------------------------------------
+# Metrikler
+# ---------------------------------------------------------------------------
+
+
+hashing_metrics = LatencyMetrics()
+
+
+def _timed(operation: str, func: Callable[..., Any], *args: Any) -> Any:
+    started = perf_counter()
+    try:
+        return func(*args)
+    finally:
+        hashing_metrics.record(operation, perf_counter() - started)
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Password service is busy, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+# ---------------------------------------------------------------------------
+# Havuz
+# ---------------------------------------------------------------------------
+
+
+class PasswordHasher:
+    """Hash/verify islerini process havuzuna gonderir.
+
+    Ayni anda en fazla `max_workers + max_pending` is kabul edilir; fazlasi
+    beklemeden reddedilir. Slot, is gercekten bittiginde (zaman asiminda da)
+    serbest kalir, boylece sinir asilmaz.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 2,
+        max_pending: int = 32,
+        timeout: float = 10.0,
+        cost_options: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        # fork, istek thread'leri calisirken guvenli degil
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(cost_options or password_cost_options(),),
+        )
+
+    def _run(self, operation: str, func: Callable[..., Any], *args: Any) -> Any:
+        if not self._slots.acquire(blocking=False):
+            hashing_metrics.record_rejected()
+            logger.warning("Sifre hashleme kuyrugu dolu; istek reddedildi")
+            raise _busy()
+        started = perf_counter()
+        try:
+            future = self._executor.submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            hashing_metrics.record_rejected()
+            raise _busy()
+        finally:
+            hashing_metrics.record(operation, perf_counter() - started)
+
+    def hash(self, password: str) -> str:
+        return self._run("hash", _worker_hash, password)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        return self._run("verify", _worker_verify, password, password_hash)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_hasher: Optional[PasswordHasher] = None
+
+
+def get_password_hasher() -> Optional[PasswordHasher]:
+    return _hasher
+
+
+def start_password_hasher(**options: Any) -> PasswordHasher:
+    global _hasher
+    stop_password_hasher()
+    _hasher = PasswordHasher(**options)
+    return _hasher
+
+
+def stop_password_hasher() -> None:
+    global _hasher
+    if _hasher is not None:
+        _hasher.shutdown()
+        _hasher = None
+
+
+def hash_password(password: str) -> str:
+    hasher = _hasher
+    if hasher is None:
+        return _timed("hash", get_password_hash, password)
+    return hasher.hash(password)
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    hasher = _hasher
+    if hasher is None:
+        return _timed("verify", _verify_inline, password, password_hash)
+    return hasher.verify(password, password_hash)
@@ -8,7 +8,6 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.core.security import get_password_hash
 from app.db.models import (
     AuditEvent,
     Environment,
@@ -26,6 +25,7 @@ from app.schemas.auth import (
     RegisterPurposeEnum,
     RegisterRequest,
 )
+from app.services.password_hasher import hash_password
 from app.services.supabase_auth import create_supabase_user
 
 
@@ -246,7 +246,7 @@ def register_with_profile(db: Session, payload: RegisterRequest) -> RegisterOut:
                 # Eski lokal kayit: Supabase'den silinmis, tekrar kayit oluyor
                 # FK iliskileri korunur, sadece auth bilgileri guncellenir
                 existing.supabase_user_id = supabase_user_id
-                existing.password_hash = get_password_hash(payload.password)
+                existing.password_hash = hash_password(payload.password)
                 existing.display_name = display_name
                 existing.is_active = True
                 db.add(existing)
@@ -259,7 +259,7 @@ def register_with_profile(db: Session, payload: RegisterRequest) -> RegisterOut:
         existing = get_user_by_email(db, email)
         if existing:
             if not existing.is_active:
-                existing.password_hash = get_password_hash(payload.password)
+                existing.password_hash = hash_password(payload.password)
                 existing.display_name = display_name
                 existing.is_active = True
                 db.add(existing)
@@ -288,7 +288,7 @@ def register_with_profile(db: Session, payload: RegisterRequest) -> RegisterOut:
             email=email,
             display_name=display_name,
             role=user_role,
-            password_hash=get_password_hash(payload.password),
+            password_hash=hash_password(payload.password),
             is_active=True,
         )
         db.add(user)
@@ -0,0 +1,145 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Dict, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.models import Environment, EnvironmentEnum, Project, ServiceToken
+
+
+_CHANGED_KEY = "service_token_cache_changed"
+# `_CHANGED_KEY` kumesinde "tum cache'i bosalt" isareti
+_ALL = "*"
+
+
+@dataclass(frozen=True)
+class ServiceTokenScope:
+    """Dogrulanmis bir servis token'inin projesi ve proje ortamlarinin id'leri."""
+
+    token_id: UUID
+    project_id: UUID
+    project_slug: str
+    environment_ids: Dict[EnvironmentEnum, UUID] = field(default_factory=dict)
+
+
+class ServiceTokenCache:
+    """Token hash'i -> `ServiceTokenScope` icin process ici LRU cache.
+
+    Iptal edilen token'lar commit sonrasi cikarilir; TTL baska process'te
+    yapilan iptaller icin ust sinirdir. Ayrica token basina son
+    `last_used_at` yazim zamanini tutarak bu yazimlari seyreltir.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 30.0,
+        max_entries: int = 1024,
+        touch_interval_seconds: float = 60.0,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.touch_interval_seconds = touch_interval_seconds
+        self._entries: "OrderedDict[str, Tuple[float, ServiceTokenScope]]" = OrderedDict()
+        self._touched: Dict[UUID, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token_hash: str) -> Optional[ServiceTokenScope]:
+        with self._lock:
+            entry = self._entries.get(token_hash)
+            if entry is None:
+                return None
+            if entry[0] <= monotonic():
+                del self._entries[token_hash]
+                return None
+            self._entries.move_to_end(token_hash)
+            return entry[1]
+
+    def put(self, token_hash: str, scope: ServiceTokenScope) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[token_hash] = (monotonic() + self.ttl_seconds, scope)
+            self._entries.move_to_end(token_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_tokens(self, token_ids: Set[UUID]) -> None:
+        with self._lock:
+            for token_hash in [
+                key for key, (_, scope) in self._entries.items() if scope.token_id in token_ids
+            ]:
+                del self._entries[token_hash]
+
+    def should_touch(self, token_id: UUID) -> bool:
+        """`last_used_at` yazilmali mi; evetse bu an son yazim olarak kaydedilir."""
+        now = monotonic()
+        with self._lock:
+            last = self._touched.get(token_id)
+            if last is not None and now - last < self.touch_interval_seconds:
+                return False
+            if len(self._touched) >= self.max_entries:
+                self._touched.clear()
+            self._touched[token_id] = now
+            return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._touched.clear()
+
+
+def _build_service_token_cache() -> ServiceTokenCache:
+    settings = get_settings()
+    return ServiceTokenCache(
+        ttl_seconds=settings.SERVICE_TOKEN_CACHE_TTL_SECONDS,
+        max_entries=settings.SERVICE_TOKEN_CACHE_MAX_ENTRIES,
+        touch_interval_seconds=settings.SERVICE_TOKEN_TOUCH_INTERVAL_SECONDS,
+    )
+
+
+service_token_cache = _build_service_token_cache()
+
+
+# ---------------------------------------------------------------------------
+# Yazma tabanli invalidation (commit sonrasi)
+# ---------------------------------------------------------------------------
+
+
+@event.listens_for(Session, "after_flush")
+def _track_token_changes(session: Session, flush_context) -> None:
+    changed: Set = session.info.setdefault(_CHANGED_KEY, set())
+    for instance in session.dirty:
+        if isinstance(instance, ServiceToken) and inspect(instance).attrs[
+            "revoked_at"
+        ].history.has_changes():
+            changed.add(instance.id)
+    for instance in (*session.new, *session.deleted):
+        if isinstance(instance, (Project, Environment)):
+            changed.add(_ALL)
+    for instance in session.deleted:
+        if isinstance(instance, ServiceToken):
+            changed.add(instance.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if not changed:
+        return
+    if _ALL in changed:
+        service_token_cache.clear()
+    else:
+        service_token_cache.invalidate_tokens(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_after_rollback(session: Session) -> None:
+    session.info.pop(_CHANGED_KEY, None)
@@ -7,10 +7,10 @@ from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.core.security import get_password_hash
 from app.db.models import User
 from app.db.models.enums import RoleEnum
 from app.db.repositories.users_repo import get_user_by_email, get_user_by_supabase_user_id
+from app.services.password_hasher import hash_password
 
 
 def _extract_error_message(response: httpx.Response) -> str:
@@ -311,7 +311,7 @@ def resolve_user_from_supabase_token(db: Session, access_token: str):
             email=email,
             display_name=display_name,
             role=RoleEnum(settings.SUPABASE_DEFAULT_ROLE),
-            password_hash=get_password_hash(secrets.token_urlsafe(48)),
+            password_hash=hash_password(secrets.token_urlsafe(48)),
             is_active=True,
         )
         db.add(user)
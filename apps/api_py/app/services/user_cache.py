@@ -0,0 +1,134 @@
+import copy
+import threading
+from time import monotonic
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import get_settings
+from app.db.models import User
+
+
+# Bu alanlardan biri degisince kullanicinin mevcut access token'lari gecersizlesir
+_REVOKING_FIELDS = ("password_hash", "role", "is_active")
+_CHANGED_KEY = "user_cache_changed"
+
+
+class UserCache:
+    """`get_current_user` icin process ici, TTL'li kullanici cache'i.
+
+    Kolon degerleri saklanir; `get` her cagrida yeni bir detached `User`
+    dondurur, istekte `db.merge(..., load=False)` ile sorgusuz baglanir.
+    Token nesli artan kullanicilar icin asgari nesil, access token omru
+    boyunca hatirlanir (claim'lere guvenilen yolda erken iptal icin).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 30.0,
+        revocation_ttl_seconds: float = 1800.0,
+        max_entries: int = 10000,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.revocation_ttl_seconds = revocation_ttl_seconds
+        self.max_entries = max_entries
+        self._users: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._min_generations: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> Optional[User]:
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= monotonic():
+                del self._users[user_id]
+                return None
+            values = entry[1]
+        # preferences gibi degisebilir alanlar istekler arasinda paylasilmaz
+        snapshot = User(**copy.deepcopy(values))
+        make_transient_to_detached(snapshot)
+        return snapshot
+
+    def put(self, user: User) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        values = {
+            attr.key: copy.deepcopy(getattr(user, attr.key))
+            for attr in inspect(User).column_attrs
+        }
+        with self._lock:
+            if len(self._users) >= self.max_entries:
+                self._users.clear()
+            self._users[str(user.id)] = (monotonic() + self.ttl_seconds, values)
+
+    def invalidate(self, user_id: str, *, min_generation: Optional[int] = None) -> None:
+        with self._lock:
+            self._users.pop(user_id, None)
+            if min_generation is not None:
+                if len(self._min_generations) >= self.max_entries:
+                    self._min_generations.clear()
+                self._min_generations[user_id] = (
+                    monotonic() + self.revocation_ttl_seconds,
+                    min_generation,
+                )
+
+    def min_generation(self, user_id: str) -> int:
+        with self._lock:
+            entry = self._min_generations.get(user_id)
+            if entry is None:
+                return 0
+            if entry[0] <= monotonic():
+                del self._min_generations[user_id]
+                return 0
+            return entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+            self._min_generations.clear()
+
+
+def _build_user_cache() -> UserCache:
+    settings = get_settings()
+    return UserCache(
+        ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+        revocation_ttl_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
+
+
+user_cache = _build_user_cache()
+
+
+# ---------------------------------------------------------------------------
+# Yazma tabanli invalidation ve token nesli
+# ---------------------------------------------------------------------------
+
+
+@event.listens_for(Session, "before_flush")
+def _track_user_changes(session: Session, flush_context, instances) -> None:
+    changed: Dict[str, Optional[int]] = session.info.setdefault(_CHANGED_KEY, {})
+    for user in session.dirty:
+        if not isinstance(user, User):
+            continue
+        attrs = inspect(user).attrs
+        if any(attrs[name].history.has_changes() for name in _REVOKING_FIELDS):
+            user.token_generation = (user.token_generation or 0) + 1
+            changed[str(user.id)] = user.token_generation
+        else:
+            changed.setdefault(str(user.id), None)
+    for user in session.deleted:
+        if isinstance(user, User):
+            changed.setdefault(str(user.id), None)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for user_id, generation in session.info.pop(_CHANGED_KEY, {}).items():
+        user_cache.invalidate(user_id, min_generation=generation)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_after_rollback(session: Session) -> None:
+    session.info.pop(_CHANGED_KEY, None)
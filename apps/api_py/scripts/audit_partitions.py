@@ -0,0 +1,46 @@
+"""audit_events partisyon bakimi (cron ile ayda en az bir kez calistirilmali).
+
+Kullanim:
+  python scripts/audit_partitions.py ensure   # ileri aylarin partisyonlarini acar
+  python scripts/audit_partitions.py archive  # saklama suresi dolanlari arsivler
+  python scripts/audit_partitions.py          # ikisi birden
+"""
+
+import sys
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal, set_statement_timeout
+from app.services.audit_partitions import apply_audit_retention, ensure_audit_partitions
+
+
+def run() -> None:
+    command = sys.argv[1] if len(sys.argv) > 1 else "all"
+    if command not in {"ensure", "archive", "all"}:
+        raise SystemExit(__doc__)
+
+    settings = get_settings()
+    db = SessionLocal()
+    # Bakim islemleri istek statement_timeout'una tabi degildir
+    set_statement_timeout(db, 0)
+    try:
+        if command in {"ensure", "all"}:
+            created = ensure_audit_partitions(
+                db, months_ahead=settings.AUDIT_PARTITION_MONTHS_AHEAD
+            )
+            print(f"Olusturulan partisyonlar: {', '.join(created) or '-'}")
+        if command in {"archive", "all"}:
+            archived = apply_audit_retention(
+                db,
+                retention_months=settings.AUDIT_RETENTION_MONTHS,
+                archive_dir=settings.AUDIT_ARCHIVE_DIR,
+            )
+            for item in archived:
+                print(f"Arsivlendi: {item.name} ({item.rows} satir) -> {item.path}")
+            if not archived:
+                print("Arsivlenecek partisyon yok")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,17 @@
+from app.db.repositories.domain_repo import backfill_last_copied_at
+from app.db.session import SessionLocal, set_statement_timeout
+
+
+def run() -> None:
+    db = SessionLocal()
+    # Bakim islemleri istek statement_timeout'una tabi degildir
+    set_statement_timeout(db, 0)
+    try:
+        updated = backfill_last_copied_at(db)
+        print(f"Son kopyalanma tarihi yazilan secret sayisi: {updated}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    run()
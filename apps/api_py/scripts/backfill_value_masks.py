@@ -0,0 +1,17 @@
+from app.db.repositories.domain_repo import backfill_value_masks
+from app.db.session import SessionLocal, set_statement_timeout
+
+
+def run() -> None:
+    db = SessionLocal()
+    # Bakim islemleri istek statement_timeout'una tabi degildir
+    set_statement_timeout(db, 0)
+    try:
+        updated = backfill_value_masks(db)
+        print(f"Maskelenmis onizleme yazilan satir sayisi: {updated}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,123 @@
+"""Yuk altinda senkron (threadpool + Session) vs async (AsyncSession) route'lar.
+
+Ayni uclar iki ayri uygulamada, uygulama ici ASGI transport ile ayni
+eszamanlilikta cagrilir; ag maliyeti olcume girmez. `.env`'deki
+DATABASE_URL'i (tercihen seed_dev ile doldurulmus PostgreSQL) kullanir.
+
+Kullanim:
+  python scripts/bench_async_routes.py --email admin@example.com \\
+      [--path /search?q=api] [--concurrency 50] [--requests 2000] \\
+      [--service-token srv_... --project apollo-api]
+"""
+
+import argparse
+import asyncio
+from time import perf_counter
+from typing import Dict, List
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import select
+
+from app.api.routes import async_reads, dashboard, search, secrets, service_access
+from app.core.security import create_access_token
+from app.db.async_session import dispose_async_engine
+from app.db.models import User
+from app.db.session import SessionLocal
+
+
+def _sync_app() -> FastAPI:
+    app = FastAPI()
+    for module in (secrets, search, service_access, dashboard):
+        app.include_router(module.router)
+    return app
+
+
+def _async_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(async_reads.router)
+    return app
+
+
+async def _load(app: FastAPI, path: str, headers: Dict, concurrency: int, total: int) -> Dict:
+    latencies: List[float] = []
+    errors = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            while not queue.empty():
+                queue.get_nowait()
+                started = perf_counter()
+                response = await client.get(path, headers=headers)
+                latencies.append(perf_counter() - started)
+                if response.status_code != 200:
+                    errors += 1
+
+        # Isinma: baglanti havuzlari ve cache'ler
+        await client.get(path, headers=headers)
+        started = perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": latencies[len(latencies) // 2] * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+async def _run(args: argparse.Namespace) -> None:
+    with SessionLocal() as db:
+        user = db.scalar(select(User).where(User.email == args.email))
+    if user is None:
+        raise SystemExit(f"Kullanici bulunamadi: {args.email}")
+
+    token = create_access_token(
+        str(user.id), user.role.value, user.email, user.token_generation
+    )
+    scenarios = [
+        (args.path, {"Authorization": f"Bearer {token}"}),
+        ("/dashboard/stats", {"Authorization": f"Bearer {token}"}),
+    ]
+    if args.service_token and args.project:
+        scenarios.append(
+            (
+                f"/service-access/projects/{args.project}/exports?env=dev&format=json",
+                {"X-Service-Token": args.service_token},
+            )
+        )
+
+    print(f"eszamanlilik={args.concurrency}, istek={args.requests}")
+    for path, headers in scenarios:
+        print(path)
+        for label, app in (("sync", _sync_app()), ("async", _async_app())):
+            result = await _load(app, path, headers, args.concurrency, args.requests)
+            print(
+                f"  {label:<6} {result['rps']:9,.0f} istek/sn  "
+                f"p50 {result['p50']:7.1f} ms  p95 {result['p95']:7.1f} ms  "
+                f"hata {result['errors']}"
+            )
+    await dispose_async_engine()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--path", default="/search?q=api")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--service-token")
+    parser.add_argument("--project")
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
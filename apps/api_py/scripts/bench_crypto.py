@@ -0,0 +1,59 @@
+"""Secret sifreleme maliyeti: her cagrida cipher kurulumu vs cache'lenmis cipher.
+
+Kullanim: python scripts/bench_crypto.py [deger_sayisi]
+"""
+
+import base64
+import os
+import sys
+import timeit
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET_KEY", "bench-jwt-secret-key-that-is-at-least-32-chars")
+os.environ.setdefault(
+    "SECRET_ENCRYPTION_KEY", base64.urlsafe_b64encode(os.urandom(32)).decode()
+)
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM  # noqa: E402
+
+from app.core.crypto import (  # noqa: E402
+    NONCE_SIZE,
+    _get_key,
+    decrypt_many,
+    decrypt_secret_value,
+    encrypt_many,
+)
+
+
+def _legacy_decrypt(payload: bytes) -> str:
+    # Onceki davranis: her deger icin settings + base64 + AESGCM kurulumu
+    aesgcm = AESGCM(_get_key())
+    return aesgcm.decrypt(payload[:NONCE_SIZE], payload[NONCE_SIZE:], None).decode("utf-8")
+
+
+def _per_value_us(func, payloads, repeat: int = 5) -> float:
+    best = min(timeit.repeat(lambda: func(payloads), number=1, repeat=repeat))
+    return best / len(payloads) * 1_000_000
+
+
+def run() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    payloads = encrypt_many(f"sk_live_{index:06d}_abcdefghijklmnop" for index in range(count))
+
+    results = {
+        "legacy (per-call AESGCM)": _per_value_us(
+            lambda items: [_legacy_decrypt(item) for item in items], payloads
+        ),
+        "cached decrypt_secret_value": _per_value_us(
+            lambda items: [decrypt_secret_value(item) for item in items], payloads
+        ),
+        "decrypt_many": _per_value_us(decrypt_many, payloads),
+    }
+
+    print(f"{count} deger, deger basina sure:")
+    for label, micros in results.items():
+        print(f"  {label:<30} {micros:8.2f} us")
+
+
+if __name__ == "__main__":
+    run()
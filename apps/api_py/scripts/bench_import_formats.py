@@ -0,0 +1,54 @@
+"""Import formatlarinin parse hizi (anahtar/saniye).
+
+Kullanim: python scripts/bench_import_formats.py [anahtar_sayisi]
+"""
+
+import base64
+import json
+import sys
+import timeit
+
+from app.services import import_formats
+from app.services.import_formats import parse_import
+
+
+def _build_inputs(count: int) -> dict:
+    keys = [f"SERVICE_{index:06d}_API_KEY" for index in range(count)]
+    values = [f"sk_live_{index:06d}_abcdefghijklmnop" for index in range(count)]
+
+    nested: dict = {}
+    for index, (k, v) in enumerate(zip(keys, values)):
+        nested.setdefault(f"group_{index % 100}", {})[k] = v
+
+    inputs = {
+        "txt": "[Bench]\n" + "".join(f"{k}={v}\n" for k, v in zip(keys, values)),
+        "dotenv": "".join(
+            f'export {k}="{v}"\n' if index % 2 else f"{k}={v} # yorum\n"
+            for index, (k, v) in enumerate(zip(keys, values))
+        ),
+        "json": json.dumps(nested),
+    }
+    if import_formats.yaml is not None:
+        inputs["yaml"] = "".join(f"{k}: {v}\n" for k, v in zip(keys, values))
+        inputs["k8s"] = (
+            "apiVersion: v1\nkind: Secret\nmetadata:\n  name: bench\ndata:\n"
+            + "".join(
+                f"  {k}: {base64.b64encode(v.encode('utf-8')).decode('ascii')}\n"
+                for k, v in zip(keys, values)
+            )
+        )
+    return inputs
+
+
+def run() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    inputs = _build_inputs(count)
+
+    print(f"{count} anahtar:")
+    for fmt, content in inputs.items():
+        best = min(timeit.repeat(lambda: parse_import(content, fmt), number=1, repeat=3))
+        print(f"  {fmt:<8} {best * 1000:9.1f} ms  {count / best:12,.0f} anahtar/s")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,76 @@
+"""JWT imzalama/dogrulama hizi: python-jose (eski yol) vs TokenService.
+
+Kullanim: python scripts/bench_jwt.py [token_sayisi]
+"""
+
+import base64
+import os
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET_KEY", "bench-jwt-secret-key-that-is-at-least-32-chars")
+os.environ.setdefault(
+    "SECRET_ENCRYPTION_KEY", base64.urlsafe_b64encode(os.urandom(32)).decode()
+)
+
+from jose import jwt  # noqa: E402
+
+from app.core.config import get_settings  # noqa: E402
+from app.core.security import create_access_token, decode_token  # noqa: E402
+
+
+def _legacy_encode(index: int) -> str:
+    # Onceki davranis: her cagrida settings okunur, jose anahtari yeniden hazirlar
+    settings = get_settings()
+    payload = {
+        "sub": str(uuid.UUID(int=index)),
+        "role": "member",
+        "email": f"user{index}@example.com",
+        "type": "access",
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=30),
+        "jti": uuid.uuid4().hex,
+    }
+    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+
+def _legacy_decode(token: str):
+    settings = get_settings()
+    return jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+
+
+def _tokens_per_second(func, items, repeat: int = 5) -> float:
+    best = min(timeit.repeat(lambda: [func(item) for item in items], number=1, repeat=repeat))
+    return len(items) / best
+
+
+def run() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    indexes = list(range(count))
+    legacy_tokens = [_legacy_encode(index) for index in indexes]
+    tokens = [
+        create_access_token(str(uuid.UUID(int=index)), "member", f"user{index}@example.com")
+        for index in indexes
+    ]
+
+    results = {
+        "jose encode": _tokens_per_second(_legacy_encode, indexes),
+        "TokenService encode": _tokens_per_second(
+            lambda index: create_access_token(
+                str(uuid.UUID(int=index)), "member", f"user{index}@example.com"
+            ),
+            indexes,
+        ),
+        "jose decode": _tokens_per_second(_legacy_decode, legacy_tokens),
+        "TokenService decode": _tokens_per_second(decode_token, tokens),
+    }
+
+    print(f"{count} token, saniyede token:")
+    for label, rate in results.items():
+        print(f"  {label:<22} {rate:12,.0f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,17 @@
+from app.db.repositories.domain_repo import rebuild_secret_counters
+from app.db.session import SessionLocal, set_statement_timeout
+
+
+def run() -> None:
+    db = SessionLocal()
+    # Bakim islemleri istek statement_timeout'una tabi degildir
+    set_statement_timeout(db, 0)
+    try:
+        rows = rebuild_secret_counters(db)
+        print(f"Yeniden hesaplanan sayac satiri: {rows}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    run()
@@ -13,6 +13,7 @@ from app.db.models import (
     SecretTag,
     User,
 )
+from app.db.repositories.domain_repo import mask_value, rebuild_secret_counters
 from app.db.session import SessionLocal
 
 
@@ -174,6 +175,7 @@ def run():
                 type=stype,
                 key_name=key_name,
                 value_encrypted=encrypt_secret_value(value),
+                value_masked=mask_value(value),
                 key_version=1,
                 created_by=admin.id,
                 updated_by=admin.id,
@@ -220,6 +222,7 @@ def run():
         )
 
         db.commit()
+        rebuild_secret_counters(db)
         print("Seed completed")
     finally:
         db.close()
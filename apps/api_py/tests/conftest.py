@@ -24,6 +24,10 @@ os.environ["SECRET_ENCRYPTION_KEY"] = _test_encryption_key
 os.environ["APP_ENV"] = "test"
 os.environ["SUPABASE_AUTH_ENABLED"] = "false"
 os.environ["SUPABASE_AUTO_PROVISION_USERS"] = "false"
+# Audit kayitlari testlerde senkron yazilir (sink testleri kendi ornegini kurar)
+os.environ["AUDIT_ASYNC_ENABLED"] = "false"
+# Sifreler cagiran thread'de hashlenir (havuz testleri kendi ornegini kurar)
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
 
 # --- Simdi guvenle import edebiliriz ---
 from app.core.config import get_settings  # noqa: E402
@@ -39,6 +43,8 @@ from app.db.models import (  # noqa: E402
     User,
 )
 from app.main import app  # noqa: E402
+from app.services.service_token_cache import service_token_cache  # noqa: E402
+from app.services.user_cache import user_cache  # noqa: E402
 
 # lru_cache temizle ki test settings kullanilsin
 get_settings.cache_clear()
@@ -56,6 +62,21 @@ def _compile_jsonb_sqlite(element, compiler, **kw):
     return "JSON"
 
 
+# ---------------------------------------------------------------------------
+# SQLite uyumu: now() -> mikro saniyeli zaman damgasi
+# ---------------------------------------------------------------------------
+# CURRENT_TIMESTAMP saniye hassasiyetinde yazilir; SQLAlchemy ise DateTime
+# parametrelerini mikro saniyeyle bind eder. Keyset karsilastirmalarinin
+# PostgreSQL'deki gibi calismasi icin ayni formati kullan.
+
+from sqlalchemy.sql.functions import now as _sql_now  # noqa: E402
+
+
+@compiles(_sql_now, "sqlite")
+def _compile_now_sqlite(element, compiler, **kw):
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
 # ---------------------------------------------------------------------------
 # SQLite uyumu: Uuid -> CHAR(32) olarak sakla (native_uuid=False)
 # ---------------------------------------------------------------------------
@@ -171,6 +192,8 @@ def _create_tables():
 def _clean_tables():
     """Her testten sonra tum tablolari temizle."""
     yield
+    user_cache.clear()
+    service_token_cache.clear()
     db = TestSession()
     try:
         for table in reversed(Base.metadata.sorted_tables):
@@ -0,0 +1,250 @@
+"""AsyncSession repository fonksiyonlari ve async route testleri.
+
+Async motor in-memory test DB'sini paylasamadigi icin bu testler gecici bir
+SQLite dosyasi kullanir: veri senkron oturumla yazilir, async route'lar
+ayni dosyayi aiosqlite ile okur.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, select  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from tests.conftest import _assign_member, _auth_header, _make_project, _make_user  # noqa: E402
+
+from app.api.deps import get_async_db_session  # noqa: E402
+from app.api.routes import async_reads  # noqa: E402
+from app.api.streaming import export_response  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.db import async_session  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.models import AuditEvent, RoleEnum, ServiceToken  # noqa: E402
+from app.db.repositories import async_repo  # noqa: E402
+from app.db.repositories.domain_repo import (  # noqa: E402
+    create_secret,
+    create_service_token_for_admin,
+    list_secrets,
+)
+
+
+@pytest.fixture()
+def file_db(tmp_path):
+    url = f"sqlite:///{tmp_path / 'async.sqlite3'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    async_engine = create_async_engine(
+        async_session.async_database_url(url), poolclass=NullPool
+    )
+    sessions = async_sessionmaker(
+        async_engine,
+        sync_session_class=async_session.AsyncBackedSession,
+        expire_on_commit=False,
+    )
+    try:
+        yield sessionmaker(bind=sync_engine), sessions
+    finally:
+        asyncio.run(async_engine.dispose())
+        sync_engine.dispose()
+
+
+@pytest.fixture()
+def seeded(file_db):
+    SyncSession, _ = file_db
+    db = SyncSession()
+    try:
+        user = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        outsider = _make_user(db, email="outsider@test.com", role=RoleEnum.member)
+        project = _make_project(db, slug="apollo-api", created_by=user.id)
+        _assign_member(db, project_id=project.id, user_id=user.id)
+        for index in range(5):
+            create_secret(
+                db,
+                str(user.id),
+                "apollo-api",
+                {
+                    "name": f"Key {index}",
+                    "provider": "openai",
+                    "type": "key",
+                    "environment": "dev",
+                    "keyName": f"KEY_{index}",
+                    "value": f"value-{index}",
+                    "tags": ["backend"] if index % 2 else [],
+                    "notes": "not" if index == 0 else "",
+                },
+            )
+        token = create_service_token_for_admin(
+            db, user_id=str(user.id), project_id=str(project.id), name="ci"
+        )
+        return {
+            "user_id": str(user.id),
+            "token": create_access_token(str(user.id), "admin", user.email),
+            "outsider_token": create_access_token(
+                str(outsider.id), "member", outsider.email
+            ),
+            "service_token": token["token"],
+            "expected": list_secrets(db, str(user.id), project_slug="apollo-api"),
+        }
+    finally:
+        db.close()
+
+
+@pytest.fixture()
+def async_client(file_db, seeded):
+    _, sessions = file_db
+
+    async def _override():
+        async with sessions() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(async_reads.router)
+    app.dependency_overrides[get_async_db_session] = _override
+    with TestClient(app) as client:
+        yield client
+
+
+class TestAsyncRepository:
+    def test_secret_listesi_senkron_ile_ayni(self, file_db, seeded):
+        _, sessions = file_db
+
+        async def run():
+            async with sessions() as db:
+                items = await async_repo.list_secrets(
+                    db, seeded["user_id"], project_slug="apollo-api"
+                )
+                page, cursor = await async_repo.list_secrets_page(
+                    db, seeded["user_id"], limit=2, project_slug="apollo-api"
+                )
+                streamed = [
+                    item
+                    async for item in async_repo.iter_secrets(
+                        db, seeded["user_id"], batch_size=2, project_slug="apollo-api"
+                    )
+                ]
+                return items, page, cursor, streamed
+
+        items, page, cursor, streamed = asyncio.run(run())
+
+        assert items == seeded["expected"]
+        assert page == seeded["expected"][:2]
+        assert cursor is not None
+        assert streamed == seeded["expected"]
+
+    def test_servis_token_exportu_ve_last_used_at(self, file_db, seeded):
+        SyncSession, sessions = file_db
+
+        async def run(token):
+            async with sessions() as db:
+                return await async_repo.export_secrets_with_service_token(
+                    db, service_token=token, project_slug="apollo-api", environment="dev"
+                )
+
+        rows = asyncio.run(run(seeded["service_token"]))
+        assert [row["key_name"] for row in rows] == [f"KEY_{index}" for index in range(5)]
+        assert rows[0]["value_plain"] == "value-0"
+        assert asyncio.run(run("srv_gecersiz")) is None
+
+        with SyncSession() as db:
+            assert db.scalar(select(ServiceToken.last_used_at)) is not None
+
+
+class TestAsyncRoutes:
+    def test_secret_listesi_ve_arama(self, async_client, seeded):
+        headers = _auth_header(seeded["token"])
+
+        resp = async_client.get("/projects/apollo-api/secrets", headers=headers)
+        assert resp.status_code == 200
+        assert [item["keyName"] for item in resp.json()] == [
+            item["keyName"] for item in seeded["expected"]
+        ]
+
+        search = async_client.get(
+            "/search", params={"q": "key", "tag": "backend"}, headers=headers
+        )
+        assert search.status_code == 200
+        assert sorted(item["keyName"] for item in search.json()) == ["KEY_1", "KEY_3"]
+
+        ndjson = async_client.get("/search", params={"format": "ndjson"}, headers=headers)
+        assert len(ndjson.text.strip().splitlines()) == 5
+
+        forbidden = async_client.get(
+            "/projects/apollo-api/secrets", headers=_auth_header(seeded["outsider_token"])
+        )
+        assert forbidden.status_code == 403
+
+    def test_servis_exportu_audit_yazar(self, async_client, seeded, file_db):
+        resp = async_client.get(
+            "/service-access/projects/apollo-api/exports",
+            params={"env": "dev", "format": "env"},
+            headers={"X-Service-Token": seeded["service_token"]},
+        )
+        assert resp.status_code == 200
+        assert resp.text.splitlines()[0] == "KEY_0=value-0"
+
+        not_modified = async_client.get(
+            "/service-access/projects/apollo-api/exports",
+            params={"env": "dev", "format": "env", "wait": 0.1},
+            headers={
+                "X-Service-Token": seeded["service_token"],
+                "If-None-Match": resp.headers["ETag"],
+            },
+        )
+        assert not_modified.status_code == 304
+
+        invalid = async_client.get(
+            "/service-access/projects/apollo-api/exports",
+            params={"env": "dev", "format": "env"},
+            headers={"X-Service-Token": "srv_gecersiz"},
+        )
+        assert invalid.status_code == 401
+
+        SyncSession, _ = file_db
+        with SyncSession() as db:
+            event = db.scalar(select(AuditEvent).where(AuditEvent.action == "service_exported"))
+        assert event.meta["count"] == 5
+
+    def test_dashboard_istatistikleri(self, async_client, seeded):
+        resp = async_client.get("/dashboard/stats", headers=_auth_header(seeded["token"]))
+
+        assert resp.status_code == 200
+        assert resp.json()["totalProjects"] == 1
+        assert "etag" in resp.headers
+
+
+class TestAsyncEngineUrl:
+    def test_surucu_async_karsiligina_cevrilir(self):
+        assert (
+            async_session.async_database_url("postgresql://u:p@localhost/db")
+            == "postgresql+psycopg://u:p@localhost/db"
+        )
+        assert (
+            async_session.async_database_url("postgresql+psycopg://u:p@localhost/db")
+            == "postgresql+psycopg://u:p@localhost/db"
+        )
+        assert async_session.async_database_url("sqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+class TestAsyncExportStream:
+    @pytest.mark.parametrize("format", ["env", "json", "ndjson"])
+    @pytest.mark.parametrize("count", [0, 3])
+    def test_async_satirlar_senkron_cikti_ile_ayni(self, format, count):
+        rows = [{"key_name": f"KEY_{i}", "value_plain": f"v\"{i}"} for i in range(count)]
+
+        async def async_rows():
+            for row in rows:
+                yield row
+
+        async def body(response):
+            chunks = [chunk async for chunk in response.body_iterator]
+            return "".join(c if isinstance(c, str) else c.decode() for c in chunks)
+
+        expected = asyncio.run(body(export_response(iter(rows), format)))
+        assert asyncio.run(body(export_response(async_rows(), format))) == expected
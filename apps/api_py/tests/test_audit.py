@@ -1,5 +1,8 @@
 """Audit log testleri."""
 
+import json
+import uuid
+
 from tests.conftest import (
     _assign_member,
     _auth_header,
@@ -9,6 +12,7 @@ from tests.conftest import (
 )
 
 from app.db.models.enums import RoleEnum
+from app.db.repositories.domain_repo import add_audit_event
 
 
 class TestAuditCopy:
@@ -61,6 +65,131 @@ class TestAuditCopy:
         assert resp.status_code == 403
 
 
+    def test_baska_projenin_secreti_icin_copy_404(self, client, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        member = _make_user(db, email="member@test.com", role=RoleEnum.member)
+        secret_project = _make_project(db, slug="gizli", name="Gizli", created_by=str(admin.id))
+        own_project = _make_project(db, slug="kendi", name="Kendi", created_by=str(admin.id))
+        _assign_member(db, project_id=secret_project.id, user_id=admin.id)
+        _assign_member(db, project_id=own_project.id, user_id=member.id, role=RoleEnum.member)
+        admin_token = _login(client, "admin@test.com")
+        secret = client.post(
+            "/projects/gizli/secrets",
+            json={
+                "name": "Key",
+                "provider": "AWS",
+                "type": "key",
+                "environment": "prod",
+                "keyName": "AWS_KEY",
+                "value": "secret",
+                "tags": [],
+                "notes": "",
+            },
+            headers=_auth_header(admin_token),
+        ).json()
+        member_token = _login(client, "member@test.com")
+
+        # Uye olunan projenin slug'i ile baska projenin secret'i hedeflenemez
+        resp = client.post(
+            "/audit/copy",
+            json={"projectId": "kendi", "secretId": secret["id"]},
+            headers=_auth_header(member_token),
+        )
+        assert resp.status_code == 404
+        missing = client.post(
+            "/audit/copy",
+            json={"secretId": secret["id"]},
+            headers=_auth_header(member_token),
+        )
+        assert missing.status_code == 422
+        invalid = client.post(
+            "/audit/copy",
+            json={"projectId": "kendi", "secretId": "fake-id"},
+            headers=_auth_header(member_token),
+        )
+        assert invalid.status_code == 400
+
+        listed = client.get("/projects/gizli/secrets", headers=_auth_header(admin_token)).json()
+        assert listed[0]["lastCopiedAt"] is None
+
+    def test_prod_okuma_yetkisi_olmadan_copy_404(self, client, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        member = _make_user(db, email="member@test.com", role=RoleEnum.member)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        _assign_member(
+            db, project_id=project.id, user_id=member.id, role=RoleEnum.member, grant_envs=False
+        )
+        admin_token = _login(client, "admin@test.com")
+        secret = client.post(
+            "/projects/proj/secrets",
+            json={
+                "name": "Key",
+                "provider": "AWS",
+                "type": "key",
+                "environment": "prod",
+                "keyName": "AWS_KEY",
+                "value": "secret",
+                "tags": [],
+                "notes": "",
+            },
+            headers=_auth_header(admin_token),
+        ).json()
+
+        resp = client.post(
+            "/audit/copy",
+            json={"projectId": "proj", "secretId": secret["id"]},
+            headers=_auth_header(_login(client, "member@test.com")),
+        )
+        assert resp.status_code == 404
+
+    def test_copy_last_copied_at_gunceller(self, client, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        token = _login(client, "admin@test.com")
+
+        created = client.post(
+            "/projects/proj/secrets",
+            json={
+                "name": "Key",
+                "provider": "AWS",
+                "type": "key",
+                "environment": "dev",
+                "keyName": "AWS_KEY",
+                "value": "secret",
+                "tags": [],
+                "notes": "",
+            },
+            headers=_auth_header(token),
+        ).json()
+        assert created["lastCopiedAt"] is None
+
+        client.post(
+            "/audit/copy",
+            json={"projectId": "proj", "secretId": created["id"]},
+            headers=_auth_header(token),
+        )
+
+        listed = client.get("/projects/proj/secrets", headers=_auth_header(token)).json()
+        assert listed[0]["lastCopiedAt"] is not None
+        # Kopyalama secret'in guncellenme zamanini degistirmez
+        assert listed[0]["updatedAt"] == created["updatedAt"]
+
+    def test_backfill_audit_kayitlarindan_doldurur(self, db):
+        from tests.test_secrets import _seed_secrets
+
+        from app.db.models import Secret
+        from app.db.repositories.domain_repo import backfill_last_copied_at
+
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _seed_secrets(db, project, admin, 3, copied=False)
+
+        assert backfill_last_copied_at(db) == 3
+        assert all(row.last_copied_at is not None for row in db.query(Secret).all())
+        assert backfill_last_copied_at(db) == 0
+
 class TestAuditList:
     def test_admin_audit_listeler(self, client, db):
         admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
@@ -159,3 +288,91 @@ class TestAuditList:
         events = audit_resp.json()
         assert len(events) >= 1
         assert events[0]["action"] == "secret_deleted"
+
+
+class TestAuditPagination:
+    def _seed_events(self, db, count=5):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        other = _make_user(db, email="other@test.com", role=RoleEnum.member)
+        _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        target_id = str(uuid.uuid4())
+        for index in range(count):
+            add_audit_event(
+                db,
+                actor_user_id=str(admin.id if index % 2 == 0 else other.id),
+                project_slug="proj",
+                action="secret_copied",
+                target_type="secret",
+                target_id=target_id if index == 0 else None,
+                metadata={"secretName": f"KEY_{index}", "reason": "rotation" if index < 2 else "debug"},
+            )
+        return admin, other, target_id
+
+    def test_cursor_ile_tum_sayfalar_gezilir(self, client, db):
+        self._seed_events(db, count=5)
+        token = _login(client, "admin@test.com")
+
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            url = "/audit?limit=2" + (f"&cursor={cursor}" if cursor else "")
+            resp = client.get(url, headers=_auth_header(token))
+            assert resp.status_code == 200
+            seen.extend(item["id"] for item in resp.json())
+            pages += 1
+            cursor = resp.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert pages == 3
+        assert len(seen) == len(set(seen)) == 5
+
+    def test_gecersiz_cursor_400(self, client, db):
+        _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        token = _login(client, "admin@test.com")
+
+        resp = client.get("/audit?cursor=bozuk", headers=_auth_header(token))
+        assert resp.status_code == 400
+
+    def test_actor_ve_target_filtresi(self, client, db):
+        admin, other, target_id = self._seed_events(db)
+        token = _login(client, "admin@test.com")
+
+        by_actor = client.get(f"/audit?actorId={other.id}", headers=_auth_header(token)).json()
+        assert len(by_actor) == 2
+        assert {item["actor"] for item in by_actor} == {"other@test.com"}
+        assert {item["actorId"] for item in by_actor} == {str(other.id)}
+
+        by_email = client.get("/audit?userEmail=other@test.com", headers=_auth_header(token))
+        assert [item["id"] for item in by_email.json()] == [item["id"] for item in by_actor]
+
+        by_target = client.get(f"/audit?targetId={target_id}", headers=_auth_header(token)).json()
+        assert [item["secretName"] for item in by_target] == ["KEY_0"]
+        assert by_target[0]["targetId"] == target_id
+
+        unknown = client.get("/audit?userEmail=yok@test.com", headers=_auth_header(token))
+        assert unknown.json() == []
+
+    def test_metadata_filtresi(self, client, db):
+        self._seed_events(db)
+        token = _login(client, "admin@test.com")
+
+        resp = client.get("/audit?meta=reason=rotation", headers=_auth_header(token))
+        assert sorted(item["secretName"] for item in resp.json()) == ["KEY_0", "KEY_1"]
+        assert all(item["metadata"]["reason"] == "rotation" for item in resp.json())
+
+        assert len(client.get("/audit?meta=reason", headers=_auth_header(token)).json()) == 5
+        assert client.get("/audit?meta=yok", headers=_auth_header(token)).json() == []
+        assert client.get("/audit?meta==x", headers=_auth_header(token)).status_code == 400
+
+    def test_ndjson_export_limitsiz_akar(self, client, db):
+        self._seed_events(db, count=5)
+        token = _login(client, "admin@test.com")
+
+        resp = client.get("/audit?format=ndjson&limit=1", headers=_auth_header(token))
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert len(lines) == 5
+        assert {line["action"] for line in lines} == {"secret_copied"}
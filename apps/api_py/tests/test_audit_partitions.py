@@ -0,0 +1,155 @@
+"""Audit partisyon bakimi ve partisyon eleyen sorgu testleri.
+
+`postgres` isaretli testler TEST_POSTGRES_URL ile verilen bos bir
+PostgreSQL veritabaninda, gecici bir semada calisir; yoksa atlanir.
+"""
+
+import os
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from tests.conftest import _assign_member, _auth_header, _login, _make_project, _make_user
+
+from app.db.models import AuditEvent
+from app.db.models.enums import RoleEnum
+from app.services.audit_partitions import (
+    add_months,
+    ensure_audit_partitions,
+    expired_partitions,
+    list_audit_partitions,
+    parse_partition_month,
+    partition_name,
+)
+
+
+@pytest.fixture()
+def pg_db():
+    url = os.environ.get("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL ayarli degil")
+    schema = f"audit_test_{uuid4().hex[:12]}"
+    engine = create_engine(url, connect_args={"options": f"-csearch_path={schema}"})
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+        conn.execute(
+            text(
+                "CREATE TABLE audit_events ("
+                "id uuid NOT NULL, project_id uuid, actor_user_id uuid, "
+                "action varchar(100) NOT NULL, target_type varchar(100) NOT NULL, "
+                "target_id uuid, metadata jsonb, "
+                "created_at timestamptz NOT NULL DEFAULT now(), "
+                "PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)"
+            )
+        )
+        conn.execute(text("CREATE TABLE audit_events_default PARTITION OF audit_events DEFAULT"))
+    try:
+        with Session(engine) as db:
+            yield db
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        engine.dispose()
+
+
+class TestPartitionHelpers:
+    def test_ay_aritmetigi_ve_adlandirma(self):
+        assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+        assert partition_name(date(2026, 3, 1)) == "audit_events_p202603"
+        assert parse_partition_month("audit_events_p202603") == date(2026, 3, 1)
+        assert parse_partition_month("audit_events_default") is None
+
+    def test_saklama_suresi_dolan_partisyonlar(self):
+        names = [
+            "audit_events_default",
+            "audit_events_p202611",
+            "audit_events_p202510",
+            "audit_events_p202509",
+            "audit_events_p202608",
+        ]
+        expired = expired_partitions(names, retention_months=12, today=date(2026, 10, 16))
+        # Ekim 2026 dahil son 12 ay: Kasim 2025 ve sonrasi saklanir
+        assert expired == ["audit_events_p202509", "audit_events_p202510"]
+        assert expired_partitions(names, retention_months=13, today=date(2026, 10, 16)) == [
+            "audit_events_p202509"
+        ]
+
+
+@pytest.mark.postgres
+class TestEnsureAuditPartitions:
+    def _insert(self, db, created_at: str) -> None:
+        db.execute(
+            text(
+                "INSERT INTO audit_events (id, action, target_type, created_at) "
+                "VALUES (:id, 'secret_copied', 'secret', :created_at)"
+            ),
+            {"id": uuid4(), "created_at": created_at},
+        )
+
+    def _count(self, db, table: str) -> int:
+        return db.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+
+    def test_default_partisyondaki_satirlar_yeni_aya_tasinir(self, pg_db):
+        # Bakim gecikmis: Ekim ve Kasim satirlari default partisyona dusmus
+        for created_at in ("2026-10-01T00:00:00Z", "2026-10-31T23:59:59Z", "2026-11-15T12:00:00Z"):
+            self._insert(pg_db, created_at)
+        self._insert(pg_db, "2027-06-01T00:00:00Z")
+        pg_db.commit()
+
+        created = ensure_audit_partitions(pg_db, months_ahead=3, today=date(2026, 10, 16))
+
+        assert created == [
+            "audit_events_p202610",
+            "audit_events_p202611",
+            "audit_events_p202612",
+            "audit_events_p202701",
+        ]
+        assert set(list_audit_partitions(pg_db)) == {"audit_events_default", *created}
+        assert self._count(pg_db, "audit_events_p202610") == 2
+        assert self._count(pg_db, "audit_events_p202611") == 1
+        # Aralik disindaki satir default'ta kalir, hicbir satir kaybolmaz
+        assert self._count(pg_db, "audit_events_default") == 1
+        assert self._count(pg_db, "audit_events") == 4
+
+        assert ensure_audit_partitions(pg_db, months_ahead=3, today=date(2026, 10, 16)) == []
+
+
+class TestDashboardRecentActivity:
+    def test_eski_olaylar_yeterli_yeni_olay_yoksa_gosterilir(self, client, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+
+        now = datetime.now(timezone.utc)
+        for index in range(3):
+            db.add(
+                AuditEvent(
+                    actor_user_id=admin.id,
+                    project_id=project.id,
+                    action="secret_copied",
+                    target_type="secret",
+                    meta={"secretName": f"OLD_{index}"},
+                    created_at=now - timedelta(days=120 + index),
+                )
+            )
+        db.add(
+            AuditEvent(
+                actor_user_id=admin.id,
+                project_id=project.id,
+                action="secret_copied",
+                target_type="secret",
+                meta={"secretName": "NEW"},
+                created_at=now,
+            )
+        )
+        db.commit()
+
+        token = _login(client, "admin@test.com")
+        resp = client.get("/dashboard/stats", headers=_auth_header(token))
+        assert resp.status_code == 200
+        names = [item["secretName"] for item in resp.json()["recentActivity"]]
+        assert names == ["NEW", "OLD_0", "OLD_1", "OLD_2"]
@@ -0,0 +1,199 @@
+"""Arka plan audit yazicisi testleri."""
+
+from sqlalchemy import event
+
+from tests.conftest import (
+    TEST_ENGINE,
+    TestSession,
+    _assign_member,
+    _auth_header,
+    _login,
+    _make_project,
+    _make_user,
+)
+
+from app.db.models import AuditEvent
+from app.db.models.enums import RoleEnum
+from app.db.repositories.domain_repo import add_audit_event
+from app.services import audit_sink
+
+
+def _audit_actions(db):
+    db.expire_all()
+    return sorted(row.action for row in db.query(AuditEvent).all())
+
+
+def _submit_actions(db, admin, actions):
+    for action in actions:
+        add_audit_event(
+            db,
+            actor_user_id=str(admin.id),
+            project_slug=None,
+            action=action,
+            target_type="secret",
+        )
+
+
+class TestAuditSink:
+    def test_kayitlar_toplu_yazilir(self, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+
+        sink = audit_sink.start_audit_sink(TestSession, flush_size=50, flush_interval=60)
+        inserts = []
+
+        def _before_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT INTO audit_events"):
+                inserts.append(statement)
+
+        event.listen(TEST_ENGINE, "before_cursor_execute", _before_execute)
+        try:
+            for index in range(10):
+                add_audit_event(
+                    db,
+                    actor_user_id=str(admin.id),
+                    project_slug="proj",
+                    action="secret_copied",
+                    target_type="secret",
+                    metadata={"index": index},
+                )
+            # Henuz flush araligi dolmadi: hicbir sey yazilmadi
+            assert _audit_actions(db) == []
+
+            assert sink.flush(timeout=5)
+        finally:
+            event.remove(TEST_ENGINE, "before_cursor_execute", _before_execute)
+            audit_sink.stop_audit_sink()
+
+        rows = db.query(AuditEvent).all()
+        assert len(rows) == 10
+        assert {row.project_id for row in rows} == {project.id}
+        assert len(inserts) == 1
+
+    def test_durable_aksiyon_senkron_yazilir(self, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        audit_sink.start_audit_sink(
+            TestSession, flush_interval=60, durable_actions=["secret_revealed"]
+        )
+        try:
+            add_audit_event(
+                db,
+                actor_user_id=str(admin.id),
+                project_slug=None,
+                action="secret_revealed",
+                target_type="secret",
+            )
+            add_audit_event(
+                db,
+                actor_user_id=str(admin.id),
+                project_slug=None,
+                action="secret_updated",
+                target_type="secret",
+                durable=True,
+            )
+            add_audit_event(
+                db,
+                actor_user_id=str(admin.id),
+                project_slug=None,
+                action="import_preview",
+                target_type="import",
+            )
+            assert _audit_actions(db) == ["secret_revealed", "secret_updated"]
+        finally:
+            # Kapanis kuyrukta kalan kaydi da yazar
+            audit_sink.stop_audit_sink()
+
+        assert _audit_actions(db) == ["import_preview", "secret_revealed", "secret_updated"]
+
+    def test_kuyruk_doluysa_senkron_yazilir(self, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        sink = audit_sink.AuditSink(TestSession, max_queue_size=1)
+        audit_sink._sink = sink  # thread baslatilmadan: kuyruk bosalmaz
+        try:
+            for _ in range(3):
+                add_audit_event(
+                    db,
+                    actor_user_id=str(admin.id),
+                    project_slug=None,
+                    action="secret_copied",
+                    target_type="secret",
+                )
+            assert len(_audit_actions(db)) == 2
+        finally:
+            audit_sink.stop_audit_sink()
+        assert len(_audit_actions(db)) == 3
+
+    def test_gecici_yazim_hatasinda_yeniden_denenir(self, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        sink = audit_sink.start_audit_sink(
+            TestSession, flush_size=50, flush_interval=60, retry_backoff=0
+        )
+        failures = [2]
+
+        def _fail_insert(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT INTO audit_events") and failures[0]:
+                failures[0] -= 1
+                raise RuntimeError("gecici hata")
+
+        event.listen(TEST_ENGINE, "before_cursor_execute", _fail_insert)
+        try:
+            _submit_actions(db, admin, ["secret_copied"] * 5)
+            assert sink.flush(timeout=5)
+        finally:
+            event.remove(TEST_ENGINE, "before_cursor_execute", _fail_insert)
+            audit_sink.stop_audit_sink()
+
+        assert failures == [0]
+        assert _audit_actions(db) == ["secret_copied"] * 5
+
+    def test_toplu_yazim_olmazsa_kayitlar_tek_tek_yazilir(self, db, caplog):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        sink = audit_sink.start_audit_sink(
+            TestSession, flush_size=50, flush_interval=60, write_retries=1, retry_backoff=0
+        )
+
+        def _reject_bad_row(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT INTO audit_events") and "bozuk" in str(parameters):
+                raise RuntimeError("hatali kayit")
+
+        event.listen(TEST_ENGINE, "before_cursor_execute", _reject_bad_row)
+        try:
+            _submit_actions(db, admin, ["secret_copied", "bozuk", "secret_updated"])
+            assert sink.flush(timeout=5)
+        finally:
+            event.remove(TEST_ENGINE, "before_cursor_execute", _reject_bad_row)
+            audit_sink.stop_audit_sink()
+
+        assert _audit_actions(db) == ["secret_copied", "secret_updated"]
+        assert any("bozuk" in record.getMessage() for record in caplog.records)
+
+    def test_copy_kuyruktayken_last_copied_at_commit_edilir(self, client, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        token = _login(client, "admin@test.com")
+        created = client.post(
+            "/projects/proj/secrets",
+            json={
+                "name": "Key",
+                "provider": "AWS",
+                "type": "key",
+                "environment": "dev",
+                "keyName": "AWS_KEY",
+                "value": "secret",
+            },
+            headers=_auth_header(token),
+        ).json()
+
+        audit_sink.start_audit_sink(TestSession, flush_interval=60)
+        try:
+            client.post(
+                "/audit/copy",
+                json={"projectId": "proj", "secretId": created["id"]},
+                headers=_auth_header(token),
+            )
+            listed = client.get("/projects/proj/secrets", headers=_auth_header(token))
+            assert listed.json()[0]["lastCopiedAt"] is not None
+        finally:
+            audit_sink.stop_audit_sink()
+        assert "secret_copied" in _audit_actions(db)
@@ -258,3 +258,75 @@ class TestTokensuzErisim:
     def test_tokensuz_audit(self, client):
         resp = client.get("/audit")
         assert resp.status_code in (401, 403)
+
+
+class TestAccessContext:
+    """AccessContext, modul seviyesindeki kontrollerle ayni sonucu bellekten verir."""
+
+    def test_sonuclar_tekil_kontrollerle_ayni(self, db):
+        from app.db.models.enums import EnvironmentEnum
+        from app.db.repositories import domain_repo
+
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        member = _make_user(db, email="member@test.com", role=RoleEnum.member)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _make_project(db, slug="diger", name="Diger", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        _assign_member(
+            db,
+            project_id=project.id,
+            user_id=member.id,
+            role=RoleEnum.member,
+            grant_envs=False,
+        )
+
+        for user in (admin, member):
+            access = domain_repo.AccessContext(db, str(user.id))
+            for slug in ("proj", "diger", "yok"):
+                assert access.has_project_access(slug) == domain_repo.has_project_access(
+                    db, str(user.id), slug
+                )
+                for env in list(EnvironmentEnum) + ["gecersiz"]:
+                    assert access.has_environment_read_access(
+                        slug, env
+                    ) == domain_repo.has_environment_read_access(
+                        db, str(user.id), slug, env
+                    )
+                    assert access.has_environment_export_access(
+                        slug, env
+                    ) == domain_repo.has_environment_export_access(
+                        db, str(user.id), slug, env
+                    )
+
+    def test_tekrar_eden_kontroller_sorgu_calistirmaz(self, db):
+        from sqlalchemy import event
+
+        from app.db.models.enums import EnvironmentEnum
+        from app.db.repositories.domain_repo import AccessContext
+        from tests.conftest import TEST_ENGINE
+
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+
+        project_id = project.id
+        statements = []
+
+        def _before_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        access = AccessContext(db, str(admin.id))
+        event.listen(TEST_ENGINE, "before_cursor_execute", _before_execute)
+        try:
+            assert access.has_project_access("proj")
+            loaded = len(statements)
+            for _ in range(3):
+                for env in EnvironmentEnum:
+                    assert access.has_environment_read_access("proj", env)
+                    assert access.has_environment_export_access("proj", env)
+                assert access.project_id("proj") == project_id
+        finally:
+            event.remove(TEST_ENGINE, "before_cursor_execute", _before_execute)
+
+        assert loaded == 2
+        assert len(statements) == loaded
@@ -0,0 +1,45 @@
+"""Secret sifreleme yardimcilari testleri."""
+
+import base64
+import os
+
+import pytest
+
+from app.core import crypto
+from app.core.config import get_settings
+
+
+class TestCipherCache:
+    def test_toplu_sifreleme_geri_cozulur(self):
+        values = ["sk_test_1", "", "çok-gizli-değer"]
+        payloads = crypto.encrypt_many(values)
+
+        assert len({p[: crypto.NONCE_SIZE] for p in payloads}) == len(values)
+        assert crypto.decrypt_many(payloads) == values
+        assert crypto.decrypt_secret_value(payloads[0]) == "sk_test_1"
+
+    def test_cipher_bir_kez_kurulur(self):
+        assert crypto._get_cipher() is crypto._get_cipher()
+
+    def test_anahtar_yenilenince_cipher_yeniden_kurulur(self, monkeypatch):
+        payload = crypto.encrypt_secret_value("eski-anahtar")
+        original = crypto._get_cipher()
+
+        monkeypatch.setenv(
+            "SECRET_ENCRYPTION_KEY", base64.urlsafe_b64encode(os.urandom(32)).decode()
+        )
+        get_settings.cache_clear()
+        try:
+            # Acik invalidasyon yapilmadan eski cipher kullanilmaya devam eder
+            assert crypto._get_cipher() is original
+
+            crypto.reload_encryption_key()
+            assert crypto._get_cipher() is not original
+            with pytest.raises(Exception):
+                crypto.decrypt_secret_value(payload)
+        finally:
+            monkeypatch.undo()
+            get_settings.cache_clear()
+            crypto.reload_encryption_key()
+
+        assert crypto.decrypt_secret_value(payload) == "eski-anahtar"
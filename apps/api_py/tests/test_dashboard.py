@@ -0,0 +1,130 @@
+"""Dashboard istatistik testleri."""
+
+from sqlalchemy import event
+
+from tests.conftest import (
+    TEST_ENGINE,
+    _assign_member,
+    _auth_header,
+    _login,
+    _make_project,
+    _make_user,
+)
+from tests.test_secrets import _seed_secrets
+
+from app.db.models.enums import RoleEnum
+
+
+def _count_queries(client, token, **headers):
+    statements = []
+
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        if "scoped_counters" in statement:
+            statements.append(statement)
+
+    event.listen(TEST_ENGINE, "before_cursor_execute", _before_execute)
+    try:
+        resp = client.get("/dashboard/stats", headers={**_auth_header(token), **headers})
+    finally:
+        event.remove(TEST_ENGINE, "before_cursor_execute", _before_execute)
+    return resp, len(statements)
+
+
+class TestDashboardStats:
+    def _seed(self, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        member = _make_user(db, email="member@test.com", role=RoleEnum.member)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        other = _make_project(db, slug="other", name="Diger", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        _assign_member(db, project_id=project.id, user_id=member.id)
+        _assign_member(db, project_id=other.id, user_id=admin.id)
+        _seed_secrets(db, project, admin, 2, env_name="dev")
+        _seed_secrets(db, project, admin, 1, env_name="prod")
+        _seed_secrets(db, other, admin, 4, env_name="dev")
+        return admin, member
+
+    def test_sayaclar_rol_kapsamina_gore(self, client, db):
+        self._seed(db)
+
+        admin_stats = client.get(
+            "/dashboard/stats", headers=_auth_header(_login(client, "admin@test.com"))
+        ).json()
+        assert admin_stats["totalSecrets"] == 7
+        assert admin_stats["totalProjects"] == 2
+        assert admin_stats["totalMembers"] == 2
+        assert admin_stats["secretsByEnvironment"] == {"dev": 6, "prod": 1}
+        assert admin_stats["secretsByProvider"] == {"AWS": 7}
+
+        member_stats = client.get(
+            "/dashboard/stats", headers=_auth_header(_login(client, "member@test.com"))
+        ).json()
+        assert member_stats["totalSecrets"] == 3
+        assert member_stats["totalProjects"] == 1
+        assert member_stats["totalMembers"] == 2
+        assert member_stats["secretsByEnvironment"] == {"dev": 2, "prod": 1}
+        assert len(member_stats["recentActivity"]) == 3
+
+    def test_sayaclar_cachelenir_ve_yazmada_bayatlar(self, client, db):
+        self._seed(db)
+        token = _login(client, "member@test.com")
+
+        first, queries = _count_queries(client, token)
+        assert queries == 1
+        _, queries = _count_queries(client, token)
+        assert queries == 0
+
+        # Baska kullanicinin secret olusturmasi cache'i gecersiz kilar
+        client.post(
+            "/projects/proj/secrets",
+            json={
+                "name": "Yeni",
+                "provider": "GCP",
+                "type": "key",
+                "environment": "dev",
+                "keyName": "NEW_KEY",
+                "value": "v",
+            },
+            headers=_auth_header(_login(client, "admin@test.com")),
+        )
+        after, queries = _count_queries(client, token)
+        assert queries == 1
+        assert after.json()["totalSecrets"] == first.json()["totalSecrets"] + 1
+        assert after.json()["secretsByProvider"]["GCP"] == 1
+
+    def test_kopyalama_cachei_bayatlatmaz(self, client, db):
+        self._seed(db)
+        token = _login(client, "admin@test.com")
+        secrets = client.get("/projects/proj/secrets", headers=_auth_header(token)).json()
+        secret_id = secrets[0]["id"]
+
+        _count_queries(client, token)
+        client.post(
+            "/audit/copy",
+            json={"projectId": "proj", "secretId": secret_id},
+            headers=_auth_header(token),
+        )
+        resp, queries = _count_queries(client, token)
+        assert queries == 0
+        assert resp.json()["recentActivity"][0]["action"] == "secret_copied"
+
+    def test_etag_degismediyse_304(self, client, db):
+        self._seed(db)
+        token = _login(client, "member@test.com")
+
+        first = client.get("/dashboard/stats", headers=_auth_header(token))
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        second = client.get(
+            "/dashboard/stats", headers={**_auth_header(token), "If-None-Match": etag}
+        )
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+        stale = client.get(
+            "/dashboard/stats", headers={**_auth_header(token), "If-None-Match": '"eski"'}
+        )
+        assert stale.status_code == 200
+        assert stale.json() == first.json()
@@ -0,0 +1,72 @@
+"""Baglanti havuzu ayarlari ve metrikleri testleri."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from tests.conftest import _auth_header, _login, _make_user
+
+from app.db import session as db_session
+from app.db.models.enums import RoleEnum
+
+
+@pytest.fixture()
+def small_pool_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.sqlite3'}",
+        poolclass=db_session.InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    db_session.pool_metrics.reset()
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+class TestConnectionPool:
+    def test_checkout_bekleme_ve_zaman_asimi_olculur(self, small_pool_engine):
+        held = small_pool_engine.connect()
+        try:
+            status = db_session.pool_status(small_pool_engine)
+            assert status["checkedOut"] == 1
+            assert status["size"] == 1
+
+            with pytest.raises(PoolTimeoutError):
+                small_pool_engine.connect()
+        finally:
+            held.close()
+
+        status = db_session.pool_status(small_pool_engine)
+        assert status["checkedOut"] == 0
+        assert status["timeouts"] == 1
+        assert status["checkoutWait"]["count"] == 2
+        assert status["checkoutWait"]["maxMs"] >= 50
+
+    def test_postgres_icin_havuz_ve_pgbouncer_ayarlari(self, monkeypatch):
+        settings = db_session.settings
+        monkeypatch.setattr(settings, "DB_POOL_SIZE", 5)
+        monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+
+        options = db_session._engine_options("postgresql+psycopg://u:p@localhost/db")
+
+        assert options["poolclass"] is db_session.InstrumentedQueuePool
+        assert options["pool_size"] == 5
+        assert options["pool_pre_ping"] is True
+        assert options["connect_args"] == {"prepare_threshold": None}
+        assert db_session._engine_options("sqlite://") == {}
+
+    def test_metrik_ucu_sadece_admin(self, client, db):
+        _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        _make_user(db, email="member@test.com", role=RoleEnum.member)
+        admin_token = _login(client, "admin@test.com")
+        member_token = _login(client, "member@test.com")
+
+        resp = client.get("/metrics/db-pool", headers=_auth_header(admin_token))
+        assert resp.status_code == 200
+        assert "timeouts" in resp.json()
+
+        forbidden = client.get("/metrics/db-pool", headers=_auth_header(member_token))
+        assert forbidden.status_code == 403
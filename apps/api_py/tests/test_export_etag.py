@@ -0,0 +1,184 @@
+"""Export ETag'leri, 304 yanitlari ve servis export'u long-poll testleri."""
+
+import asyncio
+import threading
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from tests.conftest import (
+    _assign_member,
+    _auth_header,
+    _login,
+    _make_project,
+    _make_user,
+)
+
+from app.db.models import AuditEvent, Environment, RoleEnum
+from app.services.content_versions import (
+    ContentChangeNotifier,
+    wait_for_content_change,
+)
+from app.services.service_token_cache import service_token_cache
+
+
+def _secret_payload(index: int) -> dict:
+    return {
+        "name": f"Key {index}",
+        "provider": "Stripe",
+        "type": "key",
+        "environment": "dev",
+        "keyName": f"KEY_{index}",
+        "value": f"value-{index}",
+        "tags": [],
+        "notes": "",
+    }
+
+
+@pytest.fixture()
+def seeded(client, db):
+    admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+    project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+    _assign_member(db, project_id=project.id, user_id=admin.id, role=RoleEnum.admin)
+    token = _login(client, "admin@test.com")
+    secret_ids = []
+    for index in range(2):
+        resp = client.post(
+            "/projects/proj/secrets", json=_secret_payload(index), headers=_auth_header(token)
+        )
+        assert resp.status_code == 200
+        secret_ids.append(resp.json()["id"])
+    created = client.post(
+        f"/projects/manage/{project.id}/service-tokens",
+        json={"name": "CI"},
+        headers=_auth_header(token),
+    ).json()
+    service_token_cache.clear()
+    return {"auth": token, "service_token": created["token"], "secret_ids": secret_ids}
+
+
+def _service_export(client, seeded, etag=None, **params):
+    headers = {"X-Service-Token": seeded["service_token"]}
+    if etag:
+        headers["If-None-Match"] = etag
+    return client.get(
+        "/service-access/projects/proj/exports",
+        params={"env": "dev", "format": "env", **params},
+        headers=headers,
+    )
+
+
+def _service_audit_count(db) -> int:
+    db.expire_all()
+    return db.scalar(
+        select(func.count()).select_from(AuditEvent).where(AuditEvent.action == "service_exported")
+    )
+
+
+class TestServiceExportEtag:
+    def test_degismeyen_icerik_304_doner_ve_audit_yazmaz(self, client, db, seeded):
+        first = _service_export(client, seeded)
+        assert first.status_code == 200
+        assert first.headers["Cache-Control"] == "no-store"
+        etag = first.headers["ETag"]
+        audits = _service_audit_count(db)
+
+        second = _service_export(client, seeded, etag=etag)
+
+        assert second.status_code == 304
+        assert second.headers["ETag"] == etag
+        assert second.content == b""
+        assert _service_audit_count(db) == audits
+
+    def test_yazmalar_surumu_ve_etagi_degistirir(self, client, db, seeded):
+        etags = [_service_export(client, seeded).headers["ETag"]]
+
+        client.patch(
+            f"/secrets/{seeded['secret_ids'][0]}",
+            json={"name": "Guncellenmis"},
+            headers=_auth_header(seeded["auth"]),
+        )
+        etags.append(_service_export(client, seeded).headers["ETag"])
+        client.delete(f"/secrets/{seeded['secret_ids'][1]}", headers=_auth_header(seeded["auth"]))
+        etags.append(_service_export(client, seeded).headers["ETag"])
+
+        assert len(set(etags)) == 3
+        db.expire_all()
+        assert db.scalar(select(Environment.content_version).where(Environment.name == "dev")) == 4
+
+    def test_format_ve_tag_filtresi_etage_dahildir(self, client, seeded):
+        env_etag = _service_export(client, seeded).headers["ETag"]
+
+        assert _service_export(client, seeded, format="json").headers["ETag"] != env_etag
+        assert _service_export(client, seeded, tag="api").headers["ETag"] != env_etag
+
+    def test_long_poll_degisiklik_yoksa_sure_dolunca_304(self, client, seeded):
+        etag = _service_export(client, seeded).headers["ETag"]
+
+        resp = _service_export(client, seeded, etag=etag, wait=0.2)
+
+        assert resp.status_code == 304
+
+    def test_long_poll_yazma_gelince_yeni_icerigi_doner(self, client, seeded):
+        etag = _service_export(client, seeded).headers["ETag"]
+        timer = threading.Timer(
+            0.2,
+            lambda: client.post(
+                "/projects/proj/secrets",
+                json=_secret_payload(9),
+                headers=_auth_header(seeded["auth"]),
+            ),
+        )
+        timer.start()
+        try:
+            resp = _service_export(client, seeded, etag=etag, wait=10)
+        finally:
+            timer.join()
+
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] != etag
+        assert "KEY_9=value-9" in resp.text
+
+
+class TestUserExportEtag:
+    def test_tek_ortam_ve_tum_ortamlar_304(self, client, seeded):
+        headers = _auth_header(seeded["auth"])
+        for path in (
+            "/exports/proj?env=dev&format=env&reason=automation-export",
+            "/exports/proj/all?format=json&reason=automation-export",
+        ):
+            first = client.get(path, headers=headers)
+            assert first.status_code == 200
+            etag = first.headers["ETag"]
+
+            second = client.get(path, headers={**headers, "If-None-Match": etag})
+
+            assert second.status_code == 304
+
+
+class TestContentChangeNotifier:
+    def test_bildirim_bekleyeni_uyandirir(self):
+        notifier = ContentChangeNotifier()
+        env_id = uuid4()
+
+        async def scenario():
+            waiter = asyncio.create_task(notifier.wait(env_id, 5))
+            await asyncio.sleep(0)
+            threading.Thread(target=notifier.notify, args=([uuid4(), env_id],)).start()
+            return await waiter
+
+        assert asyncio.run(scenario()) is True
+        assert notifier._waiters == {}
+
+    def test_surum_kontrolu_baska_processteki_degisikligi_gorur(self):
+        versions = iter([3, 3, 4])
+
+        async def current_version():
+            return next(versions)
+
+        result = asyncio.run(
+            wait_for_content_change(uuid4(), 3, 5, current_version, check_interval=0.01)
+        )
+
+        assert result == 4
@@ -11,6 +11,7 @@ from tests.conftest import (
 )
 
 from app.db.models.enums import RoleEnum
+from app.db.repositories.domain_repo import mask_value
 
 
 class TestImportPreview:
@@ -54,6 +55,221 @@ class TestImportPreview:
         assert resp.status_code == 403
 
 
+class TestStreamingParser:
+    def test_parcali_byte_akisi_ayni_sonucu_verir(self):
+        from app.services.import_parser import (
+            TxtImportScanner,
+            iter_lines,
+            parse_txt_import,
+        )
+
+        content = "[Proje]\r\nSIFRE=şifre\n# yorum\nbozuk satir\nDB_HOST=localhost"
+        raw = content.encode("utf-8")
+        chunks = [raw[i : i + 3] for i in range(0, len(raw), 3)]
+
+        scanner = TxtImportScanner()
+        pairs = list(scanner.scan(iter_lines(chunks)))
+        expected = parse_txt_import(content)
+        assert pairs == expected.pairs
+        assert pairs[0].value == "şifre"
+        assert scanner.project_heading == "Proje"
+        assert scanner.skipped == expected.skipped == 1
+
+    def test_onizleme_sinirli_toplam_tam(self):
+        from app.services.import_parser import preview_txt_import
+
+        lines = (f"KEY_{i}=value" for i in range(1000))
+        result = preview_txt_import(lines, limit=50)
+        assert result.total_pairs == 1000
+        assert len(result.preview) == 50
+        assert result.preview[-1].key == "KEY_49"
+
+    def test_upload_onizleme(self, client, db):
+        _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        token = _login(client, "admin@test.com")
+
+        body = "[Apollo]\n" + "".join(f"KEY_{i}=val\n" for i in range(120))
+        raw = body.encode("utf-8")
+        resp = client.post(
+            "/imports/preview/upload",
+            content=iter([raw[:7], raw[7:500], raw[500:]]),
+            headers={**_auth_header(token), "Content-Type": "text/plain"},
+        )
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["heading"] == "Apollo"
+        assert data["totalPairs"] == 120
+        assert len(data["preview"]) == 50
+
+
+    def test_upload_multipart_ve_format(self, client, db):
+        _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        headers = _auth_header(_login(client, "admin@test.com"))
+
+        multipart = client.post(
+            "/imports/preview/upload",
+            files={"file": ("keys.txt", b"[Apollo]\nA=1\nB=2\n", "text/plain")},
+            headers=headers,
+        )
+        assert multipart.status_code == 200
+        assert (multipart.json()["heading"], multipart.json()["totalPairs"]) == ("Apollo", 2)
+
+        dotenv = client.post(
+            "/imports/preview/upload?format=dotenv",
+            files={"file": (".env", b'export A="x y"\nB=2 # yorum\n', "text/plain")},
+            headers=headers,
+        )
+        assert dotenv.status_code == 200
+        assert [item["key"] for item in dotenv.json()["preview"]] == ["A", "B"]
+
+        raw_json = client.post(
+            "/imports/preview/upload?format=json",
+            content=b'{"db": {"host": "x"}}',
+            headers={**headers, "Content-Type": "application/json"},
+        )
+        assert raw_json.json()["preview"][0]["key"] == "db_host"
+
+        unknown = client.post(
+            "/imports/preview/upload?format=xml", content=b"A=1", headers=headers
+        )
+        assert unknown.status_code == 400
+        missing_file = client.post(
+            "/imports/preview/upload", files={"other": ("x.txt", b"A=1")}, headers=headers
+        )
+        assert missing_file.status_code == 400
+
+    def test_upload_boyut_siniri(self, client, db, monkeypatch):
+        from app.core.config import get_settings
+
+        _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        headers = _auth_header(_login(client, "admin@test.com"))
+        monkeypatch.setattr(get_settings(), "IMPORT_MAX_UPLOAD_BYTES", 100)
+        body = b"".join(b"KEY_%d=value\n" % i for i in range(50))
+
+        declared = client.post("/imports/preview/upload", content=body, headers=headers)
+        chunked = client.post(
+            "/imports/preview/upload", content=iter([body[:60], body[60:]]), headers=headers
+        )
+        multipart = client.post(
+            "/imports/preview/upload", files={"file": ("keys.txt", body)}, headers=headers
+        )
+
+        assert declared.status_code == 413
+        assert chunked.status_code == 413
+        assert multipart.status_code == 413
+
+
+class TestImportFormats:
+    def test_dotenv_tirnak_export_ve_yorum(self):
+        from app.services.import_formats import parse_import
+
+        content = (
+            "# yorum\n"
+            "export API_KEY=sk_123 # satir sonu yorumu\n"
+            "QUOTED=\"a b\\n\\\"c\\\"\"\n"
+            "SINGLE='literal \\n'\n"
+            "MULTI=\"satir1\nsatir2\"\n"
+            "HASH=abc#def\n"
+            "bozuk satir\n"
+            "UNCLOSED=\"acik\n"
+        )
+        parsed = parse_import(content, "dotenv")
+        values = {pair.key: pair.value for pair in parsed.pairs}
+        assert values == {
+            "API_KEY": "sk_123",
+            "QUOTED": 'a b\n"c"',
+            "SINGLE": "literal \\n",
+            "MULTI": "satir1\nsatir2",
+            "HASH": "abc#def",
+        }
+        assert parsed.skipped == 2
+
+    def test_json_ic_ice_duzlestirilir(self):
+        from app.services.import_formats import parse_import
+
+        content = json.dumps(
+            {"db": {"host": "localhost", "port": 5432}, "debug": True, "hosts": ["a", "b"]}
+        )
+        parsed = parse_import(content, "json")
+        values = {pair.key: pair.value for pair in parsed.pairs}
+        assert values == {
+            "db_host": "localhost",
+            "db_port": "5432",
+            "debug": "true",
+            "hosts": '["a","b"]',
+        }
+
+    def test_yaml_duzlestirilir(self):
+        from app.services.import_formats import parse_import
+
+        parsed = parse_import("stripe:\n  key: sk_live\nregion: eu\n", "yaml")
+        assert [(p.key, p.value) for p in parsed.pairs] == [
+            ("stripe_key", "sk_live"),
+            ("region", "eu"),
+        ]
+
+    def test_k8s_secret_base64_cozulur(self):
+        import base64
+
+        from app.services.import_formats import parse_import
+
+        encoded = base64.b64encode("şifre".encode("utf-8")).decode("ascii")
+        manifest = (
+            "apiVersion: v1\n"
+            "kind: Secret\n"
+            "metadata:\n  name: apollo-secrets\n"
+            f"data:\n  DB_PASSWORD: {encoded}\n  BROKEN: '***'\n"
+            "stringData:\n  API_URL: https://api.example.com\n"
+            "---\n"
+            "kind: ConfigMap\n"
+            "data:\n  IGNORED: x\n"
+        )
+        parsed = parse_import(manifest, "k8s")
+        assert parsed.project_heading == "apollo-secrets"
+        assert {p.key: p.value for p in parsed.pairs} == {
+            "DB_PASSWORD": "şifre",
+            "API_URL": "https://api.example.com",
+        }
+        assert parsed.skipped == 1
+
+    def test_gecersiz_format_400(self, client, db):
+        _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        token = _login(client, "admin@test.com")
+
+        resp = client.post(
+            "/imports/preview",
+            json={"content": "KEY=val", "format": "xml"},
+            headers=_auth_header(token),
+        )
+        assert resp.status_code == 400
+
+        resp = client.post(
+            "/imports/preview",
+            json={"content": "[1, 2]", "format": "json"},
+            headers=_auth_header(token),
+        )
+        assert resp.status_code == 400
+
+    def test_commit_dotenv_formati(self, client, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        token = _login(client, "admin@test.com")
+
+        resp = client.post(
+            "/imports/commit",
+            json={
+                "projectId": "proj",
+                "environment": "dev",
+                "content": 'export API_KEY="a=b c"\n',
+                "format": "dotenv",
+            },
+            headers=_auth_header(token),
+        )
+        assert resp.status_code == 200
+        assert resp.json()["inserted"] == 1
+
+
 class TestImportCommit:
     def test_commit_basarili(self, client, db):
         admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
@@ -179,6 +395,139 @@ class TestImportCommit:
         assert resp.status_code == 422
 
 
+class TestBulkImport:
+    """Toplu import tek transaction ve sabit sorgu sayisiyla calismali."""
+
+    @staticmethod
+    def _commit(client, token, content, strategy="skip"):
+        return client.post(
+            "/imports/commit",
+            json={
+                "projectId": "proj",
+                "environment": "dev",
+                "content": content,
+                "provider": "Imported",
+                "type": "key",
+                "conflictStrategy": strategy,
+                "tags": ["bulk", "bulk"],
+            },
+            headers=_auth_header(token),
+        )
+
+    @staticmethod
+    def _run_bulk(db, user_id, pairs):
+        from sqlalchemy import event
+
+        from app.db.repositories.domain_repo import bulk_import_secrets
+        from tests.conftest import TEST_ENGINE
+
+        statements = []
+
+        def _before_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(TEST_ENGINE, "before_cursor_execute", _before_execute)
+        try:
+            bulk_import_secrets(
+                db,
+                user_id,
+                "proj",
+                "dev",
+                pairs,
+                provider="Imported",
+                secret_type="key",
+                tags=["bulk"],
+                notes="Imported from TXT",
+                conflict_strategy="overwrite",
+                key_to_name=str.title,
+            )
+        finally:
+            event.remove(TEST_ENGINE, "before_cursor_execute", _before_execute)
+        return len(statements)
+
+    def test_item_sonuclari_doner(self, client, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        token = _login(client, "admin@test.com")
+
+        self._commit(client, token, "A=1")
+        resp = self._commit(client, token, "A=2\nB=3\nB=4", strategy="overwrite")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["inserted"] == 1
+        assert data["updated"] == 1
+        assert data["skipped"] == 1
+        assert [(item["key"], item["status"]) for item in data["items"]] == [
+            ("A", "updated"),
+            ("B", "inserted"),
+        ]
+        assert all(item["secretId"] for item in data["items"])
+
+        secrets = client.get("/projects/proj/secrets", headers=_auth_header(token)).json()
+        by_key = {item["keyName"]: item for item in secrets}
+        assert by_key["B"]["tags"] == ["bulk"]
+        assert by_key["A"]["valueMasked"] == mask_value("2")
+
+        versions = client.get(
+            f"/secrets/{by_key['A']['id']}/versions", headers=_auth_header(token)
+        ).json()
+        assert [item["version"] for item in versions] == [2, 1]
+
+        reveal = client.get(
+            f"/secrets/{by_key['B']['id']}/reveal", headers=_auth_header(token)
+        )
+        assert reveal.json()["value"] == "4"
+
+    def test_skip_tekrar_eden_anahtarlar(self, client, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        token = _login(client, "admin@test.com")
+
+        resp = self._commit(client, token, "A=1\nA=2")
+        data = resp.json()
+        assert data["inserted"] == 1
+        assert data["skipped"] == 1
+        assert [(item["key"], item["status"]) for item in data["items"]] == [("A", "inserted")]
+
+        again = self._commit(client, token, "A=3").json()
+        assert again["items"] == [{"key": "A", "status": "skipped", "secretId": None}]
+
+    def test_overwrite_tekrar_eden_anahtar_tek_surum_yazar(self, client, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        token = _login(client, "admin@test.com")
+        self._commit(client, token, "A=1")
+
+        data = self._commit(client, token, "A=2\nA=3", strategy="overwrite").json()
+
+        assert (data["inserted"], data["updated"], data["skipped"]) == (0, 1, 1)
+        assert [(item["key"], item["status"]) for item in data["items"]] == [("A", "updated")]
+        secret_id = data["items"][0]["secretId"]
+        versions = client.get(
+            f"/secrets/{secret_id}/versions", headers=_auth_header(token)
+        ).json()
+        assert [item["version"] for item in versions] == [2, 1]
+        reveal = client.get(
+            f"/secrets/{secret_id}/reveal?reason=import-check", headers=_auth_header(token)
+        )
+        assert reveal.json()["value"] == "3"
+
+    def test_sorgu_sayisi_sabit_kalir(self, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        user_id = str(admin.id)
+
+        small = self._run_bulk(db, user_id, [(f"S_{i}", "v") for i in range(3)])
+        large = self._run_bulk(db, user_id, [(f"L_{i}", "v") for i in range(200)])
+        overwrite = self._run_bulk(db, user_id, [(f"L_{i}", "w") for i in range(200)])
+        assert large == small
+        assert overwrite <= small
+
+
 class TestExport:
     def _seed_secrets(self, client, db):
         admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
@@ -274,3 +623,79 @@ class TestExport:
         assert resp.status_code == 200
         data = json.loads(resp.text)
         assert len(data) == 0
+
+    def test_export_akisi_json_dumps_ile_ayni(self, client, db):
+        token = self._seed_secrets(client, db)
+
+        resp = client.get(
+            "/exports/proj?env=dev&format=json&reason=automation-export",
+            headers=_auth_header(token),
+        )
+        assert resp.text == json.dumps({"KEY_A": "val_a", "KEY_B": "val_b"}, indent=2)
+
+        resp = client.get(
+            "/exports/proj/all?format=json&reason=automation-export",
+            headers=_auth_header(token),
+        )
+        assert resp.text == json.dumps(
+            {"dev": {"KEY_A": "val_a", "KEY_B": "val_b"}}, indent=2
+        )
+
+        resp = client.get(
+            "/exports/proj/all?format=env&reason=automation-export",
+            headers=_auth_header(token),
+        )
+        assert resp.text == "# --- DEV ---\nKEY_A=val_a\nKEY_B=val_b"
+
+    def test_export_ndjson_formati(self, client, db):
+        token = self._seed_secrets(client, db)
+
+        resp = client.get(
+            "/exports/proj?env=dev&format=ndjson&reason=automation-export",
+            headers=_auth_header(token),
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert lines == [
+            {"key": "KEY_A", "value": "val_a"},
+            {"key": "KEY_B", "value": "val_b"},
+        ]
+
+        resp = client.get(
+            "/exports/proj/all?format=ndjson&reason=automation-export",
+            headers=_auth_header(token),
+        )
+        assert [json.loads(line)["environment"] for line in resp.text.splitlines()] == [
+            "dev",
+            "dev",
+        ]
+
+    def test_export_desteklenmeyen_format(self, client, db):
+        token = self._seed_secrets(client, db)
+
+        resp = client.get(
+            "/exports/proj?env=dev&format=xml&reason=automation-export",
+            headers=_auth_header(token),
+        )
+        assert resp.status_code == 400
+
+    def test_iter_export_secrets_parti_parti_cozer(self, client, db):
+        from app.db.models import Environment, EnvironmentEnum, Project
+        from app.db.repositories.domain_repo import count_export_secrets, iter_export_secrets
+
+        self._seed_secrets(client, db)
+        project = db.query(Project).filter(Project.slug == "proj").one()
+        env = (
+            db.query(Environment)
+            .filter(Environment.project_id == project.id, Environment.name == EnvironmentEnum.dev)
+            .one()
+        )
+
+        rows = list(iter_export_secrets(db, project.id, env.id, batch_size=1))
+        assert rows == [
+            {"key_name": "KEY_A", "value_plain": "val_a"},
+            {"key_name": "KEY_B", "value_plain": "val_b"},
+        ]
+        assert count_export_secrets(db, project.id, [env.id], "api") == {env.id: 2}
+        assert count_export_secrets(db, project.id, [env.id], "yok") == {}
@@ -124,8 +124,8 @@ class TestOrganizationsInvites:
         token = _login(client, "admin@test.com")
 
         monkeypatch.setattr(
-            "app.api.routes.organizations.check_rate_limit",
-            lambda **kwargs: False,
+            "app.api.routes.organizations.allow_request",
+            lambda rule, key: False,
         )
 
         resp = client.post(
@@ -0,0 +1,111 @@
+"""Sifre hashleme havuzu, yeniden hashleme ve metrik testleri."""
+
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from tests.conftest import _auth_header, _login, _make_user
+
+from app.core import security
+from app.core.config import get_settings
+from app.db.models import User
+from app.db.models.enums import RoleEnum
+from app.services import password_hasher
+
+
+CHEAP_COST = {"time_cost": 1, "memory_cost": 1024, "parallelism": 1}
+
+
+@pytest.fixture()
+def pool():
+    hasher = password_hasher.PasswordHasher(
+        max_workers=1, max_pending=0, timeout=30.0, cost_options=CHEAP_COST
+    )
+    try:
+        yield hasher
+    finally:
+        hasher.shutdown()
+
+
+class TestPasswordHasherPool:
+    def test_havuzda_hash_ve_dogrulama(self, pool):
+        password_hasher.hashing_metrics.reset()
+
+        hashed = pool.hash("gizli-sifre")
+
+        assert "$argon2id$" in hashed and "m=1024,t=1,p=1" in hashed
+        assert pool.verify("gizli-sifre", hashed) is True
+        assert pool.verify("yanlis", hashed) is False
+        snapshot = password_hasher.hashing_metrics.snapshot()
+        assert snapshot["operations"]["hash"]["count"] == 1
+        assert snapshot["operations"]["verify"]["count"] == 2
+
+    def test_kuyruk_doluysa_503(self, pool):
+        password_hasher.hashing_metrics.reset()
+        worker = threading.Thread(target=pool._run, args=("hash", time.sleep, 1.0))
+        worker.start()
+        try:
+            deadline = time.monotonic() + 5
+            while pool._slots._value and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            with pytest.raises(HTTPException) as exc_info:
+                pool.hash("sifre")
+
+            assert exc_info.value.status_code == 503
+            assert password_hasher.hashing_metrics.snapshot()["rejected"] == 1
+        finally:
+            worker.join()
+
+        # Is bitince slot serbest kalir
+        assert pool.verify("sifre", pool.hash("sifre")) is True
+
+
+class TestLoginRehash:
+    def test_maliyet_degisince_giriste_yeniden_hashlenir(self, client, db, monkeypatch):
+        user = _make_user(db, email="user@test.com", password="pass123")
+        old_hash = user.password_hash
+        token = _login(client, "user@test.com", "pass123")
+
+        settings = get_settings()
+        monkeypatch.setattr(settings, "ARGON2_TIME_COST", 1)
+        monkeypatch.setattr(settings, "ARGON2_MEMORY_COST", 1024)
+        security.get_pwd_context.cache_clear()
+        try:
+            assert security.password_needs_update(old_hash)
+            _login(client, "user@test.com", "pass123")
+
+            db.expire_all()
+            refreshed = db.get(User, user.id)
+            assert refreshed.password_hash != old_hash
+            assert "m=1024,t=1" in refreshed.password_hash
+            assert not security.password_needs_update(refreshed.password_hash)
+            # Yeniden hashleme kimlik bilgisi degisimi sayilmaz
+            assert refreshed.token_generation == 0
+            assert client.get("/me", headers=_auth_header(token)).status_code == 200
+        finally:
+            monkeypatch.undo()
+            security.get_pwd_context.cache_clear()
+
+
+class TestHashingMetricsEndpoint:
+    def test_admin_metrikleri_gorur(self, client, db):
+        _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        _make_user(db, email="member@test.com", role=RoleEnum.member)
+        password_hasher.hashing_metrics.reset()
+        admin_token = _login(client, "admin@test.com")
+        member_token = _login(client, "member@test.com")
+
+        resp = client.get("/metrics/password-hashing", headers=_auth_header(admin_token))
+
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["pooled"] is False
+        assert data["operations"]["verify"]["count"] == 2
+        assert data["operations"]["verify"]["p95Ms"] > 0
+        forbidden = client.get(
+            "/metrics/password-hashing", headers=_auth_header(member_token)
+        )
+        assert forbidden.status_code == 403
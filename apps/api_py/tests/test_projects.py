@@ -1,6 +1,9 @@
 """Proje CRUD testleri."""
 
+from sqlalchemy import event, select
+
 from tests.conftest import (
+    TEST_ENGINE,
     _assign_member,
     _auth_header,
     _login,
@@ -8,7 +11,21 @@ from tests.conftest import (
     _make_user,
 )
 
+from tests.test_secrets import _seed_secrets
+
+from app.db.models import Environment, SecretCounter
 from app.db.models.enums import RoleEnum
+from app.db.repositories.domain_repo import list_projects_for_user, rebuild_secret_counters
+
+
+def _counters(db):
+    db.expire_all()
+    rows = db.execute(
+        select(Environment.name, SecretCounter.provider, SecretCounter.secret_count).join(
+            Environment, Environment.id == SecretCounter.environment_id
+        )
+    ).all()
+    return {(env.value, provider): count for env, provider, count in rows if count}
 
 
 class TestProjectList:
@@ -37,6 +54,106 @@ class TestProjectList:
         assert resp.status_code == 200
         assert len(resp.json()) == 0
 
+    def test_key_count_sayaclardan_prod_yetkisine_gore(self, client, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        member = _make_user(db, email="member@test.com", role=RoleEnum.member)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        _assign_member(
+            db, project_id=project.id, user_id=member.id, role=RoleEnum.member, grant_envs=False
+        )
+        _seed_secrets(db, project, admin, 2, env_name="dev")
+        _seed_secrets(db, project, admin, 3, env_name="prod")
+
+        admin_view = client.get(
+            "/projects", headers=_auth_header(_login(client, "admin@test.com"))
+        ).json()
+        assert admin_view[0]["keyCount"] == 5
+        assert admin_view[0]["prodAccess"] is True
+
+        member_view = client.get(
+            "/projects", headers=_auth_header(_login(client, "member@test.com"))
+        ).json()
+        assert member_view[0]["keyCount"] == 2
+        assert member_view[0]["prodAccess"] is False
+
+    def test_sayaclar_secret_yazmalariyla_guncellenir(self, client, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        token = _login(client, "admin@test.com")
+
+        def _key_count():
+            return client.get("/projects", headers=_auth_header(token)).json()[0]["keyCount"]
+
+        created = client.post(
+            "/projects/proj/secrets",
+            json={
+                "name": "Key",
+                "provider": "AWS",
+                "type": "key",
+                "environment": "dev",
+                "keyName": "AWS_KEY",
+                "value": "secret",
+            },
+            headers=_auth_header(token),
+        ).json()
+        assert _key_count() == 1
+
+        client.post(
+            "/imports/commit",
+            json={
+                "projectId": "proj",
+                "environment": "dev",
+                "content": "AWS_KEY=yeni\nDB_URL=postgres://",
+                "provider": "Imported",
+                "type": "key",
+                "conflictStrategy": "overwrite",
+            },
+            headers=_auth_header(token),
+        )
+        assert _key_count() == 2
+        assert _counters(db) == {("dev", "Imported"): 2}
+
+        client.patch(
+            f"/secrets/{created['id']}", json={"provider": "GCP"}, headers=_auth_header(token)
+        )
+        assert _counters(db) == {("dev", "Imported"): 1, ("dev", "GCP"): 1}
+
+        client.delete(f"/secrets/{created['id']}", headers=_auth_header(token))
+        assert _key_count() == 1
+        assert _counters(db) == {("dev", "Imported"): 1}
+
+        # Artimli sayaclar bastan hesaplanan degerle ayni kalmali
+        before = _counters(db)
+        rebuild_secret_counters(db)
+        assert _counters(db) == before
+
+    def test_sorgu_sayisi_secret_sayisindan_bagimsiz(self, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        for index in range(3):
+            project = _make_project(
+                db, slug=f"proj-{index}", name=f"Proje {index}", created_by=str(admin.id)
+            )
+            _assign_member(db, project_id=project.id, user_id=admin.id)
+            _seed_secrets(db, project, admin, 5)
+        user_id = str(admin.id)
+
+        statements = []
+
+        def _before_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(TEST_ENGINE, "before_cursor_execute", _before_execute)
+        try:
+            projects = list_projects_for_user(db, user_id)
+        finally:
+            event.remove(TEST_ENGINE, "before_cursor_execute", _before_execute)
+
+        assert [item["keyCount"] for item in projects] == [5, 5, 5]
+        assert len(statements) == 4
+        assert not any("FROM secrets" in statement for statement in statements)
+
 
 class TestProjectManageCRUD:
     def test_admin_proje_olusturur(self, client, db):
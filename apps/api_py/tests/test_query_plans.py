@@ -0,0 +1,127 @@
+"""Sicak sorgularin indeks kullanimi testleri.
+
+Repo fonksiyonlarinin gercekten calistirdigi SELECT/UPDATE'ler yakalanir ve test
+veritabaninda `EXPLAIN QUERY PLAN` ile beklenen indeksin secildigi dogrulanir.
+"""
+
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Tuple
+
+from sqlalchemy import event
+
+from tests.conftest import TEST_ENGINE, _assign_member, _make_project, _make_user
+from tests.test_secrets import _seed_secrets
+
+from app.db.models.enums import RoleEnum
+from app.db.repositories.domain_repo import (
+    AccessContext,
+    backfill_last_copied_at,
+    list_audit_events_page,
+    list_secrets_page,
+)
+from app.db.repositories.users_repo import list_active_sessions_for_user
+
+
+@contextmanager
+def _captured_statements() -> Iterator[List[Tuple[str, tuple]]]:
+    statements: List[Tuple[str, tuple]] = []
+
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE")):
+            statements.append((statement, parameters))
+
+    event.listen(TEST_ENGINE, "before_cursor_execute", _before_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(TEST_ENGINE, "before_cursor_execute", _before_execute)
+
+
+def _query_plan(db, call: Callable[[], object], marker: str) -> str:
+    """`call` icinde calisan ve `marker` iceren sorgunun planini dondurur."""
+    with _captured_statements() as statements:
+        call()
+    matches = [(sql, params) for sql, params in statements if marker in sql]
+    assert matches, f"'{marker}' iceren sorgu calistirilmadi"
+    sql, params = matches[0]
+    rows = db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + sql, params).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+class TestHotQueryIndexes:
+    def _seed(self, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        _seed_secrets(db, project, admin, 3)
+        return admin
+
+    def test_son_kopyalanma_backfill(self, db):
+        self._seed(db)
+        plan = _query_plan(
+            db, lambda: backfill_last_copied_at(db), "max(audit_events.created_at)"
+        )
+        assert "ix_audit_events_target_action_created" in plan
+
+    def test_proje_secret_listesi_sirali_okunur(self, db):
+        admin = self._seed(db)
+        plan = _query_plan(
+            db,
+            lambda: list_secrets_page(db, str(admin.id), limit=10, project_slug="proj"),
+            "ORDER BY secrets.updated_at DESC",
+        )
+        assert "ix_secrets_project_updated" in plan
+        assert "TEMP B-TREE FOR ORDER BY" not in plan
+
+    def test_aktif_oturumlar(self, db):
+        admin = self._seed(db)
+        plan = _query_plan(
+            db,
+            lambda: list_active_sessions_for_user(db, admin.id),
+            "FROM refresh_tokens",
+        )
+        assert "ix_refresh_tokens_user_revoked" in plan
+
+    def test_uyelikler_ve_ortam_yetkileri(self, db):
+        admin = self._seed(db)
+
+        def _load():
+            AccessContext(db, str(admin.id)).has_project_access("proj")
+
+        assert "ix_project_members_user_id" in _query_plan(
+            db, _load, "JOIN project_members"
+        )
+        plan = _query_plan(
+            db,
+            lambda: list_secrets_page(db, str(admin.id), limit=10, project_slug="proj"),
+            "environment_access.can_read",
+        )
+        assert "ix_environment_access_user_id" in plan
+
+    def test_audit_listesi(self, db):
+        self._seed(db)
+        plan = _query_plan(db, lambda: list_audit_events_page(db), "FROM audit_events")
+        assert "ix_audit_events_created_at" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_audit_actor_keyset(self, db):
+        admin = self._seed(db)
+        _, cursor = list_audit_events_page(db, limit=1)
+        plan = _query_plan(
+            db,
+            lambda: list_audit_events_page(db, limit=10, cursor=cursor, actor_id=str(admin.id)),
+            "FROM audit_events",
+        )
+        assert "ix_audit_events_actor_created" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_tag_filtresi(self, db):
+        admin = self._seed(db)
+        plan = _query_plan(
+            db,
+            lambda: list_secrets_page(db, str(admin.id), limit=10, tags=["bulk"]),
+            "secret_tags.tag = ?",
+        )
+        # Iliskili EXISTS her iki secret_tags indeksiyle de tablo okumadan cozulur
+        assert "SEARCH secret_tags USING COVERING INDEX" in plan
+        assert "SCAN secret_tags" not in plan
@@ -0,0 +1,93 @@
+"""Hiz sinirlama backend'leri ve route limitleri testleri."""
+
+import pytest
+
+from app.core import rate_limit
+from app.core.config import get_settings
+from app.core.rate_limit import MemoryRateLimiter, RateLimit, RateLimiter, SqliteRateLimiter
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestMemoryRateLimiter:
+    def test_limit_dolunca_reddeder_ve_zamanla_acilir(self):
+        clock = _Clock()
+        limiter = MemoryRateLimiter(clock=clock)
+
+        assert all(limiter.allow("ip", 3, 60) for _ in range(3))
+        assert limiter.allow("ip", 3, 60) is False
+        # Ayni pencerede baska anahtar etkilenmez
+        assert limiter.allow("baska", 3, 60) is True
+
+        clock.now += 20  # window / limit kadar sonra bir hak geri gelir
+        assert limiter.allow("ip", 3, 60) is True
+        assert limiter.allow("ip", 3, 60) is False
+
+    def test_bosta_kalan_anahtarlar_temizlenir(self):
+        clock = _Clock()
+        limiter = MemoryRateLimiter(sweep_interval=30, clock=clock)
+        for index in range(100):
+            limiter.allow(f"ip-{index}", 5, 10)
+        assert len(limiter) == 100
+
+        clock.now += 60
+        limiter.allow("yeni", 5, 10)
+
+        assert len(limiter) == 1
+
+
+class TestSqliteRateLimiter:
+    def test_limit_instancelar_arasinda_paylasilir(self, tmp_path):
+        path = str(tmp_path / "limits.sqlite3")
+        first = SqliteRateLimiter(path)
+        second = SqliteRateLimiter(path)
+
+        assert first.allow("ip", 2, 60) is True
+        assert second.allow("ip", 2, 60) is True
+        assert first.allow("ip", 2, 60) is False
+        assert second.allow("ip", 2, 60) is False
+
+        second.reset()
+        assert first.allow("ip", 2, 60) is True
+
+
+class TestRateLimiterBackend:
+    def test_eksik_metotlu_backend_olusturulamaz(self):
+        class _NoReset(RateLimiter):
+            def allow(self, key, limit, window_seconds):
+                return True
+
+        with pytest.raises(TypeError):
+            _NoReset()
+
+
+@pytest.fixture()
+def enforced_limits(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "APP_ENV", "development")
+    rate_limit.reload_rate_limiter()
+    yield settings
+    monkeypatch.undo()
+    rate_limit.reload_rate_limiter()
+
+
+class TestRouteLimits:
+    def test_refresh_limiti_asilinca_429(self, client, enforced_limits):
+        statuses = [client.post("/auth/refresh").status_code for _ in range(21)]
+
+        assert statuses[:20] == [401] * 20
+        assert statuses[20] == 429
+
+    def test_limit_ayarla_ezilebilir(self, enforced_limits, monkeypatch):
+        monkeypatch.setattr(enforced_limits, "RATE_LIMITS", ["ozel=1/60"])
+        rate_limit.reload_rate_limiter()
+        rule = RateLimit("ozel", limit=100, window_seconds=60)
+
+        assert rate_limit.allow_request(rule, "ip") is True
+        assert rate_limit.allow_request(rule, "ip") is False
@@ -217,8 +217,8 @@ class TestRegister:
 
     def test_register_rate_limit_asilirsa_429_doner(self, client, monkeypatch):
         monkeypatch.setattr(
-            "app.api.routes.auth.check_rate_limit",
-            lambda **kwargs: False,
+            "app.api.routes.auth.allow_request",
+            lambda rule, key: False,
         )
 
         resp = client.post(
@@ -197,3 +197,240 @@ class TestSecretCRUD:
         )
         assert len(resp2.json()) == 1
         assert resp2.json()[0]["type"] == "token"
+
+    def test_coklu_tag_filtresi(self, client, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        token = _login(client, "admin@test.com")
+
+        _create_secret(client, token, "proj", keyName="KEY_A", tags=["payment", "prod"])
+        _create_secret(client, token, "proj", keyName="KEY_B", tags=["payment"])
+        _create_secret(client, token, "proj", keyName="KEY_C", tags=["infra"])
+
+        def _keys(query):
+            resp = client.get(f"/projects/proj/secrets?{query}", headers=_auth_header(token))
+            assert resp.status_code == 200
+            return sorted(item["keyName"] for item in resp.json())
+
+        assert _keys("tags=payment&tags=prod") == ["KEY_A"]
+        assert _keys("tags=prod&tags=infra&tag_mode=any") == ["KEY_A", "KEY_C"]
+        # Tekil `tag` parametresi coklu listeyle birlestirilir
+        assert _keys("tag=payment&tags=prod") == ["KEY_A"]
+
+        resp = client.get(
+            "/exports/proj?env=dev&format=json&tags=payment&tags=infra&tag_mode=any"
+            "&reason=automation-export",
+            headers=_auth_header(token),
+        )
+        assert sorted(resp.json()) == ["KEY_A", "KEY_B", "KEY_C"]
+
+
+def _seed_secrets(db, project, user, count, env_name="dev", copied=True):
+    from datetime import datetime, timezone
+
+    from sqlalchemy import select
+
+    from app.core.crypto import encrypt_secret_value
+    from app.db.models import AuditEvent, Environment, Secret, SecretNote, SecretTag
+    from app.db.repositories.domain_repo import rebuild_secret_counters
+
+    env_id = db.scalar(
+        select(Environment.id).where(
+            Environment.project_id == project.id, Environment.name == env_name
+        )
+    )
+    for index in range(count):
+        secret = Secret(
+            project_id=project.id,
+            environment_id=env_id,
+            name=f"Key {env_name} {index}",
+            provider="AWS",
+            type="key",
+            key_name=f"KEY_{env_name.upper()}_{index}",
+            value_encrypted=encrypt_secret_value(f"value-{index}-abcdefgh"),
+            key_version=1,
+            created_by=user.id,
+            updated_by=user.id,
+            last_copied_at=datetime.now(timezone.utc) if copied else None,
+        )
+        db.add(secret)
+        db.flush()
+        db.add(SecretTag(secret_id=secret.id, tag="bulk"))
+        db.add(SecretNote(secret_id=secret.id, content=f"note {index}"))
+        db.add(
+            AuditEvent(
+                actor_user_id=user.id,
+                project_id=project.id,
+                action="secret_copied",
+                target_type="secret",
+                target_id=secret.id,
+                meta={},
+            )
+        )
+    db.commit()
+    # Dogrudan eklenen satirlar icin sayaclari esitle
+    rebuild_secret_counters(db)
+
+
+class TestSecretListingQueryCount:
+    """list_secrets sorgu sayisi secret sayisindan bagimsiz kalmali."""
+
+    @staticmethod
+    def _count_queries(db, user_id):
+        from sqlalchemy import event
+
+        from app.db.repositories.domain_repo import list_secrets
+        from tests.conftest import TEST_ENGINE
+
+        statements = []
+
+        def _before_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(TEST_ENGINE, "before_cursor_execute", _before_execute)
+        try:
+            rows = list_secrets(db, user_id, project_slug="proj")
+        finally:
+            event.remove(TEST_ENGINE, "before_cursor_execute", _before_execute)
+        return len(statements), rows
+
+    def test_sorgu_sayisi_sabit_kalir(self, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+
+        _seed_secrets(db, project, admin, 3)
+        small_count, small_rows = self._count_queries(db, str(admin.id))
+        assert len(small_rows) == 3
+
+        _seed_secrets(db, project, admin, 40, env_name="prod")
+        large_count, large_rows = self._count_queries(db, str(admin.id))
+        assert len(large_rows) == 43
+
+        assert small_count == large_count
+        row = large_rows[0]
+        assert row["tags"] == ["bulk"]
+        assert row["notes"].startswith("note ")
+        assert row["updatedByName"] == admin.display_name
+        assert row["lastCopiedAt"] is not None
+
+    def test_prod_erisimi_olmayan_kullanici_prod_secretlari_gormez(self, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        member = _make_user(db, email="member@test.com", role=RoleEnum.member)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        _assign_member(
+            db,
+            project_id=project.id,
+            user_id=member.id,
+            role=RoleEnum.member,
+            grant_envs=False,
+        )
+
+        _seed_secrets(db, project, admin, 2)
+        _seed_secrets(db, project, admin, 2, env_name="prod")
+
+        _, rows = self._count_queries(db, str(member.id))
+        assert len(rows) == 2
+        assert all(item["environment"] == "dev" for item in rows)
+
+
+class TestSecretPagination:
+    def test_cursor_ile_sayfalanir(self, client, db):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        _seed_secrets(db, project, admin, 5)
+        token = _login(client, "admin@test.com")
+
+        seen = []
+        cursor = None
+        for _ in range(5):
+            url = "/projects/proj/secrets?limit=2"
+            if cursor:
+                url += f"&cursor={cursor}"
+            resp = client.get(url, headers=_auth_header(token))
+            assert resp.status_code == 200
+            seen.extend(item["id"] for item in resp.json())
+            cursor = resp.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+
+    def test_search_ndjson_akisi(self, client, db):
+        import json
+
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        _seed_secrets(db, project, admin, 4)
+        token = _login(client, "admin@test.com")
+
+        resp = client.get("/search?format=ndjson", headers=_auth_header(token))
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in resp.text.splitlines() if line]
+        assert len(lines) == 4
+        assert all(item["projectId"] == "proj" for item in lines)
+
+    def test_gecersiz_cursor_400(self, client, db):
+        _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        token = _login(client, "admin@test.com")
+
+        resp = client.get("/search?limit=2&cursor=bozuk", headers=_auth_header(token))
+        assert resp.status_code == 400
+
+
+class TestMaskedPreview:
+    def test_listeleme_ve_surumler_sifre_cozmez(self, client, db, monkeypatch):
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _assign_member(db, project_id=project.id, user_id=admin.id)
+        token = _login(client, "admin@test.com")
+
+        secret_id = _create_secret(client, token, "proj", value="sk_live_1234567890").json()["id"]
+        client.patch(
+            f"/secrets/{secret_id}",
+            json={"value": "sk_live_0987654321"},
+            headers=_auth_header(token),
+        )
+
+        def _fail(_payload):
+            raise AssertionError("listeleme sifre cozmemeli")
+
+        monkeypatch.setattr("app.db.repositories.domain_repo.decrypt_secret_value", _fail)
+
+        resp = client.get("/projects/proj/secrets", headers=_auth_header(token))
+        assert resp.status_code == 200
+        assert resp.json()[0]["valueMasked"] == "sk_l...4321"
+
+        versions = client.get(f"/secrets/{secret_id}/versions", headers=_auth_header(token))
+        assert versions.status_code == 200
+        assert [item["maskedValue"] for item in versions.json()] == [
+            "sk_l...4321",
+            "sk_l...7890",
+        ]
+
+    def test_backfill_eksik_maskeleri_doldurur(self, db):
+        from sqlalchemy import select
+
+        from app.db.models import Secret
+        from app.db.repositories.domain_repo import backfill_value_masks
+
+        admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+        _seed_secrets(db, project, admin, 3)
+        before = {
+            row.id: row.updated_at for row in db.execute(select(Secret)).scalars()
+        }
+
+        assert backfill_value_masks(db, batch_size=2) == 3
+        assert backfill_value_masks(db) == 0
+
+        db.expire_all()
+        rows = db.execute(select(Secret)).scalars().all()
+        assert all(row.value_masked and "..." in row.value_masked for row in rows)
+        assert {row.id: row.updated_at for row in rows} == before
@@ -0,0 +1,96 @@
+"""JWT token servisi testleri."""
+
+import time
+
+from jose import jwt
+
+from app.core import security
+from app.core.config import get_settings
+
+
+OLD_SECRET = "eski-jwt-anahtari-en-az-otuz-iki-karakter-uzun"
+NEW_SECRET = "yeni-jwt-anahtari-en-az-otuz-iki-karakter-uzun"
+
+
+def _claims(**extra):
+    return {"sub": "user-1", "type": "access", "exp": int(time.time()) + 60, **extra}
+
+
+class TestTokenService:
+    def test_imzalanan_token_dogrulanir(self):
+        service = security.TokenService({"": NEW_SECRET})
+        token = service.encode(_claims(gen=2))
+
+        claims = service.decode(token)
+        assert claims["sub"] == "user-1"
+        assert claims["gen"] == 2
+
+    def test_jose_ile_uyumlu(self):
+        service = security.TokenService({"": NEW_SECRET})
+
+        legacy = jwt.encode(_claims(), NEW_SECRET, algorithm="HS256")
+        assert service.decode(legacy)["sub"] == "user-1"
+
+        token = service.encode(_claims())
+        assert jwt.decode(token, NEW_SECRET, algorithms=["HS256"])["sub"] == "user-1"
+
+    def test_kid_rotasyonu(self):
+        old_service = security.TokenService({"k1": OLD_SECRET}, signing_kid="k1")
+        old_token = old_service.encode(_claims())
+        legacy_token = jwt.encode(_claims(), OLD_SECRET, algorithm="HS256")
+
+        rotated = security.TokenService(
+            {"k2": NEW_SECRET, "k1": OLD_SECRET, "": OLD_SECRET}, signing_kid="k2"
+        )
+        new_token = rotated.encode(_claims())
+
+        assert jwt.get_unverified_header(new_token)["kid"] == "k2"
+        assert rotated.decode(new_token) is not None
+        assert rotated.decode(old_token) is not None
+        assert rotated.decode(legacy_token) is not None
+        # Eski anahtar dogrulama listesinden cikinca eski token'lar reddedilir
+        assert security.TokenService({"k2": NEW_SECRET}, signing_kid="k2").decode(
+            old_token
+        ) is None
+
+    def test_gecersiz_tokenlar_reddedilir(self):
+        service = security.TokenService({"": NEW_SECRET})
+        token = service.encode(_claims())
+        header, payload, signature = token.split(".")
+
+        assert service.decode(f"{header}.{payload}.{signature[:-2]}AA") is None
+        assert service.decode(f"{header}.{payload}") is None
+        assert service.decode("bozuk") is None
+        assert service.decode(jwt.encode(_claims(), OLD_SECRET, algorithm="HS256")) is None
+        assert service.decode(jwt.encode(_claims(), NEW_SECRET, algorithm="HS512")) is None
+        unknown_kid = jwt.encode(_claims(), NEW_SECRET, headers={"kid": "yok"})
+        assert service.decode(unknown_kid) is None
+
+    def test_suresi_dolan_token_reddedilir(self):
+        service = security.TokenService({"": NEW_SECRET})
+        token = service.encode(_claims(exp=1000, nbf=900))
+
+        assert service.decode(token, now=999) is not None
+        assert service.decode(token, now=1001) is None
+        assert service.decode(token, now=899) is None
+
+    def test_servis_settingsten_bir_kez_kurulur(self, monkeypatch):
+        original = security.get_token_service()
+        token = security.create_access_token("user-1", "member", "u@test.com")
+        assert security.get_token_service() is original
+
+        monkeypatch.setenv("JWT_SECRET_KEY", NEW_SECRET)
+        monkeypatch.setenv("JWT_KEY_ID", "k2")
+        monkeypatch.setenv("JWT_VERIFY_KEYS", f":{get_settings().JWT_SECRET_KEY}")
+        get_settings.cache_clear()
+        try:
+            security.reload_token_service()
+            rotated = security.get_token_service()
+            assert rotated is not original
+            assert security.decode_token(token)["sub"] == "user-1"
+            new_token = security.create_access_token("user-1", "member", "u@test.com")
+            assert jwt.get_unverified_header(new_token)["kid"] == "k2"
+        finally:
+            monkeypatch.undo()
+            get_settings.cache_clear()
+            security.reload_token_service()
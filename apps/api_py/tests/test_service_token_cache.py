@@ -0,0 +1,164 @@
+"""Servis token cache'i ve export hizli yolu testleri."""
+
+from contextlib import contextmanager
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, select
+
+from tests.conftest import (
+    TEST_ENGINE,
+    _assign_member,
+    _auth_header,
+    _login,
+    _make_project,
+    _make_user,
+)
+
+from app.db.models import RoleEnum, ServiceToken
+from app.services.service_token_cache import (
+    ServiceTokenCache,
+    ServiceTokenScope,
+    service_token_cache,
+)
+
+
+def _scope(token_id=None) -> ServiceTokenScope:
+    return ServiceTokenScope(token_id=token_id or uuid4(), project_id=uuid4(), project_slug="p")
+
+
+@contextmanager
+def _captured_statements():
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(TEST_ENGINE, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(TEST_ENGINE, "before_cursor_execute", _record)
+
+
+class TestServiceTokenCache:
+    def test_lru_en_eski_kullanilani_atar(self):
+        cache = ServiceTokenCache(max_entries=2)
+        cache.put("a", _scope())
+        cache.put("b", _scope())
+        assert cache.get("a") is not None  # "a" yeniden kullanildi, en eski "b"
+
+        cache.put("c", _scope())
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_iptal_edilen_token_cikarilir(self):
+        cache = ServiceTokenCache()
+        revoked, kept = _scope(), _scope()
+        cache.put("revoked", revoked)
+        cache.put("kept", kept)
+
+        cache.invalidate_tokens({revoked.token_id})
+
+        assert cache.get("revoked") is None
+        assert cache.get("kept") is kept
+
+    def test_last_used_at_araligi(self):
+        cache = ServiceTokenCache(touch_interval_seconds=60)
+        token_id = uuid4()
+
+        assert cache.should_touch(token_id) is True
+        assert cache.should_touch(token_id) is False
+        assert cache.should_touch(uuid4()) is True
+
+
+@pytest.fixture()
+def service_token(client, db):
+    admin = _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+    project = _make_project(db, slug="proj", name="Proje", created_by=str(admin.id))
+    _assign_member(db, project_id=project.id, user_id=admin.id, role=RoleEnum.admin)
+    token = _login(client, "admin@test.com")
+    for index in range(3):
+        resp = client.post(
+            "/projects/proj/secrets",
+            json={
+                "name": f"Key {index}",
+                "provider": "Stripe",
+                "type": "key",
+                "environment": "dev",
+                "keyName": f"KEY_{index}",
+                "value": f"value-{index}",
+                "tags": ["api"] if index else [],
+                "notes": "",
+            },
+            headers=_auth_header(token),
+        )
+        assert resp.status_code == 200
+    created = client.post(
+        f"/projects/manage/{project.id}/service-tokens",
+        json={"name": "CI"},
+        headers=_auth_header(token),
+    ).json()
+    service_token_cache.clear()
+    return {
+        "token": created["token"],
+        "id": created["id"],
+        "project_id": str(project.id),
+        "auth": token,
+    }
+
+
+def _export(client, token: str, **params):
+    return client.get(
+        "/service-access/projects/proj/exports",
+        params={"env": "dev", "format": "env", **params},
+        headers={"X-Service-Token": token},
+    )
+
+
+class TestServiceExportFastPath:
+    def test_ikinci_istekte_token_sorgusu_ve_last_used_at_yazimi_yok(
+        self, client, db, service_token
+    ):
+        first = _export(client, service_token["token"])
+        assert first.status_code == 200
+        last_used = db.scalar(select(ServiceToken.last_used_at))
+        assert last_used is not None
+
+        with _captured_statements() as statements:
+            second = _export(client, service_token["token"], tag="api")
+
+        assert second.status_code == 200
+        assert second.text == "KEY_1=value-1\nKEY_2=value-2"
+        # Audit sayisi icin COUNT ve akis halinde okunan satirlar
+        secret_queries = [sql for sql in statements if "FROM secrets" in sql]
+        assert len(secret_queries) == 2
+        assert "count(" in secret_queries[0].lower()
+        assert not any("service_tokens" in sql for sql in statements)
+        db.expire_all()
+        assert db.scalar(select(ServiceToken.last_used_at)) == last_used
+
+    def test_iptal_sonrasi_cache_kullanilmaz(self, client, service_token):
+        assert _export(client, service_token["token"]).status_code == 200
+
+        revoke = client.delete(
+            f"/projects/manage/{service_token['project_id']}/service-tokens/{service_token['id']}",
+            headers=_auth_header(service_token["auth"]),
+        )
+        assert revoke.status_code == 204
+
+        assert _export(client, service_token["token"]).status_code == 401
+
+    def test_baska_projenin_slug_i_reddedilir(self, client, db, service_token):
+        admin = db.scalar(select(ServiceToken.created_by))
+        _make_project(db, slug="baska", name="Baska", created_by=admin)
+        assert _export(client, service_token["token"]).status_code == 200
+
+        other = client.get(
+            "/service-access/projects/baska/exports",
+            params={"env": "dev", "format": "env"},
+            headers={"X-Service-Token": service_token["token"]},
+        )
+        assert other.status_code == 401
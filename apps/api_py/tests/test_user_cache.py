@@ -0,0 +1,140 @@
+"""Dogrulanmis kullanici cache'i ve token nesli (generation) ile iptal testleri."""
+
+from sqlalchemy import event
+
+from tests.conftest import TEST_ENGINE, _auth_header, _login, _make_user
+
+from app.core.config import get_settings
+from app.db.models.enums import RoleEnum
+from app.db.repositories.users_repo import update_user
+
+
+def _get_counting_user_selects(client, path, token):
+    statements = []
+
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT users."):
+            statements.append(statement)
+
+    event.listen(TEST_ENGINE, "before_cursor_execute", _before_execute)
+    try:
+        resp = client.get(path, headers=_auth_header(token))
+    finally:
+        event.remove(TEST_ENGINE, "before_cursor_execute", _before_execute)
+    return resp, len(statements)
+
+
+class TestUserCache:
+    def test_cache_isabetinde_kullanici_sorgusu_yok(self, client, db):
+        _make_user(db, email="user@test.com", role=RoleEnum.member)
+        token = _login(client, "user@test.com")
+
+        first, first_selects = _get_counting_user_selects(client, "/me", token)
+        second, second_selects = _get_counting_user_selects(client, "/me", token)
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert first_selects == 1
+        assert second_selects == 0
+
+    def test_profil_guncellemesi_cache_i_bayatlatir_token_gecerli_kalir(self, client, db):
+        _make_user(db, email="user@test.com", display_name="Eski Ad")
+        token = _login(client, "user@test.com")
+        assert client.get("/me", headers=_auth_header(token)).status_code == 200
+
+        resp = client.patch(
+            "/me/profile", json={"displayName": "Yeni Ad"}, headers=_auth_header(token)
+        )
+        assert resp.status_code == 200
+
+        me = client.get("/me", headers=_auth_header(token))
+        assert me.status_code == 200
+        assert me.json()["name"] == "Yeni Ad"
+
+    def test_deaktivasyon_hemen_reddedilir(self, client, db):
+        _make_user(db, email="admin@test.com", role=RoleEnum.admin)
+        member = _make_user(db, email="member@test.com", role=RoleEnum.member)
+        admin_token = _login(client, "admin@test.com")
+        member_token = _login(client, "member@test.com")
+        assert client.get("/me", headers=_auth_header(member_token)).status_code == 200
+
+        resp = client.patch(
+            f"/users/{member.id}",
+            json={"isActive": False},
+            headers=_auth_header(admin_token),
+        )
+        assert resp.status_code == 200
+
+        assert client.get("/me", headers=_auth_header(member_token)).status_code == 401
+
+    def test_rol_degisimi_eski_tokeni_iptal_eder(self, client, db):
+        user = _make_user(db, email="user@test.com", role=RoleEnum.member)
+        old_token = _login(client, "user@test.com")
+
+        update_user(db, str(user.id), role=RoleEnum.admin)
+
+        resp = client.get("/me", headers=_auth_header(old_token))
+        assert resp.status_code == 401
+        assert resp.json()["detail"] == "Token revoked"
+
+        new_token = _login(client, "user@test.com")
+        me = client.get("/me", headers=_auth_header(new_token))
+        assert me.status_code == 200
+        assert me.json()["role"] == "admin"
+
+    def test_ayni_rolu_yazmak_nesli_artirmaz(self, client, db):
+        user = _make_user(db, email="user@test.com", role=RoleEnum.member)
+        token = _login(client, "user@test.com")
+
+        update_user(db, str(user.id), role=RoleEnum.member, display_name="Baska")
+
+        assert client.get("/me", headers=_auth_header(token)).status_code == 200
+
+    def test_sifre_degisimi_eski_tokeni_iptal_eder(self, client, db):
+        _make_user(db, email="user@test.com", password="eskisifre1")
+        token = _login(client, "user@test.com", "eskisifre1")
+
+        resp = client.patch(
+            "/me/password",
+            json={"currentPassword": "eskisifre1", "newPassword": "yenisifre1"},
+            headers=_auth_header(token),
+        )
+        assert resp.status_code == 200
+
+        assert client.get("/me", headers=_auth_header(token)).status_code == 401
+        new_token = _login(client, "user@test.com", "yenisifre1")
+        assert client.get("/me", headers=_auth_header(new_token)).status_code == 200
+
+
+class TestTrustedTokenClaims:
+    def test_salt_okunur_uc_kullaniciyi_db_den_okumaz(self, client, db, monkeypatch):
+        monkeypatch.setattr(get_settings(), "AUTH_TRUST_TOKEN_CLAIMS", True)
+        _make_user(db, email="user@test.com", role=RoleEnum.member)
+        token = _login(client, "user@test.com")
+
+        resp, selects = _get_counting_user_selects(client, "/projects", token)
+
+        assert resp.status_code == 200
+        assert selects == 0
+
+    def test_iptal_edilen_nesil_claim_yolunda_da_reddedilir(self, client, db, monkeypatch):
+        monkeypatch.setattr(get_settings(), "AUTH_TRUST_TOKEN_CLAIMS", True)
+        user = _make_user(db, email="user@test.com", role=RoleEnum.admin)
+        token = _login(client, "user@test.com")
+        assert client.get("/projects", headers=_auth_header(token)).status_code == 200
+
+        update_user(db, str(user.id), role=RoleEnum.member)
+
+        resp = client.get("/projects", headers=_auth_header(token))
+        assert resp.status_code == 401
+
+        new_token = _login(client, "user@test.com")
+        assert client.get("/projects", headers=_auth_header(new_token)).status_code == 200
+
+    def test_claim_guveni_kapaliyken_deaktif_kullanici_reddedilir(self, client, db):
+        user = _make_user(db, email="user@test.com")
+        token = _login(client, "user@test.com")
+
+        update_user(db, str(user.id), is_active=False)
+
+        assert client.get("/projects", headers=_auth_header(token)).status_code == 401